@@ -0,0 +1,189 @@
+#!/usr/bin/python3
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import gitlab_reporter as reporter
+
+#Row counts benchmarked when no --rows are provided
+DEFAULT_ROWS = [10000, 1000000, 10000000]
+
+#Default file with the stored baseline results
+DEFAULT_BASELINE = 'bench_baseline.json'
+
+#Folder where generated exports are kept between runs
+DEFAULT_DATA_DIR = 'bench_data'
+
+#Allowed slowdown or memory growth compared to the baseline before it counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+#Share of the timelog rows without an account label
+NULL_ACCOUNT_RATIO = 0.2
+
+#Date window used by the list_issues stages
+START_DATE = '2023-03-01'
+END_DATE = '2023-05-31'
+
+ISSUE_TYPES = ['Technical Task', 'Feature', 'Bug', 'Task', 'Order', 'Support']
+
+#Generates a synthetic GitLab timelog export with realistic cardinalities.
+#Users, accounts and projects stay at a few hundred values while issue keys grow with the amount of rows.
+def generate_export(rows, seed=0):
+    rng = np.random.default_rng(seed)
+
+    users = np.array([f"User {i:03d}" for i in range(300)], dtype=object)
+    accounts = np.array([f"Account {i:03d}" for i in range(150)], dtype=object)
+    groups = np.array([f"Group {i:02d}" for i in range(40)], dtype=object)
+    projects = np.array([f"Project_{i}" for i in range(400)], dtype=object)
+    issue_count = max(10, min(rows // 20, 200000))
+    issue_keys = np.array([f"Key_{i}" for i in range(issue_count)], dtype=object)
+    titles = np.array([f"Issue title {i}, part {i % 7}" for i in range(issue_count)], dtype=object)
+
+    issue = rng.integers(0, issue_count, rows)
+    days = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D')
+    seconds = pd.to_timedelta(np.where(rng.random(rows) < 0.7, 0, rng.integers(0, 86400, rows)), unit='s')
+    dates = pd.DatetimeIndex(days + seconds).tz_localize('Europe/Stockholm', ambiguous=np.ones(rows, dtype=bool), nonexistent='shift_forward')
+    account = accounts[issue % len(accounts)]
+    account = np.where(rng.random(rows) < NULL_ACCOUNT_RATIO, None, account)
+
+    return pd.DataFrame({
+        'date_of_work': dates.strftime('%Y-%m-%dT%H:%M:%S%z').str.replace(r'(\d{2})(\d{2})$', r'\1:\2', regex=True),
+        'user': users[rng.integers(0, len(users), rows)],
+        'issue_key': issue_keys[issue],
+        'time_spent (hours)': np.round(rng.gamma(2.0, 1.0, rows), 2),
+        'issue_type': np.array(ISSUE_TYPES, dtype=object)[issue % len(ISSUE_TYPES)],
+        'project_id': projects[issue % len(projects)],
+        'project_group': groups[issue % len(groups)],
+        'total_time_spent': np.round((issue % 500) * 0.75, 2),
+        'account_label': account,
+        'issue_title': titles[issue],
+        'timelog_note': np.where(rng.random(rows) < 0.5, None, 'Worked on it'),
+    })
+
+#Writes a synthetic export with <rows> rows to <data_dir>, unless it has been generated before
+def write_export(rows, data_dir=DEFAULT_DATA_DIR, seed=0):
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"export_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        generate_export(rows, seed).to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+    return path
+
+#Gets the benchmarked stages as (name, setup, function), setup prepares the arguments outside of the measurement
+def get_stages(path):
+    def loaded(columns=None):
+        return lambda: (reporter.load_csv(path, columns),)
+
+    def converted():
+        df = reporter.load_csv(path, reporter.LIST_ISSUES_COLUMNS)
+        return (reporter.convert_date(df, START_DATE, END_DATE, 'date_of_work'), ['date_of_work', 'user', 'timelog_note'])
+
+    def issues():
+        return (converted()[0].drop(columns=['date_of_work']),)
+
+    def user_time():
+        return (reporter.calculate_user_time(reporter.load_csv(path, reporter.EMPTY_ACCOUNTS_COLUMNS)), 'User', 'Time Spent')
+
+    return [
+        ('load_csv', lambda: (path,), reporter.load_csv),
+        ('load_csv_empty_accounts_columns', lambda: (path, reporter.EMPTY_ACCOUNTS_COLUMNS), reporter.load_csv),
+        ('convert_date', lambda: (reporter.load_csv(path, reporter.LIST_ISSUES_COLUMNS), START_DATE, END_DATE, 'date_of_work'), reporter.convert_date),
+        ('get_list_issues', converted, reporter.get_list_issues),
+        ('summarize_data', issues, reporter.summarize_data),
+        ('format_dataframe', user_time, reporter.format_dataframe),
+        ('report_empty_accounts', loaded(reporter.EMPTY_ACCOUNTS_COLUMNS), lambda df: reporter.calculate_final_list_empty_accounts(reporter.calculate_user_time(df))),
+        ('report_reported_time_per_account', loaded(reporter.REPORTED_TIME_COLUMNS), lambda df: reporter.calculate_final_reported_time_for_user(reporter.calculate_account_time(df))),
+        ('report_list_issues', loaded(reporter.LIST_ISSUES_COLUMNS), lambda df: reporter.partial_list_issues(df, START_DATE, END_DATE)),
+    ]
+
+#Measures the best wall time of <repeat> runs and the peak traced memory of one extra run
+def measure(setup, func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+
+    args = setup()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': min(times), 'peak_bytes': peak}
+
+#Runs every stage on a generated export for each amount of rows
+def run_benchmarks(rows_list, data_dir=DEFAULT_DATA_DIR, repeat=3, stage_filter=None):
+    results = {}
+    for rows in rows_list:
+        path = write_export(rows, data_dir)
+        for name, setup, func in get_stages(path):
+            if stage_filter and stage_filter not in name:
+                continue
+            key = f"{name}[{rows}]"
+            results[key] = measure(setup, func, repeat)
+            print(f"{key:50} {results[key]['seconds']:10.4f} s {results[key]['peak_bytes'] / 1024 ** 2:10.1f} MB", flush=True)
+    return results
+
+#Compares <results> with <baseline> and returns a list of the regressions above <tolerance>
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            limit = baseline[key][metric] * (1 + tolerance)
+            if result[metric] > limit:
+                regressions.append(f"{key} {metric}: {result[metric]:.4g} > {limit:.4g} (baseline {baseline[key][metric]:.4g})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the report stages of gitlab_reporter.py on synthetic exports.")
+    parser.add_argument('--rows', default=','.join(str(rows) for rows in DEFAULT_ROWS), help="comma separated amounts of rows")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="file with the stored baseline results")
+    parser.add_argument('--save', action='store_true', help="store the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="allowed regression, 0.25 is 25 percent")
+    parser.add_argument('--repeat', type=int, default=3, help="amount of timed runs per stage")
+    parser.add_argument('--stage', default=None, help="only run stages containing this name")
+    parser.add_argument('--data_dir', default=DEFAULT_DATA_DIR, help="folder for the generated exports")
+    args = parser.parse_args()
+
+    rows_list = [int(rows) for rows in args.rows.split(',')]
+    results = run_benchmarks(rows_list, args.data_dir, args.repeat, args.stage)
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as file:
+                baseline = json.load(file)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f"Stored baseline in {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline in {args.baseline}, run with --save to store one.")
+        return
+
+    with open(args.baseline, 'r', encoding='utf-8') as file:
+        regressions = find_regressions(results, json.load(file), args.tolerance)
+
+    if regressions:
+        print("Regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+    print("No regressions against the baseline.")
+
+if __name__ == "__main__":
+    main()
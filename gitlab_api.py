@@ -0,0 +1,298 @@
+#!/usr/bin/python3
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+#Default GitLab instance and the path of its GraphQL endpoint
+DEFAULT_URL = 'https://gitlab.com'
+GRAPHQL_PATH = '/api/graphql'
+
+#Environment variable with the access token used for the requests
+TOKEN_VARIABLE = 'GITLAB_TOKEN'
+
+#Issues and timelogs fetched per page, 100 is the most GitLab allows
+PAGE_SIZE = 100
+
+#Amount of time slices per worker that the updated issues are split into
+SLICES_PER_WORKER = 4
+
+#Oldest update time searched when there is no cache yet
+API_EPOCH = '2011-01-01T00:00:00+00:00'
+
+#Issues updated this many seconds before the last sync are fetched again, to not miss slow updates
+SYNC_OVERLAP = 300
+
+#Retries and backoff for rate-limited or failing requests
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+RETRY_STATUSES = {429, 502, 503, 504}
+
+#Scoped label holding the account of an issue, like Account::Hemmet
+ACCOUNT_LABEL_PREFIX = 'Account::'
+
+#Columns of the CSV export, in the same order as a manual export
+EXPORT_COLUMNS = ['date_of_work', 'user', 'issue_key', 'time_spent (hours)', 'issue_type', 'project_id', 'project_group', 'total_time_spent', 'account_label', 'issue_title', 'timelog_note']
+
+TIMELOG_FIELDS = """
+        pageInfo { hasNextPage endCursor }
+        nodes { spentAt timeSpent summary user { name } note { body } }
+"""
+
+ISSUES_QUERY = """
+query($group: ID!, $after: String, $updatedAfter: Time, $updatedBefore: Time, $first: Int) {
+  group(fullPath: $group) {
+    issues(includeSubgroups: true, updatedAfter: $updatedAfter, updatedBefore: $updatedBefore, after: $after, first: $first) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        id reference(full: true) title type totalTimeSpent updatedAt
+        labels { nodes { title } }
+        timelogs(first: $first) {""" + TIMELOG_FIELDS + """}
+      }
+    }
+  }
+}
+"""
+
+TIMELOGS_QUERY = """
+query($id: IssueID!, $after: String, $first: Int) {
+  issue(id: $id) {
+    timelogs(first: $first, after: $after) {""" + TIMELOG_FIELDS + """}
+  }
+}
+"""
+
+#Pooled HTTP session, every thread keeps its own keep-alive connection to the GitLab instance
+def create_session(url=DEFAULT_URL, token=None, backoff=BACKOFF_SECONDS):
+    parts = urlsplit(url)
+    return {
+        'scheme': parts.scheme,
+        'netloc': parts.netloc,
+        'path': parts.path.rstrip('/') + GRAPHQL_PATH,
+        'token': token,
+        'backoff': backoff,
+        'local': threading.local(),
+        'requests': 0,
+        'lock': threading.Lock(),
+    }
+
+#Gets the connection of the current thread, a new one is opened when there is none
+def get_connection(session):
+    connection = getattr(session['local'], 'connection', None)
+    if connection is None:
+        if session['scheme'] == 'https':
+            connection = http.client.HTTPSConnection(session['netloc'], timeout=60)
+        else:
+            connection = http.client.HTTPConnection(session['netloc'], timeout=60)
+        session['local'].connection = connection
+    return connection
+
+#Closes the connection of the current thread, it is opened again by the next request
+def reset_connection(session):
+    connection = getattr(session['local'], 'connection', None)
+    if connection is not None:
+        connection.close()
+        session['local'].connection = None
+
+#Gets the seconds to wait before retrying, Retry-After is used when GitLab provides it
+def get_retry_delay(session, response, attempt):
+    retry_after = response.getheader('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    delay = min(MAX_BACKOFF_SECONDS, session['backoff'] * 2 ** attempt)
+    return delay * (0.5 + random.random() / 2)
+
+#Posts a GraphQL <query> with <variables> and returns its data.
+#Rate-limited and failing requests are retried with backoff, GraphQL errors are raised.
+def run_query(session, query, variables):
+    body = json.dumps({'query': query, 'variables': variables})
+    headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+    if session['token']:
+        headers['Authorization'] = f"Bearer {session['token']}"
+
+    for attempt in range(MAX_RETRIES + 1):
+        response = None
+        try:
+            connection = get_connection(session)
+            connection.request('POST', session['path'], body, headers)
+            response = connection.getresponse()
+            data = response.read()
+            with session['lock']:
+                session['requests'] += 1
+        except (http.client.HTTPException, OSError) as e:
+            reset_connection(session)
+            if attempt == MAX_RETRIES:
+                raise ConnectionError(f"GitLab request failed: {e}")
+            time.sleep(get_retry_delay(session, None, attempt))
+            continue
+
+        if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+            time.sleep(get_retry_delay(session, response, attempt))
+            continue
+        if response.status != 200:
+            raise ConnectionError(f"GitLab responded with {response.status}: {data[:200].decode('utf-8', 'replace')}")
+
+        result = json.loads(data)
+        if result.get('errors'):
+            raise ValueError(f"GitLab query failed: {result['errors'][0].get('message')}")
+        return result['data']
+
+#Fetches the remaining timelogs of an issue that has more than one page of them
+def fetch_issue_timelogs(session, issue_id, cursor):
+    timelogs = []
+    while cursor:
+        data = run_query(session, TIMELOGS_QUERY, {'id': issue_id, 'after': cursor, 'first': PAGE_SIZE})
+        connection = data['issue']['timelogs']
+        timelogs.extend(connection['nodes'])
+        cursor = connection['pageInfo']['endCursor'] if connection['pageInfo']['hasNextPage'] else None
+    return timelogs
+
+#Fetches every issue in <group> updated between <updated_after> and <updated_before>, one page at a time
+def fetch_issues_slice(session, group, updated_after, updated_before):
+    issues = []
+    cursor = None
+    while True:
+        variables = {'group': group, 'after': cursor, 'updatedAfter': updated_after, 'updatedBefore': updated_before, 'first': PAGE_SIZE}
+        data = run_query(session, ISSUES_QUERY, variables)
+        if data.get('group') is None:
+            raise ValueError(f"GitLab group {group} was not found")
+        connection = data['group']['issues']
+        issues.extend(connection['nodes'])
+        if not connection['pageInfo']['hasNextPage']:
+            return issues
+        cursor = connection['pageInfo']['endCursor']
+
+#Splits the time between <start> and <end> into <count> slices of ISO-8601 (after, before) pairs
+def create_time_slices(start, end, count):
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+    bounds = pd.date_range(start, end, periods=max(1, count) + 1)
+    return [(bounds[i].isoformat(), bounds[i + 1].isoformat()) for i in range(len(bounds) - 1)]
+
+#Fetches the issues of <group> updated after <since> with their timelogs.
+#The update times are split into slices fetched concurrently by <workers> threads.
+def fetch_updated_issues(session, group, since, until, workers):
+    slices = create_time_slices(since, until, workers * SLICES_PER_WORKER)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda bounds: fetch_issues_slice(session, group, *bounds), slices)
+        issues = {issue['id']: issue for result in results for issue in result}
+
+        paged = [issue for issue in issues.values() if issue['timelogs']['pageInfo']['hasNextPage']]
+        remaining = executor.map(lambda issue: fetch_issue_timelogs(session, issue['id'], issue['timelogs']['pageInfo']['endCursor']), paged)
+        for issue, timelogs in zip(paged, remaining):
+            issue['timelogs']['nodes'].extend(timelogs)
+
+    return issues
+
+#Reads the cached issues from <cache_path>, or an empty cache if there is none or it belongs to another group
+def load_api_cache(cache_path, group, url):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as file:
+            cache = json.load(file)
+        if cache.get('group') == group and cache.get('url') == url:
+            return cache
+    except (FileNotFoundError, ValueError):
+        pass
+    return {'group': group, 'url': url, 'synced_at': None, 'issues': {}}
+
+#Writes the cached issues to <cache_path>
+def save_api_cache(cache_path, cache):
+    with open(cache_path + '.tmp', 'w', encoding='utf-8') as file:
+        json.dump(cache, file)
+    os.replace(cache_path + '.tmp', cache_path)
+
+#Gets the account of an issue from its scoped account label
+def get_account_label(issue, prefix=ACCOUNT_LABEL_PREFIX):
+    for label in issue['labels']['nodes']:
+        if label['title'].startswith(prefix):
+            return label['title'][len(prefix):]
+    return None
+
+#Converts the cached issues to the rows of a CSV export, one row per timelog
+def issues_to_rows(issues, prefix=ACCOUNT_LABEL_PREFIX):
+    rows = []
+    for issue in issues.values():
+        project = issue['reference'].split('#')[0]
+        account = get_account_label(issue, prefix)
+        for timelog in issue['timelogs']['nodes']:
+            note = timelog.get('summary') or (timelog.get('note') or {}).get('body')
+            rows.append([
+                timelog['spentAt'],
+                (timelog.get('user') or {}).get('name'),
+                issue['reference'],
+                round(timelog['timeSpent'] / 3600, 2),
+                issue.get('type'),
+                project,
+                project.rsplit('/', 1)[0],
+                round((issue.get('totalTimeSpent') or 0) / 3600, 2),
+                account,
+                issue['title'],
+                note,
+            ])
+    return rows
+
+#Converts the cached issues to a DataFrame with the same columns as a CSV export, sorted by date of work
+def issues_to_dataframe(issues, prefix=ACCOUNT_LABEL_PREFIX):
+    df = pd.DataFrame(issues_to_rows(issues, prefix), columns=EXPORT_COLUMNS)
+    order = pd.to_datetime(df['date_of_work'], utc=True, format='ISO8601').argsort(kind='stable')
+    return df.iloc[order].reset_index(drop=True)
+
+#Fetches the timelogs of <group> from the GitLab API. With <cache_path> only the issues updated
+#since the last sync are fetched and merged into the cached ones.
+def fetch_timelogs(group, url=DEFAULT_URL, token=None, cache_path=None, workers=4, prefix=ACCOUNT_LABEL_PREFIX, session=None):
+    session = session or create_session(url, token if token is not None else os.environ.get(TOKEN_VARIABLE))
+    cache = load_api_cache(cache_path, group, url) if cache_path else {'group': group, 'url': url, 'synced_at': None, 'issues': {}}
+
+    until = datetime.now(timezone.utc)
+    if cache['synced_at']:
+        since = pd.Timestamp(cache['synced_at']) - timedelta(seconds=SYNC_OVERLAP)
+    else:
+        since = pd.Timestamp(API_EPOCH)
+
+    cache['issues'].update(fetch_updated_issues(session, group, since, until, workers))
+    cache['synced_at'] = until.isoformat()
+
+    if cache_path:
+        save_api_cache(cache_path, cache)
+    return issues_to_dataframe(cache['issues'], prefix)
+
+#Fetches the timelogs of <group> and writes them as a CSV export to <output_path>
+def write_api_export(group, output_path, url=DEFAULT_URL, token=None, cache_path=None, workers=4, prefix=ACCOUNT_LABEL_PREFIX):
+    try:
+        df = fetch_timelogs(group, url, token, cache_path, workers, prefix)
+        df.to_csv(output_path + '.tmp', index=False)
+        os.replace(output_path + '.tmp', output_path)
+        return df
+    except (ConnectionError, ValueError) as e:
+        print(f"Couldn't fetch the timelogs for group: {group}, {e}")
+        sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch GitLab timelogs into a CSV export that gitlab_reporter.py can read.")
+    parser.add_argument('group', help="full path of the GitLab group")
+    parser.add_argument('output', help="CSV file to write")
+    parser.add_argument('--url', default=DEFAULT_URL, help="GitLab instance")
+    parser.add_argument('--cache', default=None, help="file with the cached issues, defaults to <output>.gitlab.json")
+    parser.add_argument('--workers', type=int, default=4, help="amount of concurrent requests")
+    parser.add_argument('--account_prefix', default=ACCOUNT_LABEL_PREFIX, help="scoped label holding the account")
+    args = parser.parse_args()
+
+    df = write_api_export(args.group, args.output, args.url, None, args.cache or args.output + '.gitlab.json', args.workers, args.account_prefix)
+    print(f"Wrote {len(df)} timelogs for group: {args.group} to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,1084 @@
 #!/usr/bin/python3
 
-import pandas as pd
+import argparse
+import collections
+import contextlib
+import csv
+import functools
+import glob
+import gzip
+import hashlib
+import importlib
+import inspect
+import io
+import json
+import math
+import os
+import re
 import sys
+import threading
+import time
+import tracemalloc
+from itertools import repeat
 
-#Load CSV-File with <file_path>
-def load_csv(file_path):
+#Stands in for the module <name> under the global <alias> until one of its attributes is first used, so a usage error
+#doesn't pay for importing pandas. The module is then imported the normal way and replaces the stand-in in this file,
+#so sys.modules and other importers of this file never see a lazy module.
+class DeferredModule:
+    def __init__(self, name, alias):
+        self.name = name
+        self.alias = alias
+
+    def __getattr__(self, attribute):
+        module = importlib.import_module(self.name)
+        globals()[self.alias] = module
+        return getattr(module, attribute)
+
+np = DeferredModule('numpy', 'np')
+pd = DeferredModule('pandas', 'pd')
+
+#Default amount of rows read per chunk in streaming mode
+DEFAULT_CHUNKSIZE = 100000
+
+#Amount of rows formatted at a time when a report is written
+OUTPUT_CHUNKSIZE = 50000
+
+#Amount of rows of a listed report printed to stdout, 0 turns the preview off
+DEFAULT_PREVIEW_ROWS = 20
+
+#Files with at most this many rows are summed with the csv module instead of pandas when --fast_path_rows is used.
+#It is off by default, since the table is formatted by hand instead of by print_df.
+FAST_PATH_MAX_ROWS = 10000
+
+#Address of the report server and the seconds between the checks for changed exports
+DEFAULT_SERVE_HOST = '127.0.0.1'
+DEFAULT_SERVE_PORT = 8765
+WATCH_INTERVAL = 2.0
+
+#Values that pandas reads as missing by default
+CSV_NA_VALUES = {'', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'}
+
+#Amount of partial results kept before they are merged while streaming
+MAX_PARTIALS = 32
+
+#Data types of the columns in the CSV-File, so every file and chunk is loaded the same way
+DTYPES = {
+    'user': 'category',
+    'issue_key': 'category',
+    'time_spent (hours)': 'float64',
+    'issue_type': 'category',
+    'project_id': 'category',
+    'project_group': 'category',
+    'total_time_spent': 'float64',
+    'account_label': 'category',
+    'issue_title': str,
+    'timelog_note': str,
+}
+
+#Default threads that parse one CSV-File in line ranges of a memory map, --read_threads passes another number. 1 reads it with pd.read_csv
+CSV_READ_THREADS = 1
+
+#Ranges parsed per thread, so a slow range doesn't keep the other threads waiting
+RANGES_PER_THREAD = 4
+
+#Bytes counted at a time when looking for quotes
+QUOTE_BLOCK_BYTES = 16 * 1024 * 1024
+
+#Compressions of the exports by extension, they are decompressed as a stream while they are parsed
+INPUT_COMPRESSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+
+#Archives with several exports, a member is read with the path <archive>::<member>
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.zst')
+ARCHIVE_SEPARATOR = '::'
+
+#Extensions of the exports read from a folder or an archive
+EXPORT_EXTENSIONS = ('.csv', '.csv.gz', '.csv.zst')
+
+#Max size in bytes of the cache folder, the least recently used files are removed above it
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+#Name of the file in the cache folder that describes the cached CSV-Files
+CACHE_MANIFEST = 'manifest.json'
+
+#Report results kept in memory by the result cache, and the max age in seconds and max size in bytes
+#of the results kept as Feather files in the folder <cache_dir>/results
+RESULT_CACHE_ENTRIES = 256
+RESULT_CACHE_TTL = 7 * 24 * 3600
+RESULT_CACHE_MAX_BYTES = 256 * 1024 ** 2
+RESULT_CACHE_FOLDER = 'results'
+
+#Version of the cached report results, raised when a change gives different results so older results aren't used
+RESULT_CACHE_VERSION = 3
+
+#Columns parsed as dates when the CSV-File is loaded
+DATE_COLUMNS = ['date_of_work']
+
+#Timezone the dates are converted to before they are filtered on start and end dates
+REPORT_TIMEZONE = 'Europe/Stockholm'
+
+#Reducers of the export columns when issues are summarized. The issue attributes take the first value,
+#total_time_spent is the total of the issue on every row and is not summed again.
+ISSUE_REDUCERS = {
+    'time_spent (hours)': 'sum',
+    'issue_type': 'first',
+    'project_id': 'first',
+    'project_group': 'first',
+    'total_time_spent': 'first',
+    'account_label': 'first',
+    'issue_title': 'first',
+}
+
+#Steps the hours are summed in, whole steps of 2^-20 and the rest in steps of 2^-56
+SUM_STEPS = (2 ** 20, 2 ** 56)
+
+#Compute engines for the reports, pandas loads the rows while polars and duckdb run lazy multi-threaded queries
+ENGINES = ['pandas', 'polars', 'duckdb']
+
+#Memory the duckdb engine uses before it spills to disk
+DUCKDB_MEMORY_LIMIT = '2GB'
+
+#End dates written without a time of day, like 2023-08-01, include the whole day
+DATE_ONLY_PATTERN = r'^\s*\d{4}-\d{1,2}-\d{1,2}\s*$'
+
+#Dictionary-encoded columns of the rollup, the timelog facts are keyed on the first three and a day
+ROLLUP_KEYS = ['user', 'account_label', 'issue_key']
+ROLLUP_ISSUE_COLUMNS = ['issue_type', 'project_id', 'project_group', 'issue_title']
+
+#Version of the rollup layout, cached rollups of another version are built again
+ROLLUP_VERSION = 4
+
+#Largest share of the rows of an export that the rollup may have as facts, a rollup with more isn't stored
+#since it is about as large as the cached copy and isn't faster to answer the reports from
+ROLLUP_MAX_RATIO = 0.5
+
+#Version of the incremental state layout, a state of another version is built again from the whole file
+STATE_VERSION = 2
+
+#Bytes before the offset of an incremental state that are hashed to check that the processed rows are unchanged
+STATE_CHECK_BYTES = 64 * 1024
+
+#Keys of the issue summaries in an incremental state, the day is in the report timezone
+STATE_ISSUE_KEYS = ['issue_key', 'day', 'midnight']
+
+#Frequencies of the periods that can be listed with --periods=<frequency>
+PERIOD_FREQUENCIES = {'daily': 'D', 'weekly': 'W-SUN', 'monthly': 'M'}
+
+#Matches a UTC offset at the end of an ISO-8601 date
+UTC_OFFSET_PATTERN = r'(?:Z|[+-]\d{2}:?\d{2})$'
+
+#Columns needed by each report
+EMPTY_ACCOUNTS_COLUMNS = ['user', 'time_spent (hours)', 'account_label']
+REPORTED_TIME_COLUMNS = ['time_spent (hours)', 'account_label']
+LIST_ISSUES_COLUMNS = ['date_of_work', 'issue_key', 'time_spent (hours)', 'issue_type', 'project_id', 'project_group', 'total_time_spent', 'account_label', 'issue_title']
+
+#Labels of the columns in the user and account time reports
+USER_TIME_LABELS = {'time_spent (hours)': 'Time Spent', 'user': 'User'}
+ACCOUNT_TIME_LABELS = {'account_label': 'Account Label', 'time_spent (hours)': 'Time Spent'}
+
+#Reports that can be run together with --all or --reports=<names>, and the columns they need
+REPORT_COLUMNS = {
+    'list_empty_accounts': EMPTY_ACCOUNTS_COLUMNS,
+    'list_reported_time_per_account': REPORTED_TIME_COLUMNS,
+    'list_issues': LIST_ISSUES_COLUMNS,
+}
+
+#Gets the options for pd.read_csv to only read <columns> with fixed data types
+def get_read_options(columns=None):
+    if columns is None:
+        dtypes = DTYPES
+    else:
+        dtypes = {column: dtype for column, dtype in DTYPES.items() if column in columns}
+
+    return {'usecols': columns, 'dtype': dtypes}
+
+#Parses ISO-8601 dates. Dates with a UTC offset are returned in UTC, dates without an offset are
+#taken as local dates in <timezone>. Each distinct value is only parsed once, since exports repeat the same dates.
+def parse_dates(series, timezone=REPORT_TIMEZONE):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Index(uniques, dtype=object)
+    has_offset = uniques.astype(str).str.contains(UTC_OFFSET_PATTERN)
+
+    if has_offset.all():
+        parsed = pd.to_datetime(uniques, format='ISO8601', utc=True)
+    elif not has_offset.any():
+        parsed = pd.to_datetime(uniques, format='ISO8601')
+    else:
+        aware = pd.to_datetime(uniques[has_offset], format='ISO8601', utc=True)
+        local = pd.to_datetime(uniques[~has_offset], format='ISO8601')
+        local = local.tz_localize(timezone, ambiguous='NaT', nonexistent='shift_forward').tz_convert('UTC')
+        parsed = pd.Series(aware, index=uniques[has_offset]).combine_first(pd.Series(local, index=uniques[~has_offset]))
+        parsed = pd.DatetimeIndex(parsed.reindex(uniques)).tz_convert('UTC')
+
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=series.index, name=series.name)
+
+#Gets the first and last moment of the window from <start_date> to <end_date>. An end date without a time of day
+#includes the whole day, so every report, window and period compares the dates with the same bounds.
+def get_window_bounds(start_date, end_date):
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    if isinstance(end_date, str) and re.match(DATE_ONLY_PATTERN, end_date):
+        end += pd.Timedelta(days=1) - pd.Timedelta(1, unit='ns')
+    return start, end
+
+#Converts parsed dates to naive local dates in <timezone>, dates without a timezone are kept as they are.
+def to_report_timezone(series, timezone=REPORT_TIMEZONE):
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        return series.dt.tz_convert(timezone).dt.tz_localize(None)
+    return series
+
+#Sorts the categories of the categorical columns in <df>. pd.read_csv only sorts them within each block of rows
+#it parses, so this gives large files the same categories however they are read.
+def sort_categories(df):
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype) and not df[column].cat.categories.is_monotonic_increasing:
+            df[column] = df[column].cat.reorder_categories(df[column].cat.categories.sort_values())
+    return df
+
+#Parses the date columns in a loaded DataFrame
+def parse_date_columns(df):
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            try:
+                df[column] = parse_dates(df[column])
+            except (ValueError, TypeError) as e:
+                print(f"Couldn't parse column: {column} as dates, {e}")
+    return df
+
+#Gets the file on disk that holds <file_path>, the archive for a member of an archive
+def get_source_path(file_path):
+    return file_path.split(ARCHIVE_SEPARATOR, 1)[0]
+
+#Gets the compression of <file_path> from its extension, None for an uncompressed file
+def get_input_compression(file_path):
+    for extension, compression in INPUT_COMPRESSIONS.items():
+        if file_path.lower().endswith(extension):
+            return compression
+    return None
+
+#Checks if <file_path> is a zip or tar archive with several exports
+def is_archive(file_path):
+    return ARCHIVE_SEPARATOR not in file_path and file_path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+#Checks if <file_path> is a member <archive>::<member> of a tar archive, which can only be read by scanning the archive
+def is_tar_member(file_path):
+    return ARCHIVE_SEPARATOR in file_path and not get_source_path(file_path).lower().endswith('.zip')
+
+#Checks if <file_path> is an uncompressed file on disk, which can be memory-mapped and read from an offset
+def is_plain_file(file_path):
+    return ARCHIVE_SEPARATOR not in file_path and not is_archive(file_path) and get_input_compression(file_path) is None
+
+#Gets the paths <archive>::<member> of the exports in the zip or tar archive <archive_path>
+def list_archive_members(archive_path):
+    if archive_path.lower().endswith('.zip'):
+        import zipfile
+        with zipfile.ZipFile(archive_path) as archive:
+            names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    else:
+        with contextlib.ExitStack() as stack:
+            names = [member.name for member in open_tar_archive(stack, archive_path).getmembers() if member.isfile()]
+    return [f"{archive_path}{ARCHIVE_SEPARATOR}{name}" for name in sorted(names) if name.lower().endswith(EXPORT_EXTENSIONS)]
+
+#Opens the tar archive <archive_path> on <stack>, .tar.zst archives are decompressed as a stream
+def open_tar_archive(stack, archive_path):
+    import tarfile
+    if archive_path.lower().endswith('.zst'):
+        return stack.enter_context(tarfile.open(fileobj=open_decompressed(stack, open(archive_path, 'rb'), 'zstd'), mode='r|'))
+    return stack.enter_context(tarfile.open(archive_path, 'r:*'))
+
+#Wraps the binary <file> on <stack> in a stream that decompresses <compression> while it is read
+def open_decompressed(stack, file, compression):
+    stack.enter_context(file)
+    if compression == 'gzip':
+        return stack.enter_context(gzip.GzipFile(fileobj=file, mode='rb'))
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading .zst files requires the zstandard package, install it with: pip install zstandard")
+        return stack.enter_context(zstandard.ZstdDecompressor().stream_reader(file))
+    return file
+
+#Opens <file_path> for reading as a binary stream. .gz and .zst files are decompressed while they are read and
+#a member <archive>::<member> is read from its zip or tar archive, so nothing is inflated to disk first.
+#An archive itself is an error, its exports are found with expand_file_paths.
+@contextlib.contextmanager
+def open_input(file_path):
+    if is_archive(file_path):
+        raise ValueError(f"{file_path} is an archive, read its exports with {file_path}{ARCHIVE_SEPARATOR}<export>")
+    with contextlib.ExitStack() as stack:
+        if ARCHIVE_SEPARATOR not in file_path:
+            file = open(file_path, 'rb')
+        else:
+            archive_path, member = file_path.split(ARCHIVE_SEPARATOR, 1)
+            if archive_path.lower().endswith('.zip'):
+                import zipfile
+                file = stack.enter_context(zipfile.ZipFile(archive_path)).open(member)
+            else:
+                archive = open_tar_archive(stack, archive_path)
+                file = None
+                for info in archive:
+                    if info.name == member:
+                        file = archive.extractfile(info)
+                        break
+                if file is None:
+                    raise FileNotFoundError(f"{member} is not in {archive_path}")
+        yield open_decompressed(stack, file, get_input_compression(file_path))
+
+#Yields each of <file_paths> with an open binary stream for the members of tar archives and None for the other files,
+#which their readers open themselves. Every tar archive is read in a single pass, so it is decompressed once however
+#many exports it has, and its members come in the order they are stored in it.
+def iter_export_files(file_paths):
+    archives = set()
+    for file_path in file_paths:
+        if not is_tar_member(file_path):
+            yield file_path, None
+            continue
+
+        archive_path = get_source_path(file_path)
+        if archive_path in archives:
+            continue
+        archives.add(archive_path)
+
+        members = {path.split(ARCHIVE_SEPARATOR, 1)[1]: path for path in file_paths if is_tar_member(path) and get_source_path(path) == archive_path}
+        with contextlib.ExitStack() as stack:
+            archive = open_tar_archive(stack, archive_path)
+            for info in archive:
+                if info.name in members:
+                    with contextlib.ExitStack() as member_stack:
+                        yield members.pop(info.name), open_decompressed(member_stack, archive.extractfile(info), get_input_compression(info.name))
+        if members:
+            raise FileNotFoundError(f"{', '.join(members)} is not in {archive_path}")
+
+#Load CSV-File with <file_path>, only reading <columns> if provided.
+#With <cache_dir> the parsed CSV-File is cached and loaded from the cache as long as the file is unchanged.
+#With more than one of <threads>, CSV_READ_THREADS by default, the file is parsed in parallel by load_csv_mmap.
+#An already open binary <file>, like one from iter_export_files, is read instead of opening <file_path>.
+def load_csv(file_path, columns=None, cache_dir=None, threads=None, file=None):
     try:
+        threads = CSV_READ_THREADS if threads is None else threads
         if file_path is None:
             print("Filepath does not exist.")
+        elif cache_dir:
+            return load_cached_csv(file_path, columns, cache_dir, threads=threads, file=file)
+        elif file is None and threads > 1 and is_plain_file(file_path):
+            return load_csv_mmap(file_path, columns, threads)
         else:
-            with open(file_path, 'rb') as file:
-                return pd.read_csv(file)
+            with contextlib.nullcontext(file) if file is not None else open_input(file_path) as file:
+                return sort_categories(parse_date_columns(pd.read_csv(file, **get_read_options(columns))))
     except FileNotFoundError as e:
         print(f"{file_path} is incorrect {e}")
         sys.exit(1)
 
-#Write to CSV-File
-def dataframe_to_csv(df, path):
+#Load CSV-File with <file_path> in chunks of <chunksize> rows, only reading <columns> if provided
+def load_csv_chunks(file_path, chunksize=DEFAULT_CHUNKSIZE, columns=None, file=None):
+    try:
+        if file_path is None:
+            print("Filepath does not exist.")
+        else:
+            with contextlib.nullcontext(file) if file is not None else open_input(file_path) as file:
+                for chunk in pd.read_csv(file, chunksize=chunksize, **get_read_options(columns)):
+                    yield sort_categories(parse_date_columns(chunk))
+    except FileNotFoundError as e:
+        print(f"{file_path} is incorrect {e}")
+        sys.exit(1)
+
+#Reads the bytes of a memory-mapped range as a binary file, so pd.read_csv streams the range without copying it
+class MappedRange(io.RawIOBase):
+    def __init__(self, view):
+        self.view = view
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), len(self.view) - self.position)
+        buffer[:size] = self.view[self.position:self.position + size]
+        self.position += size
+        return size
+
+#Counts the quotes in <data> between <start> and <end>, QUOTE_BLOCK_BYTES at a time
+def count_quotes(data, start, end):
+    quotes = 0
+    for block in range(start, end, QUOTE_BLOCK_BYTES):
+        quotes += int(np.count_nonzero(data[block:min(block + QUOTE_BLOCK_BYTES, end)] == ord('"')))
+    return quotes
+
+#Finds the end of the line at <position> that is outside quotes, <quotes> is the amount of quotes before <position>.
+#Returns the position after the line break and the amount of quotes before it.
+def find_record_end(buffer, data, position, quotes=0):
+    while True:
+        newline = buffer.find(b'\n', position)
+        if newline == -1:
+            return len(buffer), quotes + count_quotes(data, position, len(buffer))
+        quotes += count_quotes(data, position, newline)
+        position = newline + 1
+        if quotes % 2 == 0:
+            return position, quotes
+
+#Finds the end of the last complete record in <buffer>, which starts at a record boundary. A line break only ends
+#a record when the amount of quotes before it is even, so a quoted note with a line break is never cut.
+def find_last_record_end(buffer):
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    end = buffer.rfind(b'\n') + 1
+    quotes = count_quotes(data, 0, end)
+    while end > 0 and quotes % 2:
+        previous = buffer.rfind(b'\n', 0, end - 1) + 1
+        quotes -= count_quotes(data, previous, end)
+        end = previous
+    return end
+
+#Splits the rows of a memory-mapped CSV-File after <start> into about <parts> byte ranges. Every range starts after a line break
+#outside quotes, so quoted issue titles and notes with commas and line breaks are never split.
+def find_line_ranges(buffer, data, start, parts):
+    bounds = [start]
+    position = start
+    quotes = 0
+    for part in range(1, parts):
+        target = start + (len(buffer) - start) * part // parts
+        if target <= position:
+            continue
+        quotes += count_quotes(data, position, target)
+        position, quotes = find_record_end(buffer, data, target, quotes)
+        if position >= len(buffer):
+            break
+        bounds.append(position)
+    bounds.append(len(buffer))
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+#Parses the rows between <start> and <end> of a memory-mapped CSV-File, <names> are the columns in the header
+def read_line_range(buffer, start, end, names, columns=None):
+    view = memoryview(buffer)[start:end]
+    try:
+        with io.BufferedReader(MappedRange(view)) as file:
+            return pd.read_csv(file, header=None, names=names, **get_read_options(columns))
+    finally:
+        view.release()
+
+#Load CSV-File with <file_path> by memory-mapping it and parsing line ranges in <threads> threads, only reading <columns> if provided.
+#The typed columns of the ranges are joined with their categories sorted, so the DataFrame is the same as from load_csv.
+def load_csv_mmap(file_path, columns=None, threads=None):
+    import mmap
+    from concurrent.futures import ThreadPoolExecutor
+    from pandas.api.types import union_categoricals
+
+    threads = threads or os.cpu_count() or 1
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return load_csv(file_path, columns, threads=1)
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        header_end, _ = find_record_end(buffer, data, 0)
+        ranges = find_line_ranges(buffer, data, header_end, threads * RANGES_PER_THREAD)
+        del data
+        if not ranges:
+            return load_csv(file_path, columns, threads=1)
+
+        names = next(csv.reader(io.StringIO(buffer[:header_end].decode('utf-8-sig'))))
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            frames = list(executor.map(lambda bounds: read_line_range(buffer, *bounds, names, columns), ranges))
+    finally:
+        buffer.close()
+
+    joined = {}
+    for column in frames[0].columns:
+        parts = [frame.pop(column) for frame in frames]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            joined[column] = union_categoricals(parts, sort_categories=True)
+        else:
+            joined[column] = pd.concat(parts, ignore_index=True)
+    return parse_date_columns(pd.DataFrame(joined))
+
+#Calculates the SHA-256 hash of the content in a file
+#For a member of an archive the whole archive is hashed.
+def hash_file(file_path, block_size=1024 * 1024):
+    sha = hashlib.sha256()
+    with open(get_source_path(file_path), 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+#Reads the manifest of the cached CSV-Files in <cache_dir>
+def load_cache_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, CACHE_MANIFEST), 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+#Writes the manifest of the cached CSV-Files in <cache_dir>, through a temporary file of its own so a reader never sees half of it
+def save_cache_manifest(cache_dir, manifest):
+    import tempfile
+    path = os.path.join(cache_dir, CACHE_MANIFEST)
+    descriptor, temp_path = tempfile.mkstemp(dir=cache_dir, prefix=CACHE_MANIFEST, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+#Holds an exclusive lock on the manifest in <cache_dir>, so processes and threads sharing the cache update it one at a time
+@contextlib.contextmanager
+def lock_cache_manifest(cache_dir):
+    with open(os.path.join(cache_dir, CACHE_MANIFEST + '.lock'), 'a+b') as lock:
+        if os.name == 'nt':
+            import msvcrt
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+#Loads the manifest in <cache_dir> under the lock and saves the changes made to it, the lock is only held for the update
+@contextlib.contextmanager
+def update_cache_manifest(cache_dir):
+    os.makedirs(cache_dir, exist_ok=True)
+    with lock_cache_manifest(cache_dir):
+        manifest = load_cache_manifest(cache_dir)
+        yield manifest
+        save_cache_manifest(cache_dir, manifest)
+
+#Removes a cached file and its entry in the manifest
+def remove_cache_entry(cache_dir, manifest, key):
+    entry = manifest.pop(key, None)
+    if entry:
+        rollups = [rollup_file for rollup_file in entry.get('rollup', {}).values() if rollup_file]
+        for cache_file in [entry['file']] + list(entry.get('date_index', {}).values()) + rollups:
+            try:
+                os.remove(os.path.join(cache_dir, cache_file))
+            except FileNotFoundError:
+                pass
+
+#Gets the manifest entry for <file_path> if the cached copy is still valid, otherwise the entry is removed.
+#Size and modification time are checked first and the content hash only when they differ.
+def get_cache_entry(file_path, cache_dir, manifest, key=None):
+    key = key or os.path.abspath(file_path)
+    entry = manifest.get(key)
+    if entry is None:
+        return None
+
+    stat = os.stat(get_source_path(file_path))
+    if not os.path.exists(os.path.join(cache_dir, entry['file'])):
+        remove_cache_entry(cache_dir, manifest, key)
+        return None
+
+    if entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+        return entry
+
+    if entry['size'] == stat.st_size and entry['hash'] == hash_file(file_path):
+        entry['mtime'] = stat.st_mtime_ns
+        return entry
+
+    remove_cache_entry(cache_dir, manifest, key)
+    return None
+
+#Removes the least recently used files in <cache_dir> until the cache is below <max_bytes>
+def evict_cache(cache_dir, manifest, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+    total = sum(entry['bytes'] for entry in manifest.values())
+    for key, entry in sorted(manifest.items(), key=lambda item: item[1]['last_used']):
+        if total <= max_bytes:
+            break
+        total -= entry['bytes']
+        remove_cache_entry(cache_dir, manifest, key)
+
+#Writes <df> as a Feather-File in <cache_dir> and adds it to the manifest
+def write_cache(file_path, df, cache_dir, manifest, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+    key = os.path.abspath(file_path)
+    content_hash = hash_file(file_path)
+    cache_file = hashlib.sha256((key + content_hash).encode('utf-8')).hexdigest() + '.feather'
+
+    remove_cache_entry(cache_dir, manifest, key)
+    df.reset_index(drop=True).to_feather(os.path.join(cache_dir, cache_file), compression='uncompressed')
+    add_cache_entry(file_path, key, content_hash, cache_file, cache_dir, manifest, max_bytes)
+
+#Adds <cache_file> in <cache_dir>, a cached copy of <file_path>, to the manifest under <key>
+def add_cache_entry(file_path, key, content_hash, cache_file, cache_dir, manifest, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+    stat = os.stat(get_source_path(file_path))
+    manifest[key] = {
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'hash': content_hash,
+        'file': cache_file,
+        'bytes': os.path.getsize(os.path.join(cache_dir, cache_file)),
+        'last_used': time.time(),
+    }
+    evict_cache(cache_dir, manifest, max_bytes)
+
+#Load CSV-File with <file_path> from the cache in <cache_dir>, the CSV-File is parsed and cached if it isn't cached yet.
+def load_cached_csv(file_path, columns=None, cache_dir=None, max_bytes=DEFAULT_CACHE_MAX_BYTES, threads=None, file=None):
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        print("Caching requires pyarrow, loading the CSV-File without cache.")
+        return load_csv(file_path, columns, threads=threads, file=file)
+
+    try:
+        table = None
+        with update_cache_manifest(cache_dir) as manifest:
+            entry = get_cache_entry(file_path, cache_dir, manifest)
+            if entry is not None:
+                table = feather.read_table(os.path.join(cache_dir, entry['file']), columns=columns, memory_map=True)
+                entry['last_used'] = time.time()
+        if table is not None:
+            return table.to_pandas()
+
+        #The CSV-File is parsed without the lock, so other processes can use the cache meanwhile
+        df = load_csv(file_path, threads=threads, file=file)
+        with update_cache_manifest(cache_dir) as manifest:
+            try:
+                write_cache(file_path, df, cache_dir, manifest, max_bytes)
+            except Exception as e:
+                print(f"Couldn't cache {file_path} in {cache_dir}, {e}")
+
+        if columns is None:
+            return df
+        return df[[column for column in df.columns if column in columns]]
+    except FileNotFoundError as e:
+        print(f"{file_path} is incorrect {e}")
+        sys.exit(1)
+
+#Builds an index of the dates in column <label> converted to <timezone>, sorted once so date windows
+#can be found with a binary search instead of comparing every row.
+def build_date_index(df, label, timezone=REPORT_TIMEZONE):
+    dates = to_report_timezone(parse_dates(df[label], timezone), timezone).values
+    order = np.argsort(dates, kind='stable')
+    return {'dates': dates[order], 'order': order}
+
+#Gets the date index of the cached CSV-File from <cache_dir>, the index is built and stored next to the cached copy if it doesn't exist.
+def get_cached_date_index(file_path, df, label, cache_dir, timezone=REPORT_TIMEZONE):
+    try:
+        with lock_cache_manifest(cache_dir):
+            entry = load_cache_manifest(cache_dir).get(os.path.abspath(file_path))
+            index_file = entry.get('date_index', {}).get(timezone) if entry else None
+            if index_file and os.path.exists(os.path.join(cache_dir, index_file)):
+                with np.load(os.path.join(cache_dir, index_file)) as data:
+                    return {'dates': data['dates'], 'order': data['order']}
+
+        date_index = build_date_index(df, label, timezone)
+        with update_cache_manifest(cache_dir) as manifest:
+            entry = manifest.get(os.path.abspath(file_path))
+            if entry:
+                index_file = entry['file'].replace('.feather', f"_{hashlib.sha256(timezone.encode('utf-8')).hexdigest()[:8]}.npz")
+                np.savez(os.path.join(cache_dir, index_file), **date_index)
+                if timezone not in entry.setdefault('date_index', {}):
+                    entry['bytes'] += os.path.getsize(os.path.join(cache_dir, index_file))
+                entry['date_index'][timezone] = index_file
+        return date_index
+    except Exception as e:
+        print(f"Couldn't get the cached date index for {file_path}, {e}")
+        return build_date_index(df, label, timezone)
+
+#Selects the rows between <start_date> and <end_date> with a binary search in <date_index>, the rows keep their order in <df>.
+def select_date_window(df, date_index, start_date, end_date):
+    start_date, end_date = get_window_bounds(start_date, end_date)
+    start = np.searchsorted(date_index['dates'], start_date.to_datetime64(), side='left')
+    end = np.searchsorted(date_index['dates'], end_date.to_datetime64(), side='right')
+    return df.iloc[np.sort(date_index['order'][start:end])]
+
+#Dictionary-encodes <series> as codes and the sorted values, missing values get the code -1
+def encode_column(series):
+    values = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    return values.cat.codes.to_numpy(np.int32), np.asarray(values.cat.categories, dtype=str)
+
+#Decodes <codes> with the values in <dictionary> as a categorical, or as strings if not <categorical>
+def decode_column(codes, dictionary, categorical=True):
+    if categorical:
+        return pd.Categorical.from_codes(codes, categories=dictionary)
+    values = np.asarray(dictionary, dtype=object)[np.maximum(codes, 0)] if len(dictionary) else np.full(len(codes), np.nan, dtype=object)
+    values[codes < 0] = np.nan
+    return values
+
+#Gets the smallest signed integer type for the codes of a dictionary with <size> values, -1 is a missing value
+def get_code_dtype(size):
+    for dtype in (np.int8, np.int16, np.int32):
+        if size < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+#Builds a compact timelog store of <df>. Text columns are integer codes into dictionaries of their distinct values,
+#the hours are float64 and the dates are int64 nanoseconds since the epoch in UTC, with NaT as the minimum int64.
+#Dates without a UTC offset are taken as local dates in <timezone>.
+def build_timelog_store(df, timezone=REPORT_TIMEZONE):
+    store = {'rows': len(df), 'columns': list(df.columns), 'arrays': {}, 'dictionaries': {}, 'timezones': {}}
+    for column in df.columns:
+        if column in DATE_COLUMNS:
+            dates = parse_dates(df[column], timezone)
+            store['timezones'][column] = str(dates.dt.tz) if isinstance(dates.dtype, pd.DatetimeTZDtype) else None
+            store['arrays'][column] = dates.to_numpy('datetime64[ns]').view(np.int64)
+        elif DTYPES.get(column) == 'float64' or pd.api.types.is_float_dtype(df[column]):
+            store['arrays'][column] = df[column].to_numpy(np.float64)
+        else:
+            codes, dictionary = encode_column(df[column])
+            store['arrays'][column] = codes.astype(get_code_dtype(len(dictionary)))
+            store['dictionaries'][column] = dictionary
+    return store
+
+#Decodes int64 nanoseconds in UTC from a timelog store, as dates in <timezone> or as naive dates
+def decode_store_dates(values, timezone=None):
+    dates = pd.Series(pd.DatetimeIndex(np.asarray(values, dtype=np.int64).view('datetime64[ns]')))
+    return dates.dt.tz_localize('UTC').dt.tz_convert(timezone) if timezone else dates
+
+#Converts a timelog <store> to a DataFrame like load_csv, only with <columns> and the rows at <rows> if provided
+def timelog_store_to_frame(store, columns=None, rows=None):
+    data = {}
+    for column in columns or store['columns']:
+        values = store['arrays'][column] if rows is None else store['arrays'][column][rows]
+        if column in store['dictionaries']:
+            data[column] = decode_column(values, store['dictionaries'][column], DTYPES.get(column) == 'category')
+        elif column in store['timezones']:
+            data[column] = decode_store_dates(values, store['timezones'][column])
+        else:
+            data[column] = values
+    return pd.DataFrame(data)
+
+#Gets the bytes used by the arrays and dictionaries of a timelog <store>
+def get_store_nbytes(store):
+    return sum(array.nbytes for array in store['arrays'].values()) + sum(dictionary.nbytes for dictionary in store['dictionaries'].values())
+
+#Gets a mask of the rows in <store> with a date_of_work between <start_date> and <end_date> in <timezone>.
+#The rows are looked up in <date_index> if provided, otherwise every distinct date is converted once.
+def select_store_window(store, start_date, end_date, timezone=REPORT_TIMEZONE, date_index=None):
+    start_date, end_date = get_window_bounds(start_date, end_date)
+    if date_index is not None:
+        mask = np.zeros(store['rows'], dtype=bool)
+        start = np.searchsorted(date_index['dates'], start_date.to_datetime64(), side='left')
+        end = np.searchsorted(date_index['dates'], end_date.to_datetime64(), side='right')
+        mask[date_index['order'][start:end]] = True
+        return mask
+
+    codes, uniques = pd.factorize(store['arrays']['date_of_work'])
+    dates = to_report_timezone(decode_store_dates(uniques, store['timezones']['date_of_work']), timezone)
+    return ((dates >= start_date) & (dates <= end_date)).to_numpy(bool)[codes]
+
+#Gets the days since 1970-01-01 of the parsed <dates> in <timezone> as int32, and a mask of the dates at midnight.
+#Missing dates get the smallest int32, so no window selects them.
+def get_report_days(dates, timezone=REPORT_TIMEZONE):
+    dates = to_report_timezone(parse_dates(dates, timezone), timezone)
+    days = dates.dt.normalize()
+    day_numbers = ((days - pd.Timestamp('1970-01-01')) // pd.Timedelta(days=1)).fillna(np.iinfo(np.int32).min)
+    return day_numbers.to_numpy(np.int64).astype(np.int32), (dates == days).to_numpy(bool)
+
+#Builds a rollup of the timelogs with the hours summed per user, account, issue and day in <timezone>.
+#Every column is dictionary-encoded, and the facts keep the order of their first timelog so list_issues
+#takes the same first account per issue. The other columns of an issue are kept per day with the row of their
+#first value, -1 for none, so list_issues takes them from the first timelog with a value inside the window.
+def build_rollup(df, timezone=REPORT_TIMEZONE):
+    day_numbers, midnight = get_report_days(df['date_of_work'], timezone)
+
+    rollup = {'timezone': timezone, 'dictionaries': {}, 'facts': {}, 'issues': {}}
+    codes = {}
+    for column in ROLLUP_KEYS + ROLLUP_ISSUE_COLUMNS:
+        codes[column], rollup['dictionaries'][column] = encode_column(df[column])
+
+    facts = pd.DataFrame({column: codes[column] for column in ROLLUP_KEYS})
+    facts['day'] = day_numbers
+    facts['midnight'] = midnight
+    facts['row'] = np.arange(len(df), dtype=np.int64)
+    facts['hours'] = df['time_spent (hours)'].to_numpy(np.float64)
+    facts = facts.groupby(ROLLUP_KEYS + ['day', 'midnight'], sort=False).agg(row=('row', 'min'), hours=('hours', 'sum'))
+    facts = facts.reset_index().sort_values('row', kind='stable')
+    rollup['facts'] = {column: facts[column].to_numpy() for column in facts.columns if column != 'row'}
+
+    attributes = pd.DataFrame({column: pd.Series(codes[column], dtype=np.float64).where(codes[column] >= 0) for column in ROLLUP_ISSUE_COLUMNS})
+    attributes['total_time_spent'] = df['total_time_spent'].to_numpy(np.float64)
+    rows = np.arange(len(df), dtype=np.float64)
+    row_dtype = get_code_dtype(len(df))
+    aggregations = {}
+    for column in ROLLUP_ISSUE_COLUMNS + ['total_time_spent']:
+        attributes[f"{column} row"] = np.where(attributes[column].notna(), rows, np.nan)
+        aggregations[column] = (column, 'first')
+        aggregations[f"{column} row"] = (f"{column} row", 'min')
+    attributes['issue_key'] = codes['issue_key']
+    attributes['day'] = day_numbers
+    attributes['midnight'] = midnight
+    attributes = attributes[attributes['issue_key'] >= 0].groupby(['issue_key', 'day', 'midnight'], sort=False).agg(**aggregations).reset_index()
+
+    for column in ('issue_key', 'day', 'midnight'):
+        rollup['issues'][column] = attributes[column].to_numpy()
+    for column in ROLLUP_ISSUE_COLUMNS:
+        rollup['issues'][column] = attributes[column].fillna(-1).to_numpy(np.int32)
+    rollup['issues']['total_time_spent'] = attributes['total_time_spent'].to_numpy(np.float64)
+    for column in ROLLUP_ISSUE_COLUMNS + ['total_time_spent']:
+        rollup['issues'][f"{column} row"] = attributes[f"{column} row"].fillna(-1).to_numpy(row_dtype)
+    return rollup
+
+#Writes <rollup> as a NumPy archive to <path>
+def save_rollup(path, rollup):
+    arrays = {'timezone': np.asarray(rollup['timezone'])}
+    for part in ('dictionaries', 'facts', 'issues'):
+        for column, values in rollup[part].items():
+            arrays[f"{part}/{column}"] = values
+    np.savez(path, **arrays)
+
+#Reads a rollup written by save_rollup from <path>
+def load_rollup(path):
+    rollup = {'dictionaries': {}, 'facts': {}, 'issues': {}}
+    with np.load(path) as data:
+        rollup['timezone'] = str(data['timezone'])
+        for name in data.files:
+            if '/' in name:
+                part, column = name.split('/', 1)
+                rollup[part][column] = data[name]
+    return rollup
+
+#Gets the rollup of the cached CSV-File from <cache_dir>, the rollup is built once and stored next to the cached copy.
+#Returns None if the rollup has more than <max_ratio> of the rows as facts, which is kept in the manifest
+#so the rollup isn't built again.
+def get_cached_rollup(file_path, cache_dir, timezone=REPORT_TIMEZONE, threads=None, max_ratio=ROLLUP_MAX_RATIO):
+    rollup_key = f"{timezone}#{ROLLUP_VERSION}"
+    with update_cache_manifest(cache_dir) as manifest:
+        entry = get_cache_entry(file_path, cache_dir, manifest)
+        rollups = entry.get('rollup', {}) if entry else {}
+        if rollup_key in rollups and rollups[rollup_key] is None:
+            return None
+        if rollups.get(rollup_key) and os.path.exists(os.path.join(cache_dir, rollups[rollup_key])):
+            entry['last_used'] = time.time()
+            return load_rollup(os.path.join(cache_dir, rollups[rollup_key]))
+
+    df = load_csv(file_path, get_report_columns(list(REPORT_COLUMNS)), cache_dir, threads)
+    rollup = build_rollup(df, timezone)
+    if len(rollup['facts']['hours']) > max_ratio * len(df):
+        rollup = None
+    with update_cache_manifest(cache_dir) as manifest:
+        entry = manifest.get(os.path.abspath(file_path))
+        if entry and rollup is None:
+            entry.setdefault('rollup', {})[rollup_key] = None
+        elif entry:
+            rollup_file = entry['file'].replace('.feather', f"_rollup_{hashlib.sha256(rollup_key.encode('utf-8')).hexdigest()[:8]}.npz")
+            save_rollup(os.path.join(cache_dir, rollup_file), rollup)
+            if not entry.setdefault('rollup', {}).get(rollup_key):
+                entry['bytes'] += os.path.getsize(os.path.join(cache_dir, rollup_file))
+            entry['rollup'][rollup_key] = rollup_file
+    return rollup
+
+#Gets the hours per account and user from <rollup>, the same as group_time_by_account_and_user on the timelogs
+def rollup_time_by_account_and_user(rollup):
+    facts = rollup['facts']
+    grouped = pd.DataFrame({'account_label': facts['account_label'], 'user': facts['user'], 'time_spent (hours)': facts['hours']})
+    grouped = grouped.groupby(['account_label', 'user'], sort=False)['time_spent (hours)'].sum().reset_index()
+    for column in ('account_label', 'user'):
+        grouped[column] = decode_column(grouped[column].to_numpy(), rollup['dictionaries'][column])
+    return grouped
+
+#Gets a mask of the days in a rollup between <start_date> and <end_date>, or None if a date has another time of day
+#than midnight or the end of a day, since the rollup only knows the day and if a timelog was at midnight.
+def get_rollup_window(day, midnight, start_date, end_date):
+    start, end = get_window_bounds(start_date, end_date)
+    whole_day = end == end.normalize() + pd.Timedelta(days=1) - pd.Timedelta(1, unit='ns')
+    if start != start.normalize() or (end != end.normalize() and not whole_day):
+        return None
+
+    first_day = (start - pd.Timestamp('1970-01-01')).days
+    last_day = (end.normalize() - pd.Timestamp('1970-01-01')).days
+    last = (day == last_day) if whole_day else ((day == last_day) & midnight)
+    return (day >= first_day) & ((day < last_day) | last)
+
+#Gets the first value of <column> per issue from the issue columns of a rollup in <mask>, the value with the smallest row.
+#Returns the sorted issue codes and their values, an issue without a value gets <missing>.
+def get_rollup_first_values(issues, mask, column, missing):
+    keys = issues['issue_key'][mask]
+    values = issues[column][mask]
+    rows = issues[f"{column} row"][mask]
+    order = np.lexsort((np.where(rows < 0, np.iinfo(rows.dtype).max, rows), keys))
+    codes, first = np.unique(keys[order], return_index=True)
+    positions = order[first]
+    return codes, np.where(rows[positions] < 0, missing, values[positions])
+
+#Lists the issues between <start_date> and <end_date> from <rollup>, the same as partial_list_issues on the timelogs.
+#Returns None if the window can't be answered from the days in the rollup, see get_rollup_window.
+def rollup_list_issues(rollup, start_date, end_date):
+    facts = rollup['facts']
+    mask = get_rollup_window(facts['day'], facts['midnight'], start_date, end_date)
+    if mask is None:
+        return None
+    mask &= facts['issue_key'] >= 0
+
+    window = pd.DataFrame({
+        'issue_key': facts['issue_key'][mask],
+        'time_spent (hours)': facts['hours'][mask],
+        'account_label': pd.Series(facts['account_label'][mask]).where(facts['account_label'][mask] >= 0).to_numpy(),
+    })
+    summary = window.groupby('issue_key', sort=True).agg(hours=('time_spent (hours)', 'sum'), account=('account_label', 'first'))
+    issue_codes = summary.index.to_numpy(np.int32)
+    issues = rollup['issues']
+    dictionaries = rollup['dictionaries']
+    issue_mask = get_rollup_window(issues['day'], issues['midnight'], start_date, end_date)
+    first = {}
+    for column in ROLLUP_ISSUE_COLUMNS + ['total_time_spent']:
+        codes, first[column] = get_rollup_first_values(issues, issue_mask, column, np.nan if column == 'total_time_spent' else -1)
+        if not np.array_equal(codes, issue_codes):
+            raise ValueError("The issues of the rollup don't match its timelogs")
+
+    return pd.DataFrame({
+        'issue_key': decode_column(issue_codes, dictionaries['issue_key']),
+        'time_spent (hours)': summary['hours'].to_numpy(),
+        'issue_type': decode_column(first['issue_type'], dictionaries['issue_type']),
+        'project_id': decode_column(first['project_id'], dictionaries['project_id']),
+        'project_group': decode_column(first['project_group'], dictionaries['project_group']),
+        'total_time_spent': first['total_time_spent'],
+        'account_label': decode_column(summary['account'].fillna(-1).to_numpy(np.int32), dictionaries['account_label']),
+        'issue_title': decode_column(first['issue_title'], dictionaries['issue_title'], categorical=False),
+    })
+
+#Calculates <reports> from the rollup of the cached CSV-File, or returns None if there is no rollup or it can't answer them
+def calculate_reports_rollup(file_path, reports, start_date=None, end_date=None, cache_dir=None, timezone=REPORT_TIMEZONE, threads=None, max_ratio=ROLLUP_MAX_RATIO):
+    try:
+        rollup = get_cached_rollup(file_path, cache_dir, timezone, threads, max_ratio)
+        if rollup is None:
+            return None
+        issues = None
+        if 'list_issues' in reports:
+            issues = rollup_list_issues(rollup, start_date, end_date)
+            if issues is None:
+                return None
+        return finish_reports(reports, rollup_time_by_account_and_user(rollup), issues)
+    except Exception as e:
+        print(f"Couldn't use the rollup for file: {file_path}, {e}")
+        return None
+
+#Runs <partial> on every chunk of the CSV-File and merges the partial results with <merge>.
+def aggregate_chunks(file_path, chunksize, partial, merge, *args, columns=None):
+    results = aggregate_chunks_steps(file_path, chunksize, {'result': (partial, merge, args)}, columns)
+    if results:
+        return results['result']
+
+#Runs every step (<partial>, <merge>, <args>) in <steps> on each chunk of the CSV-File in a single pass,
+#and returns the merged partial results for each step.
+def aggregate_chunks_steps(file_path, chunksize, steps, columns=None, file=None):
+    try:
+        partials = {name: [] for name in steps}
+
+        for chunk in load_csv_chunks(file_path, chunksize, columns, file):
+            for name, (partial, merge, args) in steps.items():
+                result = partial(chunk, *args)
+                if isinstance(result, pd.DataFrame):
+                    partials[name].append(result)
+
+                if len(partials[name]) >= MAX_PARTIALS:
+                    partials[name] = [merge(pd.concat(partials[name], ignore_index=True))]
+
+        results = {}
+        for name, (_, merge, _) in steps.items():
+            if partials[name]:
+                results[name] = merge(pd.concat(partials[name], ignore_index=True))
+            else:
+                results[name] = None
+        return results
+    except Exception as e:
+        print(f"Couldn't aggregate the chunks of file: {file_path}, {e}")
+
+#Opens <path> for writing text, compressed with gzip or zstd if <compression> is provided
+def open_output(path, compression=None):
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Writing .zst files requires the zstandard package, install it with: pip install zstandard")
+        return zstandard.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+#Splits <df> into frames of at most <chunksize> rows, so only one chunk is formatted at a time
+def iter_frames(df, chunksize=OUTPUT_CHUNKSIZE):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+#Writes <frames> as one CSV-File, the header is only written for the first frame
+def write_csv_frames(frames, path, compression=None):
+    with open_output(path, compression) as file:
+        header = True
+        for frame in frames:
+            frame.to_csv(file, index=False, header=header)
+            header = False
+
+#Writes <frames> as JSON Lines, one JSON object per row
+def write_jsonl_frames(frames, path, compression=None):
+    with open_output(path, compression) as file:
+        for frame in frames:
+            if not frame.empty:
+                frame.to_json(file, orient='records', lines=True, date_format='iso', force_ascii=False)
+
+#Writes <frames> as one Parquet file, every frame becomes a row group
+def write_parquet_frames(frames, path, compression=None):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Writing .parquet files requires the pyarrow package, install it with: pip install pyarrow")
+
+    writer = None
+    try:
+        for frame in frames:
+            if writer is None:
+                schema = pa.Schema.from_pandas(frame, preserve_index=False)
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+
+#Output formats as file extension, writer and compression
+OUTPUT_FORMATS = {
+    'csv': ('.csv', write_csv_frames, None),
+    'csv.gz': ('.csv.gz', write_csv_frames, 'gzip'),
+    'csv.zst': ('.csv.zst', write_csv_frames, 'zstd'),
+    'jsonl': ('.jsonl', write_jsonl_frames, None),
+    'jsonl.gz': ('.jsonl.gz', write_jsonl_frames, 'gzip'),
+    'parquet': ('.parquet', write_parquet_frames, None),
+}
+
+#Gets the output format and the path to write for <path>. The format is taken from <output_format>,
+#or from the extension of <path>, and defaults to CSV.
+def get_output_format(path, output_format=None):
+    if output_format is None:
+        for name, (extension, _, _) in sorted(OUTPUT_FORMATS.items(), key=lambda item: -len(item[1][0])):
+            if path.endswith(extension):
+                return name, path
+        output_format = 'csv'
+
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}, choose from: {', '.join(OUTPUT_FORMATS)}")
+
+    extension = OUTPUT_FORMATS[output_format][0]
+    return output_format, path if path.endswith(extension) else path + extension
+
+#Write to CSV-File, or to <output_format> if provided or given by the extension of <path>.
+#Large DataFrames are formatted and written <OUTPUT_CHUNKSIZE> rows at a time.
+def dataframe_to_csv(df, path, output_format=None):
     try:
-        output_path = create_path_for_csv(path)
+        if not path:
+            print("Please provide a name and path to store the CSV-file in.")
+            return
+
+        output_format, output_path = get_output_format(path, output_format)
         print(output_path)
 
         if df is None:
             print("There is no DataFrame")
         else:
             if isinstance(df, pd.DataFrame):
-                if output_path is None:
-                    print("Please provide a name and path to store the CSV-file in.")
-                
-                df.to_csv(output_path, index=False)
+                _, writer, compression = OUTPUT_FORMATS[output_format]
+                if output_format == 'csv' and len(df) <= OUTPUT_CHUNKSIZE:
+                    df.to_csv(output_path, index=False)
+                else:
+                    writer(iter_frames(df), output_path, compression)
     
     except Exception as e:
-        print(f"Couldn't convert {df} to CSV, {e}")
+        print(f"Couldn't convert {df} to {output_format}, {e}")
 
 #Creates the path and name for the output CSV file for method: list_issues.
 def create_path_for_csv(path):
@@ -124,21 +1171,55 @@ def get_agg_methods(df, column):
     except Exception as e:
         print(f"Couldn't get aggregation methods for {df} with the column: {column}, {e}")
 
+#Sums the float column <column> of <df> per group of <keys>, with the same result in every engine and shard.
+#The values are counted as integers in SUM_STEPS, so unlike a float sum the result doesn't depend on the order of the rows.
+def sum_floats(df, keys, column, **options):
+    values = df[column].to_numpy(dtype=np.float64, na_value=0.0)
+    high = np.floor(values * SUM_STEPS[0])
+    low = np.floor((values - high / SUM_STEPS[0]) * SUM_STEPS[1])
+    steps = pd.DataFrame({'high': high.astype(np.int64), 'low': low.astype(np.int64)}, index=df.index)
+    sums = steps.groupby([df[key] if isinstance(key, str) else key for key in keys], **options).sum()
+    return (sums['high'].astype(np.float64) / SUM_STEPS[0] + sums['low'].astype(np.float64) / SUM_STEPS[1]).rename(column)
+
+#Builds the aggregation plan for <df>: the group keys and a reducer for every other column.
+#Known export columns use the reducers in ISSUE_REDUCERS, other columns are summed if numeric and otherwise take the first value.
+def build_aggregation_plan(df, keys=None):
+    if keys is None:
+        keys = ['issue_key'] if 'issue_key' in df.columns else [df.columns[0]]
+
+    reducers = {}
+    for column, method in get_agg_methods(df, keys[0]).items():
+        if column not in keys:
+            reducers[column] = ISSUE_REDUCERS.get(column, method)
+
+    return {'keys': keys, 'reducers': reducers}
+
+#Groups <df> on the keys in <plan> and reduces each column with named aggregations, sorted on the keys.
+def run_aggregation_plan(df, plan):
+    if not plan['reducers']:
+        raise ValueError("There are no columns to aggregate")
+
+    aggregations = {column: (column, reducer) for column, reducer in plan['reducers'].items()}
+    grouped = df.groupby(plan['keys'], sort=False, observed=True).agg(**aggregations)
+    for column, reducer in plan['reducers'].items():
+        if reducer == 'sum' and pd.api.types.is_float_dtype(df[column]):
+            grouped[column] = sum_floats(df, plan['keys'], column, sort=False, observed=True).to_numpy()
+    return grouped.sort_index().reset_index()
+
 #Summarizes data based on the key column
-def summarize_data(df):
+def summarize_data(df, plan=None):
     try:
         if df is None:
             print("Please provide a DataFrame")
         
         if isinstance(df, pd.DataFrame):
-            column = df.columns[0]
-            agg_methods = get_agg_methods(df, column)
-            new_df = df.groupby(column).agg(agg_methods).reset_index()
-            return new_df
+            if plan is None:
+                plan = build_aggregation_plan(df)
+            return run_aggregation_plan(df, plan)
     except Exception as e:
         print(f"Couldn't summarize data in {df}, {e}")
 
-#Formats the DataFrame for the specific assignment
+#Formats the DataFrame for the specific assignment, by summarizing all columns except the ones in <columns_list>
 def get_list_issues(df, columns_list):
     try:
         if df is None:
@@ -150,14 +1231,13 @@ def get_list_issues(df, columns_list):
         if isinstance(df, pd.DataFrame):
             if not columns_list:
                 return None
-            for column in columns_list:
-                remove_column(df, column)
-            return summarize_data(df)
+            columns = [column for column in df.columns if column not in columns_list]
+            return summarize_data(df[columns])
     except Exception as e:
         print(f"Couldn't get {df} and remove columns, {e}")
 
-#Converts the date and filters the start and end dates
-def convert_date(df, start_date, end_date, label):
+#Converts the date to <timezone> and filters the start and end dates, <df> is left unchanged
+def convert_date(df, start_date, end_date, label, timezone=REPORT_TIMEZONE):
         try:
             if df is None:
                 print("Please provide a DataFrame")
@@ -172,10 +1252,12 @@ def convert_date(df, start_date, end_date, label):
                 print("Please provide a valid label")
                  
             if isinstance(df, pd.DataFrame):
-                df[label] = pd.to_datetime(df[label])
-                df[label] = df[label].dt.tz_localize(None)
-                mask = (df[label] >= start_date) & (df[label] <= end_date)
-                return df[mask]
+                dates = to_report_timezone(parse_dates(df[label], timezone), timezone)
+                start_date, end_date = get_window_bounds(start_date, end_date)
+                mask = (dates >= start_date) & (dates <= end_date)
+                result = df[mask].copy(deep=False)
+                result[label] = dates[mask]
+                return result
         except Exception as e:
             print(f"Error converting {label} column to datetime: {e}")
 
@@ -208,7 +1290,9 @@ def format_dataframe(rs, first_label, second_label):
             print("Please provide a label")
 
         if isinstance(rs, pd.DataFrame):
-            df = rs.groupby(first_label, dropna=False)[second_label].agg(['sum']).reset_index()
+            if pd.api.types.is_float_dtype(rs[second_label]):
+                return sum_floats(rs, [first_label], second_label, dropna=False, observed=True).reset_index()
+            df = rs.groupby(first_label, dropna=False, observed=True)[second_label].agg(['sum']).reset_index()
             df.rename(columns={'sum': second_label}, inplace=True)
             return df
     except:
@@ -243,15 +1327,7 @@ def calculate_user_time(df):
 
         if isinstance(df, pd.DataFrame):
             nv = find_null_values_in_label(df, 'account_label')
-            ts = get_data_from_label(nv, 'time_spent (hours)')
-            user = get_data_from_label(nv, 'user')
-
-            report_list = {
-                    'Time Spent': ts.tolist(),
-                    'User': user.tolist()
-            }
-
-            return create_list_of_time_reports(report_list)
+            return nv[['time_spent (hours)', 'user']].rename(columns=USER_TIME_LABELS, copy=False)
     except:
         return pd.DataFrame(columns=['User', 'Time Spent'])
 
@@ -262,15 +1338,7 @@ def calculate_account_time(df):
             print("Please provide a DataFrame")
 
         if isinstance(df, pd.DataFrame):
-            al = get_data_from_label(df, 'account_label')
-            ts = get_data_from_label(df, 'time_spent (hours)')
-
-            report_list = {
-                'Account Label': al.tolist(),
-                'Time Spent': ts.tolist()
-            }
-
-            return create_list_of_time_reports(report_list)
+            return df[['account_label', 'time_spent (hours)']].rename(columns=ACCOUNT_TIME_LABELS, copy=False)
     except:
         return pd.DataFrame(columns=['Account Label', 'Time Spent'])
 
@@ -300,105 +1368,1667 @@ def calculate_final_reported_time_for_user(df):
     except:
         print("Couldn't create a list with total time.")
 
-#Prints out DataFrame without index values.
-def print_df(df):
+#Partial aggregation of users with time reports for empty accounts.
+def partial_empty_accounts(df):
+    return format_dataframe(calculate_user_time(df), 'User', 'Time Spent')
+
+#Merges partial aggregations of users with time reports for empty accounts.
+def merge_empty_accounts(df):
+    return format_dataframe(df, 'User', 'Time Spent')
+
+#Partial aggregation of reported time per account.
+def partial_reported_time_per_account(df):
+    return format_dataframe(calculate_account_time(df), 'Account Label', 'Time Spent')
+
+#Merges partial aggregations of reported time per account.
+def merge_reported_time_per_account(df):
+    return format_dataframe(df, 'Account Label', 'Time Spent')
+
+#Partial aggregation of the issues between <start_date> and <end_date>.
+def partial_list_issues(df, start_date, end_date, timezone=REPORT_TIMEZONE):
+    converted_df = convert_date(df, start_date, end_date, 'date_of_work', timezone)
+    columns_list = ['date_of_work', 'user', 'timelog_note']
+    return get_list_issues(converted_df, columns_list)
+
+#Lists the issues between <start_date> and <end_date> using a sorted date index.
+def list_issues_in_window(df, date_index, start_date, end_date):
+    window_df = select_date_window(df, date_index, start_date, end_date)
+    columns_list = ['date_of_work', 'user', 'timelog_note']
+    return get_list_issues(window_df, columns_list)
+
+#Creates the date windows (start_date, end_date) of each <frequency> period between <start_date> and <end_date>
+def create_period_windows(start_date, end_date, frequency):
+    if frequency not in PERIOD_FREQUENCIES:
+        print(f"Unknown period: {frequency}, choose from: {', '.join(PERIOD_FREQUENCIES)}")
+        return []
+
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    windows = []
+    for period in pd.period_range(start, end, freq=PERIOD_FREQUENCIES[frequency]):
+        period_start = max(start, period.start_time.normalize())
+        period_end = min(end, period.end_time.normalize())
+        windows.append((period_start.strftime('%Y-%m-%d'), period_end.strftime('%Y-%m-%d')))
+    return windows
+
+#Reads date windows from a file with one <start_date>,<end_date> per line. The dates can have a time of day,
+#and a line without a comma is read as <start_date>:<end_date> like --windows. Raises a ValueError for a line
+#that isn't a window.
+def load_period_windows(path):
+    windows = []
+    with open(path, 'r', encoding='utf-8') as file:
+        for number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            start_date, _, end_date = line.partition(',' if ',' in line else ':')
+            start_date, end_date = start_date.strip(), end_date.strip()
+            try:
+                start, end = get_window_bounds(start_date, end_date)
+                valid = not (pd.isna(start) or pd.isna(end)) and start <= end
+            except (ValueError, TypeError):
+                valid = False
+            if not valid:
+                raise ValueError(f"Line {number} of {path} isn't a period <start_date>,<end_date>: {line}")
+            windows.append((start_date, end_date))
+    return windows
+
+#Gets the index of the date window each date belongs to, or -1 if it is outside all windows.
+#The windows have the bounds of get_window_bounds and must not overlap.
+def assign_periods(dates, windows):
+    bounds = [get_window_bounds(start_date, end_date) for start_date, end_date in windows]
+    starts = pd.DatetimeIndex([start for start, _ in bounds])
+    ends = pd.DatetimeIndex([end for _, end in bounds])
+    intervals = pd.IntervalIndex.from_arrays(starts, ends, closed='both')
+    order = np.argsort(starts.values, kind='stable')
+
+    if not intervals[order].is_non_overlapping_monotonic:
+        raise ValueError("The periods are overlapping")
+
+    codes = intervals[order].get_indexer(pd.DatetimeIndex(dates))
+    return np.where(codes >= 0, order[codes], -1)
+
+#Summarizes the issues for every date window in <windows> with one groupby on period and issue_key.
+def summarize_periods(df, windows, timezone=REPORT_TIMEZONE):
     try:
         if df is None:
             print("Please provide a DataFrame")
 
         if isinstance(df, pd.DataFrame):
-            print(df.to_string(index=False))
-    except Exception as e:
-        print(f"Couldnt print DataFrame: {df}, {e}")
+            dates = to_report_timezone(parse_dates(df['date_of_work'], timezone), timezone)
+            codes = assign_periods(dates, windows)
+            mask = codes >= 0
 
-#Lists users with time reports for all empty accounts.
-def list_empty_accounts(file_path):
-    try:
-        if file_path is None:
-            print("Please provide a file_path")
-        
-        df = load_csv(file_path)
-        
-        if isinstance(df, pd.DataFrame):
-            result_df = calculate_user_time(df)
-            total_df = calculate_final_list_empty_accounts(result_df)
-            print_df(total_df)
+            columns = [column for column in df.columns if column not in ('date_of_work', 'user', 'timelog_note')]
+            data = df.loc[mask, columns]
+            labels = [f"{start_date}:{end_date}" for start_date, end_date in windows]
+            data.insert(0, 'period', pd.Categorical.from_codes(codes[mask], categories=labels))
+
+            return summarize_data(data, build_aggregation_plan(data, ['period', 'issue_key']))
     except Exception as e:
-        print(f"Couldn't start the program with file_path: {file_path}, {e}")
-        sys.exit(1)
+        print(f"Couldn't summarize the periods in {df}, {e}")
 
-#Lists reported time for all accounts
-def list_reported_time_per_account(file_path):
+#Merges partial aggregations of issues.
+def merge_list_issues(df):
+    return summarize_data(df)
+
+#Groups the reported time by account label and user, shared by the empty accounts and the account report.
+#Only the account label is used when the users aren't loaded.
+def group_time_by_account_and_user(df):
+    keys = [column for column in ('account_label', 'user') if column in df.columns]
+    return sum_floats(df, keys, 'time_spent (hours)', dropna=False, observed=True).reset_index()
+
+#Gets the columns needed to calculate all <reports>
+def get_report_columns(reports):
+    columns = []
+    for report in reports:
+        for column in REPORT_COLUMNS[report]:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+#Calculates the final DataFrame of each report from the shared account/user groups and the issue summaries.
+def finish_reports(reports, grouped, issues):
+    results = {}
+
+    if 'list_empty_accounts' in reports:
+        results['list_empty_accounts'] = calculate_final_list_empty_accounts(calculate_user_time(grouped))
+
+    if 'list_reported_time_per_account' in reports:
+        results['list_reported_time_per_account'] = calculate_final_reported_time_for_user(calculate_account_time(grouped))
+
+    if 'list_issues' in reports:
+        results['list_issues'] = issues
+
+    return results
+
+#Calculates all <reports> from one loaded DataFrame
+def calculate_reports(df, reports, start_date=None, end_date=None, timezone=REPORT_TIMEZONE):
     try:
-        if file_path is None:
-            print("Please provide a file_path")
-        
-        df = load_csv(file_path)
+        if df is None:
+            print("Please provide a DataFrame")
 
         if isinstance(df, pd.DataFrame):
-            result_df = calculate_account_time(df)
-            total_df = calculate_final_reported_time_for_user(result_df)
-            print_df(total_df)
-    except Exception as e:
-        print(f"Couldn't start the program with file_path: {file_path}, {e}")
-        sys.exit(1)
+            grouped = None
+            issues = None
 
-#Formats and lists the issues in a CSV
-def list_issues(file_path, start_date, end_date, output_path):
-    try:
-        if file_path is None:
-            print("Please provide a file_path")
-        
-        if start_date is None:
-            print("Please provide a start_date")
+            if 'list_empty_accounts' in reports or 'list_reported_time_per_account' in reports:
+                grouped = group_time_by_account_and_user(df)
 
-        if end_date is None:
-            print("Please provide a end date")
+            if 'list_issues' in reports:
+                issues = partial_list_issues(df, start_date, end_date, timezone)
 
-        df = load_csv(file_path)
-        
-        if isinstance(df, pd.DataFrame):
-            converted_df = convert_date(df, start_date, end_date, 'date_of_work')
-            columns_list = ['date_of_work', 'user', 'timelog_note']
-            formated_df = get_list_issues(converted_df, columns_list)
-            print(formated_df)
-            dataframe_to_csv(formated_df, output_path)
-        
-    except FileNotFoundError as e:
-        print(f"Couldn't find file: {file_path}, {e}")
+            return finish_reports(reports, grouped, issues)
     except Exception as e:
-        print(f"Couldn't create DataFrame for file: {file_path}")
+        print(f"Couldn't calculate the reports: {', '.join(reports)}, {e}")
 
-def main():
-    try:
-        if len(sys.argv) < 3:
-            print("Correct format: python3 gitlab_reporter.py --method_name <csv_file>")
-            return
+#Gets the steps (<partial>, <merge>, <args>) that calculate the partial results of <reports>
+def get_report_steps(reports, start_date=None, end_date=None, timezone=REPORT_TIMEZONE):
+    steps = {}
 
-        file_path = sys.argv[2]
+    if 'list_empty_accounts' in reports or 'list_reported_time_per_account' in reports:
+        steps['grouped'] = (group_time_by_account_and_user, group_time_by_account_and_user, ())
+
+    if 'list_issues' in reports:
+        steps['issues'] = (partial_list_issues, merge_list_issues, (start_date, end_date, timezone))
+
+    return steps
+
+#Calculates all <reports> while reading the CSV-File once in chunks
+def calculate_reports_chunks(file_path, reports, start_date, end_date, chunksize, timezone=REPORT_TIMEZONE):
+    steps = get_report_steps(reports, start_date, end_date, timezone)
+    results = aggregate_chunks_steps(file_path, chunksize, steps, get_report_columns(reports))
+    if results is not None:
+        return finish_reports(reports, results.get('grouped'), results.get('issues'))
+
+#Gets the CSV-Files in a folder, or matching a glob pattern like exports/*.csv, otherwise just <file_path>.
+#Compressed exports are included and zip and tar archives are expanded to the exports in them.
+def expand_file_paths(file_path):
+    if file_path is None:
+        return []
+    if os.path.isdir(file_path):
+        paths = sorted(path for path in glob.glob(os.path.join(file_path, '*')) if path.lower().endswith(EXPORT_EXTENSIONS + ARCHIVE_EXTENSIONS))
+    elif glob.has_magic(file_path):
+        paths = sorted(glob.glob(file_path))
+    else:
+        paths = [file_path]
+
+    file_paths = []
+    for path in paths:
+        file_paths.extend(list_archive_members(path) if is_archive(path) else [path])
+    return file_paths
+
+#Loads the exports in <file_paths> into one DataFrame in the order of <file_paths>, the tar archives are read once
+def load_exports(file_paths, columns=None, cache_dir=None, threads=None):
+    frames = {path: load_csv(path, columns, cache_dir, threads, file) for path, file in iter_export_files(file_paths)}
+    frames = [frames[path] for path in file_paths]
+    if len(frames) == 1:
+        return frames[0]
+
+    df = pd.concat(frames, ignore_index=True)
+    for column, dtype in DTYPES.items():
+        if dtype == 'category' and column in df.columns:
+            df[column] = df[column].astype('category')
+    return sort_categories(df)
+
+#Gets the exports in <file_path> like expand_file_paths, a folder, pattern or archive without exports is an error
+def find_file_paths(file_path):
+    file_paths = expand_file_paths(file_path)
+    if not file_paths:
+        raise FileNotFoundError(f"No CSV-Files found for {file_path}")
+    return file_paths
+
+#Calculates the partial results of <reports> for one CSV-File, it runs in the worker processes
+#so only the small partial results are sent back. An open <file> from iter_export_files is read instead of <file_path>.
+def aggregate_file(file_path, reports, start_date=None, end_date=None, chunksize=None, cache_dir=None, timezone=REPORT_TIMEZONE, file=None):
+    steps = get_report_steps(reports, start_date, end_date, timezone)
+
+    if chunksize:
+        return aggregate_chunks_steps(file_path, chunksize, steps, get_report_columns(reports), file)
+
+    df = load_csv(file_path, get_report_columns(reports), cache_dir, file=file)
+    if isinstance(df, pd.DataFrame):
+        return {name: partial(df, *args) for name, (partial, _, args) in steps.items()}
+
+#Calculates all <reports> for several CSV-Files, each file is parsed and aggregated in one of <workers> processes
+#and the partial results are merged in the order of <file_paths>. The members of tar archives are aggregated in this
+#process while each archive is read once by iter_export_files.
+def calculate_reports_files(file_paths, reports, start_date=None, end_date=None, workers=None, chunksize=None, cache_dir=None, timezone=REPORT_TIMEZONE):
+    try:
+        files = [path for path in file_paths if not is_tar_member(path)]
+        arguments = (files, repeat(reports), repeat(start_date), repeat(end_date), repeat(chunksize), repeat(cache_dir), repeat(timezone))
+
+        if workers == 1 or len(files) <= 1:
+            partials = dict(zip(files, map(aggregate_file, *arguments)))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                partials = dict(zip(files, executor.map(aggregate_file, *arguments)))
+
+        for path, file in iter_export_files([path for path in file_paths if is_tar_member(path)]):
+            partials[path] = aggregate_file(path, reports, start_date, end_date, chunksize, cache_dir, timezone, file)
+        partials = [partials[path] for path in file_paths]
+
+        results = {}
+        for name, (_, merge, _) in get_report_steps(reports, start_date, end_date, timezone).items():
+            frames = [partial[name] for partial in partials if partial and isinstance(partial.get(name), pd.DataFrame)]
+            results[name] = merge(pd.concat(frames, ignore_index=True)) if frames else None
+
+        return finish_reports(reports, results.get('grouped'), results.get('issues'))
+    except Exception as e:
+        print(f"Couldn't calculate the reports for the files: {', '.join(file_paths)}, {e}")
+
+#Copies <arrays> to shared memory, so worker processes read them without pickling.
+#Returns the blocks, which the caller closes and unlinks, and the specs the workers attach to.
+def share_arrays(arrays):
+    from multiprocessing import shared_memory
+
+    blocks = []
+    specs = {}
+    try:
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[:] = array
+            specs[name] = (block.name, array.shape, array.dtype.str)
+    except Exception:
+        release_shared_arrays(blocks)
+        raise
+    return blocks, specs
+
+#Closes and removes the shared memory <blocks>
+def release_shared_arrays(blocks):
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+#Attaches to the shared arrays in <specs>, the blocks belong to the parent process so the worker only closes them
+def attach_shared_arrays(specs):
+    from multiprocessing import shared_memory
+
+    blocks = []
+    arrays = {}
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype, buffer=block.buf)
+    return blocks, arrays
+
+#Reduces the rows of one shard with the reducers in ISSUE_REDUCERS, grouped on the codes of issue_key.
+#Dictionary-encoded columns are reduced as floats, so missing values (-1) are skipped by first.
+def reduce_issue_shard(arrays, rows, columns):
+    data = {}
+    for column in columns:
+        values = arrays[column][rows]
+        data[column] = np.where(values >= 0, values, np.nan) if values.dtype.kind == 'i' else values
+    reducers = {column: (column, ISSUE_REDUCERS[column]) for column in columns}
+    df = pd.DataFrame(data)
+    issues = df.groupby(arrays['issue_key'][rows], sort=False).agg(**reducers)
+    if 'time_spent (hours)' in columns:
+        issues['time_spent (hours)'] = sum_floats(df, [arrays['issue_key'][rows]], 'time_spent (hours)', sort=False).to_numpy()
+    return issues
+
+#Aggregates shard <shard> of the timelog <arrays>. Rows are hash-partitioned on their group key,
+#so every group is reduced in one shard in the order of its rows.
+def aggregate_arrays(arrays, shard, columns):
+    results = {}
+    if 'group_shard' in arrays:
+        rows = np.flatnonzero(arrays['group_shard'] == shard)
+        keys = [arrays[column][rows] for column in ('account_label', 'user') if column in arrays]
+        hours = pd.DataFrame({'time_spent (hours)': arrays['time_spent (hours)'][rows]})
+        results['grouped'] = sum_floats(hours, keys, 'time_spent (hours)', sort=False)
+
+    if 'issue_shard' in arrays:
+        rows = np.flatnonzero(arrays['issue_shard'] == shard)
+        results['issues'] = reduce_issue_shard(arrays, rows, columns)
+    return results
+
+#Aggregates shard <shard> of the shared arrays in <specs>, it runs in the worker processes
+def aggregate_shard(specs, shard, columns):
+    blocks, arrays = attach_shared_arrays(specs)
+    try:
+        return aggregate_arrays(arrays, shard, columns)
+    finally:
+        arrays.clear()
+        for block in blocks:
+            block.close()
+
+#Gets the shard of each row from the codes of its group key, from 0 to <shards> - 1
+def hash_partition(codes, shards):
+    return (codes.astype(np.int64) * 2654435761 % (2 ** 32) % shards).astype(np.int16)
+
+#Calculates all <reports> from a timelog <store>. The groupbys run on the integer codes and only the results are decoded.
+#With more than one shard the rows are hash-partitioned and the shards are aggregated in parallel processes,
+#which read the arrays through shared memory. The results are the same as calculate_reports.
+def calculate_reports_store(store, reports, start_date=None, end_date=None, shards=1, timezone=REPORT_TIMEZONE, date_index=None):
+    arrays = {'time_spent (hours)': store['arrays']['time_spent (hours)']}
+    dictionaries = store['dictionaries']
+
+    group_columns = []
+    if 'list_empty_accounts' in reports or 'list_reported_time_per_account' in reports:
+        group_columns = [column for column in ('account_label', 'user') if column in store['arrays']]
+        group_key = np.zeros(store['rows'], dtype=np.int64)
+        for column in group_columns:
+            arrays[column] = store['arrays'][column]
+            group_key = group_key * (len(dictionaries[column]) + 1) + arrays[column] + 1
+        arrays['group_shard'] = hash_partition(group_key, shards)
+
+    issue_columns = []
+    if 'list_issues' in reports:
+        window = select_store_window(store, start_date, end_date, timezone, date_index)
+        issue_columns = [column for column in store['columns'] if column in ISSUE_REDUCERS]
+        for column in ['issue_key'] + issue_columns:
+            arrays[column] = store['arrays'][column]
+        issue_shard = hash_partition(arrays['issue_key'], shards)
+        #Rows outside the window or without an issue get the shard -1, which no shard aggregates
+        issue_shard[~window | (arrays['issue_key'] < 0)] = -1
+        arrays['issue_shard'] = issue_shard
+
+    if shards == 1:
+        partials = [aggregate_arrays(arrays, 0, issue_columns)]
+    else:
+        blocks, specs = share_arrays(arrays)
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=shards) as executor:
+                partials = list(executor.map(aggregate_shard, repeat(specs), range(shards), repeat(issue_columns)))
+        finally:
+            release_shared_arrays(blocks)
+
+    grouped = None
+    if group_columns:
+        hours = pd.concat([partial['grouped'] for partial in partials])
+        codes = [hours.index.get_level_values(level).to_numpy() for level in range(len(group_columns))]
+        order = np.lexsort([np.where(code < 0, np.iinfo(np.int32).max, code) for code in reversed(codes)])
+        grouped = pd.DataFrame({column: decode_column(code[order], dictionaries[column]) for column, code in zip(group_columns, codes)})
+        grouped['time_spent (hours)'] = hours.to_numpy()[order]
+
+    issues = None
+    if issue_columns:
+        summary = pd.concat([partial['issues'] for partial in partials]).sort_index()
+        issues = pd.DataFrame({'issue_key': decode_column(summary.index.to_numpy(np.int32), dictionaries['issue_key'])})
+        for column in issue_columns:
+            values = summary[column].to_numpy()
+            if column in dictionaries:
+                codes = np.where(np.isnan(values), -1, values).astype(np.int32)
+                values = decode_column(codes, dictionaries[column], DTYPES.get(column) == 'category')
+            issues[column] = values
+
+    return finish_reports(reports, grouped, issues)
+
+#Calculates all <reports> for one loaded DataFrame by hash-partitioning the rows into <shards> shards that are
+#aggregated in parallel processes, see calculate_reports_store. Returns None if they couldn't be calculated,
+#and the callers then calculate the reports in this process.
+def calculate_reports_sharded(df, reports, start_date=None, end_date=None, shards=None, timezone=REPORT_TIMEZONE):
+    try:
+        columns = get_report_columns(reports)
+        store = build_timelog_store(df[[column for column in df.columns if column in columns]], timezone)
+        return calculate_reports_store(store, reports, start_date, end_date, shards or os.cpu_count() or 1, timezone)
+    except Exception as e:
+        print(f"Couldn't calculate the reports in shards: {', '.join(reports)}, {e}")
+
+#Creates an empty incremental state for <file_path>
+def create_incremental_state(file_path, timezone=REPORT_TIMEZONE):
+    return {'version': STATE_VERSION, 'file': os.path.abspath(file_path), 'header': None, 'offset': 0, 'rows': 0,
+            'size': None, 'mtime': None, 'check_hash': None, 'timezone': timezone, 'grouped': None, 'issues': None}
+
+#Converts a DataFrame in the incremental state to arrays named <part>/<column>. Text columns are integer codes with
+#their distinct values in dictionaries/<part>/<column>, and the rows of the first values are integers with -1 for none.
+def state_frame_to_arrays(part, df, rows):
+    arrays = {}
+    for column in df.columns:
+        if column.endswith(' row'):
+            arrays[f"{part}/{column}"] = df[column].fillna(-1).to_numpy(get_code_dtype(rows))
+        elif pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_bool_dtype(df[column]):
+            arrays[f"{part}/{column}"] = df[column].to_numpy()
+        else:
+            codes, dictionary = encode_column(df[column])
+            arrays[f"{part}/{column}"] = codes.astype(get_code_dtype(len(dictionary)))
+            arrays[f"dictionaries/{part}/{column}"] = dictionary
+    return arrays
+
+#Converts the arrays of <part> from state_frame_to_arrays back to a DataFrame, or None if the state has no such part
+def state_arrays_to_frame(part, arrays):
+    data = {}
+    for name, values in arrays.items():
+        if not name.startswith(f"{part}/"):
+            continue
+        column = name[len(part) + 1:]
+        if f"dictionaries/{name}" in arrays:
+            data[column] = decode_column(values, arrays[f"dictionaries/{name}"], DTYPES.get(column) == 'category')
+        elif column.endswith(' row'):
+            data[column] = np.where(values < 0, np.nan, values)
+        else:
+            data[column] = values
+    return pd.DataFrame(data) if data else None
+
+#Reads the incremental state from <state_path>, or returns None if there is no state yet or it has another layout
+def load_incremental_state(state_path):
+    import zipfile
+    try:
+        with np.load(state_path) as data:
+            arrays = {name: data[name] for name in data.files}
+        state = json.loads(str(arrays.pop('state')))
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, OSError, zipfile.BadZipFile):
+        state = None
+
+    if state is None or state.get('version') != STATE_VERSION:
+        print(f"The state in {state_path} has another layout, it is built again from the whole file")
+        return None
+
+    state['grouped'] = state_arrays_to_frame('grouped', arrays)
+    state['issues'] = state_arrays_to_frame('issues', arrays)
+    return state
+
+#Writes the incremental state to <state_path> as a NumPy archive, the summaries as columns and the rest as JSON
+def save_incremental_state(state_path, state):
+    arrays = {'state': np.asarray(json.dumps({key: value for key, value in state.items() if key not in ('grouped', 'issues')}))}
+    for part in ('grouped', 'issues'):
+        if state[part] is not None:
+            arrays.update(state_frame_to_arrays(part, state[part], state['rows']))
+    with open(state_path + '.tmp', 'wb') as file:
+        np.savez(file, **arrays)
+    os.replace(state_path + '.tmp', state_path)
+
+#Hashes the last STATE_CHECK_BYTES bytes of <file> before <offset>, the last rows that have already been processed
+def hash_before_offset(file, offset):
+    start = max(0, offset - STATE_CHECK_BYTES)
+    file.seek(start)
+    return hashlib.sha256(file.read(offset - start)).hexdigest()
+
+#Checks if <state> can be continued for the file, the header and the bytes before the offset must be unchanged.
+#<check_hash> is the hash of the file from hash_before_offset. Only the last STATE_CHECK_BYTES processed bytes are
+#compared so a run doesn't read the whole file again, an edit of an earlier row that keeps the length of the file
+#up to these bytes isn't noticed. A file that is rewritten that way needs a new state file.
+def is_state_valid(state, header, size, check_hash):
+    if state is None or state['header'] != header or state['offset'] > size:
+        return False
+    return state['check_hash'] == check_hash
+
+#Reads the rows appended to <file_path> after the offset in <state>. Only complete records are read, nothing is read
+#if the size and modification time of the file are unchanged, and everything is read again if the header or the
+#last processed rows have changed.
+def read_new_rows(file_path, state):
+    if not is_plain_file(file_path):
+        raise ValueError("incremental updates need an uncompressed export, since rows are appended to it")
+
+    with open(file_path, 'rb') as file:
+        header = file.readline().decode('utf-8')
+        stat = os.fstat(file.fileno())
+        if state is not None and state['header'] == header and [state['size'], state['mtime']] == [stat.st_size, stat.st_mtime_ns]:
+            return state, None
+
+        check_hash = hash_before_offset(file, state['offset']) if state is not None and state['offset'] <= stat.st_size else None
+        if not is_state_valid(state, header, stat.st_size, check_hash):
+            state = create_incremental_state(file_path, state['timezone'] if state else REPORT_TIMEZONE)
+            state['header'] = header
+            state['offset'] = len(header.encode('utf-8'))
+
+        file.seek(state['offset'])
+        data = file.read(stat.st_size - state['offset'])
+        data = data[:find_last_record_end(data)]
+        state['offset'] += len(data)
+        state['check_hash'] = hash_before_offset(file, state['offset'])
+
+    state['size'] = stat.st_size
+    state['mtime'] = stat.st_mtime_ns
+    columns = get_report_columns(list(REPORT_COLUMNS))
+    df = pd.read_csv(io.BytesIO(header.encode('utf-8') + data), **get_read_options(columns)) if data else None
+    if df is not None:
+        df = sort_categories(parse_date_columns(df))
+    return state, df
+
+#Summarizes the timelogs in <df> per <keys> like summarize_data, and keeps the row in the file of every first value
+#in '<column> row'. <first_row> is the row in the file of the first timelog in <df>.
+def summarize_with_rows(df, keys, first_row=0):
+    data = df.copy(deep=False)
+    rows = pd.Series(np.arange(first_row, first_row + len(df), dtype=np.float64), index=df.index)
+    plan = build_aggregation_plan(df, keys)
+    for column, reducer in list(plan['reducers'].items()):
+        if reducer == 'first':
+            data[f"{column} row"] = rows.where(df[column].notna())
+            plan['reducers'][f"{column} row"] = 'min'
+    return summarize_data(data, plan)
+
+#Merges summaries from summarize_with_rows per <keys>, the rows of the first values are the smallest rows
+def merge_with_rows(df, keys):
+    plan = build_aggregation_plan(df, keys)
+    for column in plan['reducers']:
+        if column.endswith(' row'):
+            plan['reducers'][column] = 'min'
+    return summarize_data(df, plan)
+
+#Summarizes the summaries from summarize_with_rows in <df> per issue_key. Every first value is taken from the summary
+#with the smallest row, so it is the first value of the issue in the file, the same as summarize_data on the timelogs.
+def summarize_first_rows(df):
+    row_columns = [column for column in df.columns if column.endswith(' row')]
+    summary = summarize_data(df.drop(columns=row_columns))
+    df = df[df['issue_key'].notna()]
+    for row_column in row_columns:
+        column = row_column[:-len(' row')]
+        first = df.sort_values(['issue_key', row_column], kind='stable', na_position='last').drop_duplicates('issue_key')
+        summary[column] = first[column].reset_index(drop=True)
+    return summary
+
+#Updates the incremental state in <state_path> with the rows appended to <file_path> since the last run.
+#The state keeps the reported time per account and user, and the issue summaries per issue_key and day in <timezone>
+#like the rollup, with a flag for timelogs at midnight.
+def update_incremental_state(file_path, state_path, timezone=REPORT_TIMEZONE):
+    state = load_incremental_state(state_path)
+    if state is not None and state['timezone'] != timezone:
+        state = None
+
+    state, df = read_new_rows(file_path, state)
+    state['timezone'] = timezone
+
+    if df is not None and not df.empty:
+        grouped = group_time_by_account_and_user(df)
+        issues_df = df[[column for column in LIST_ISSUES_COLUMNS if column in df.columns and column != 'date_of_work']].copy()
+        issues_df['day'], issues_df['midnight'] = get_report_days(df['date_of_work'], timezone)
+        issues = summarize_with_rows(issues_df, STATE_ISSUE_KEYS, state['rows'])
+
+        if state['grouped'] is not None:
+            grouped = group_time_by_account_and_user(pd.concat([state['grouped'], grouped], ignore_index=True))
+            issues = merge_with_rows(pd.concat([state['issues'], issues], ignore_index=True), STATE_ISSUE_KEYS)
+
+        state['grouped'] = grouped
+        state['issues'] = issues
+        state['rows'] += len(df)
+
+    save_incremental_state(state_path, state)
+    return state
+
+#Calculates <reports> from the incremental state, updated with the rows appended to <file_path> since the last run.
+#The state only knows the day of the issues, so list_issues for a window with another time of day reads the whole file.
+def calculate_reports_incremental(file_path, state_path, reports, start_date=None, end_date=None, timezone=REPORT_TIMEZONE):
+    try:
+        state = update_incremental_state(file_path, state_path, timezone)
+        grouped = state['grouped']
+        issues = None
+
+        if grouped is None:
+            grouped = pd.DataFrame({'account_label': [], 'user': [], 'time_spent (hours)': []})
+
+        if 'list_issues' in reports and state['issues'] is not None:
+            issues_df = state['issues']
+            mask = get_rollup_window(issues_df['day'].to_numpy(), issues_df['midnight'].to_numpy(), start_date, end_date)
+            if mask is None:
+                issues = partial_list_issues(load_csv(file_path, LIST_ISSUES_COLUMNS), start_date, end_date, timezone)
+            else:
+                issues = summarize_first_rows(issues_df.loc[mask].drop(columns=['day', 'midnight']))
+
+        return finish_reports(reports, grouped, issues)
+    except Exception as e:
+        print(f"Couldn't update the reports incrementally for file: {file_path}, {e}")
+
+#Sums the time spent per <label_name> with the csv module, only for rows without an account if <only_empty_accounts>.
+#Returns None if the file has more than <max_rows> rows or can't be read this way, so pandas is used instead.
+def sum_time_small_csv(file_path, label_name, only_empty_accounts, max_rows=FAST_PATH_MAX_ROWS):
+    with open_input(file_path) as binary, io.TextIOWrapper(binary, encoding='utf-8-sig', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if not header or not {label_name, 'account_label', 'time_spent (hours)'} <= set(header):
+            return None
+
+        label_index = header.index(label_name)
+        account_index = header.index('account_label')
+        time_index = header.index('time_spent (hours)')
+        totals = {}
+        rows = 0
+
+        for row in reader:
+            if not row:
+                continue
+            rows += 1
+            if rows > max_rows or len(row) != len(header):
+                return None
+            if only_empty_accounts and row[account_index] not in CSV_NA_VALUES:
+                continue
+
+            label = None if row[label_index] in CSV_NA_VALUES else row[label_index]
+            values = totals.setdefault(label, [])
+            if row[time_index] not in CSV_NA_VALUES:
+                try:
+                    values.append(float(row[time_index]))
+                except ValueError:
+                    return None
+
+    return {label: math.fsum(values) for label, values in totals.items()}
+
+#Formats floats like pandas does in print_df, or returns None where pandas would switch to scientific notation
+def format_float_column(values):
+    if any(value < 0 or value > 1e6 or 0 < value < 1e-6 or math.isnan(value) for value in values):
+        return None
+    decimals = max(max(len(f"{value:.6f}".split('.')[1].rstrip('0')) for value in values), 1)
+    return [f"{value:.{decimals}f}" for value in values]
+
+#Formats <totals> as the report printed by print_df, sorted by label with missing labels and the total last
+def format_time_table(totals, first_label, second_label='Time Spent'):
+    if not totals:
+        return None
+
+    labels = sorted(label for label in totals if label is not None)
+    if None in totals:
+        labels.append(None)
+    sums = [totals[label] for label in labels]
+    values = format_float_column(sums + [math.fsum(sums)])
+    if values is None:
+        return None
+
+    names = ['NaN' if label is None else label for label in labels] + ['Total Result']
+    first_width = max(len(first_label), *map(len, names))
+    second_width = max(len(second_label) + 1, *map(len, values))
+    lines = [f"{first_label:>{first_width}} {second_label:>{second_width}}"]
+    lines += [f"{name:>{first_width}} {value:>{second_width}}" for name, value in zip(names, values)]
+    return '\n'.join(lines)
+
+#Creates the report <first_label>/'Time Spent' for a small CSV-File without pandas, or returns None
+#if the file is too large or unusual, in which case the report is created with pandas.
+#It is skipped when profiling, so every stage is measured.
+def fast_time_report(file_path, label_name, first_label, only_empty_accounts, max_rows=FAST_PATH_MAX_ROWS):
+    if not max_rows or PROFILE is not None or not os.path.isfile(get_source_path(file_path)):
+        return None
+    try:
+        return format_time_table(sum_time_small_csv(file_path, label_name, only_empty_accounts, max_rows), first_label)
+    except (UnicodeDecodeError, csv.Error):
+        return None
+
+#Prints the first <rows> rows of <df>, with a note of how many rows are left out
+def print_preview(df, rows=DEFAULT_PREVIEW_ROWS):
+    if rows and isinstance(df, pd.DataFrame):
+        print(df.head(rows))
+        if len(df) > rows:
+            print(f"... {len(df) - rows} more rows")
+
+#Prints out DataFrame without index values.
+def print_df(df):
+    try:
+        if df is None:
+            print("Please provide a DataFrame")
+
+        if isinstance(df, pd.DataFrame):
+            print(df.to_string(index=False))
+    except Exception as e:
+        print(f"Couldnt print DataFrame: {df}, {e}")
+
+#Lists users with time reports for all empty accounts.
+def list_empty_accounts(file_path, chunksize=None, cache_dir=None, workers=None, state_path=None, fast_path_rows=0, engine='pandas', threads=None):
+    try:
+        if file_path is None:
+            print("Please provide a file_path")
+
+        if state_path:
+            results = calculate_reports_incremental(file_path, state_path, ['list_empty_accounts'])
+            if results:
+                print_df(results['list_empty_accounts'])
+            return
+
+        if cache_dir:
+            results = calculate_reports_memoized(file_path, ['list_empty_accounts'], chunksize=chunksize, cache_dir=cache_dir, workers=workers, engine=engine, threads=threads)
+            if results:
+                print_df(results['list_empty_accounts'])
+            return
+
+        if engine != 'pandas':
+            print_df(calculate_reports_engine(file_path, ['list_empty_accounts'], engine=engine, threads=threads)['list_empty_accounts'])
+            return
+
+        file_paths = find_file_paths(file_path)
+        if len(file_paths) > 1:
+            results = calculate_reports_files(file_paths, ['list_empty_accounts'], workers=workers, chunksize=chunksize)
+            if results:
+                print_df(results['list_empty_accounts'])
+            return
+        file_path = file_paths[0]
+
+        if chunksize:
+            result_df = aggregate_chunks(file_path, chunksize, partial_empty_accounts, merge_empty_accounts, columns=EMPTY_ACCOUNTS_COLUMNS)
+            total_df = calculate_final_list_empty_accounts(result_df)
+            print_df(total_df)
+            return
+
+        report = fast_time_report(file_path, 'user', 'User', True, fast_path_rows)
+        if report:
+            print(report)
+            return
+
+        df = load_csv(file_path, EMPTY_ACCOUNTS_COLUMNS, threads=threads)
+
+        results = calculate_reports_sharded(df, ['list_empty_accounts'], shards=workers) if isinstance(df, pd.DataFrame) and workers and workers > 1 else None
+
+        if results is not None:
+            print_df(results['list_empty_accounts'])
+        elif isinstance(df, pd.DataFrame):
+            result_df = calculate_user_time(df)
+            total_df = calculate_final_list_empty_accounts(result_df)
+            print_df(total_df)
+    except Exception as e:
+        print(f"Couldn't start the program with file_path: {file_path}, {e}")
+        sys.exit(1)
+
+#Lists reported time for all accounts
+def list_reported_time_per_account(file_path, chunksize=None, cache_dir=None, workers=None, state_path=None, fast_path_rows=0, engine='pandas', threads=None):
+    try:
+        if file_path is None:
+            print("Please provide a file_path")
+
+        if state_path:
+            results = calculate_reports_incremental(file_path, state_path, ['list_reported_time_per_account'])
+            if results:
+                print_df(results['list_reported_time_per_account'])
+            return
+
+        if cache_dir:
+            results = calculate_reports_memoized(file_path, ['list_reported_time_per_account'], chunksize=chunksize, cache_dir=cache_dir, workers=workers, engine=engine, threads=threads)
+            if results:
+                print_df(results['list_reported_time_per_account'])
+            return
+
+        if engine != 'pandas':
+            print_df(calculate_reports_engine(file_path, ['list_reported_time_per_account'], engine=engine, threads=threads)['list_reported_time_per_account'])
+            return
+
+        file_paths = find_file_paths(file_path)
+        if len(file_paths) > 1:
+            results = calculate_reports_files(file_paths, ['list_reported_time_per_account'], workers=workers, chunksize=chunksize)
+            if results:
+                print_df(results['list_reported_time_per_account'])
+            return
+        file_path = file_paths[0]
+
+        if chunksize:
+            result_df = aggregate_chunks(file_path, chunksize, partial_reported_time_per_account, merge_reported_time_per_account, columns=REPORTED_TIME_COLUMNS)
+            total_df = calculate_final_reported_time_for_user(result_df)
+            print_df(total_df)
+            return
+
+        report = fast_time_report(file_path, 'account_label', 'Account Label', False, fast_path_rows)
+        if report:
+            print(report)
+            return
+
+        df = load_csv(file_path, REPORTED_TIME_COLUMNS, threads=threads)
+
+        results = calculate_reports_sharded(df, ['list_reported_time_per_account'], shards=workers) if isinstance(df, pd.DataFrame) and workers and workers > 1 else None
+
+        if results is not None:
+            print_df(results['list_reported_time_per_account'])
+        elif isinstance(df, pd.DataFrame):
+            result_df = calculate_account_time(df)
+            total_df = calculate_final_reported_time_for_user(result_df)
+            print_df(total_df)
+    except Exception as e:
+        print(f"Couldn't start the program with file_path: {file_path}, {e}")
+        sys.exit(1)
+
+#Formats and lists the issues in a CSV
+def list_issues(file_path, start_date, end_date, output_path, chunksize=None, cache_dir=None, timezone=REPORT_TIMEZONE, workers=None, state_path=None, output_format=None, preview_rows=DEFAULT_PREVIEW_ROWS, engine='pandas', threads=None):
+    try:
+        if file_path is None:
+            print("Please provide a file_path")
         
-        if sys.argv[1] == "--list_empty_accounts" or sys.argv[1] == "--list_reported_time_per_account":
-            if sys.argv[1] == "--list_empty_accounts":
-                list_empty_accounts(file_path)
+        if start_date is None:
+            print("Please provide a start_date")
+
+        if end_date is None:
+            print("Please provide a end date")
+
+        if state_path:
+            results = calculate_reports_incremental(file_path, state_path, ['list_issues'], start_date, end_date, timezone)
+            if results:
+                print_preview(results['list_issues'], preview_rows)
+                dataframe_to_csv(results['list_issues'], output_path, output_format)
+            return
+
+        if cache_dir:
+            results = calculate_reports_memoized(file_path, ['list_issues'], start_date, end_date, chunksize, cache_dir, timezone, workers, engine, threads)
+            if results:
+                print_preview(results['list_issues'], preview_rows)
+                dataframe_to_csv(results['list_issues'], output_path, output_format)
+            return
+
+        if engine != 'pandas':
+            formated_df = calculate_reports_engine(file_path, ['list_issues'], start_date, end_date, engine, timezone=timezone, threads=threads)['list_issues']
+            print_preview(formated_df, preview_rows)
+            dataframe_to_csv(formated_df, output_path, output_format)
+            return
+
+        file_paths = find_file_paths(file_path)
+        if len(file_paths) > 1:
+            results = calculate_reports_files(file_paths, ['list_issues'], start_date, end_date, workers, chunksize, timezone=timezone)
+            if results:
+                print_preview(results['list_issues'], preview_rows)
+                dataframe_to_csv(results['list_issues'], output_path, output_format)
+            return
+        file_path = file_paths[0]
+
+        if chunksize:
+            formated_df = aggregate_chunks(file_path, chunksize, partial_list_issues, merge_list_issues, start_date, end_date, timezone, columns=LIST_ISSUES_COLUMNS)
+            print_preview(formated_df, preview_rows)
+            dataframe_to_csv(formated_df, output_path, output_format)
+            return
+
+        df = load_csv(file_path, LIST_ISSUES_COLUMNS, threads=threads)
+        
+        if isinstance(df, pd.DataFrame):
+            results = calculate_reports_sharded(df, ['list_issues'], start_date, end_date, workers, timezone) if workers and workers > 1 else None
+            if results is not None:
+                formated_df = results['list_issues']
+            else:
+                converted_df = convert_date(df, start_date, end_date, 'date_of_work', timezone)
+                columns_list = ['date_of_work', 'user', 'timelog_note']
+                formated_df = get_list_issues(converted_df, columns_list)
+            print_preview(formated_df, preview_rows)
+            dataframe_to_csv(formated_df, output_path, output_format)
+        
+    except FileNotFoundError as e:
+        print(f"Couldn't find file: {file_path}, {e}")
+    except Exception as e:
+        print(f"Couldn't create DataFrame for file: {file_path}")
+
+#Lists the issues for several date windows (start_date, end_date) from one load of the CSV-File.
+#The dates are sorted once and each window is written to <output_path>_<start_date>_<end_date>.csv
+def list_issues_windows(file_path, windows, output_path, cache_dir=None, timezone=REPORT_TIMEZONE, output_format=None, threads=None):
+    try:
+        if file_path is None:
+            print("Please provide a file_path")
+
+        if not windows:
+            print("Please provide at least one date window")
+            return
+
+        file_paths = find_file_paths(file_path)
+        df = load_exports(file_paths, LIST_ISSUES_COLUMNS, cache_dir, threads)
+
+        if isinstance(df, pd.DataFrame):
+            if cache_dir and len(file_paths) == 1:
+                date_index = get_cached_date_index(file_paths[0], df, 'date_of_work', cache_dir, timezone)
             else:
-                list_reported_time_per_account(file_path)
-
-        elif sys.argv[1] == "--list_issues":
-            if "--start=" in sys.argv[2] and "--end=" in sys.argv[3]:
-                start_date = sys.argv[2].split('=')[1]
-                end_date = sys.argv[3].split('=')[1]
-                file_path = sys.argv[4]
-                output_path = sys.argv[5]
-                list_issues(file_path, start_date, end_date, output_path)
-                print(f"A CSV file called output.csv with the listed issues, has been created for file: {file_path} in the folder: {output_path}")
+                date_index = build_date_index(df, 'date_of_work', timezone)
+
+            for start_date, end_date in windows:
+                formated_df = list_issues_in_window(df, date_index, start_date, end_date)
+                dataframe_to_csv(formated_df, f"{output_path}_{start_date}_{end_date}", output_format)
+    except Exception as e:
+        print(f"Couldn't list the issues for file: {file_path}, {e}")
+        sys.exit(1)
+
+#Lists the issues for every date window in <windows> in one pass over the CSV-File.
+#All periods are written to <output_path>.csv, or with <split> each period to <output_path>_<start_date>_<end_date>.csv
+def list_issues_periods(file_path, windows, output_path, split=False, cache_dir=None, timezone=REPORT_TIMEZONE, output_format=None, threads=None):
+    try:
+        if file_path is None:
+            print("Please provide a file_path")
+
+        if not windows:
+            print("Please provide at least one period")
+            return
+
+        df = load_exports(find_file_paths(file_path), LIST_ISSUES_COLUMNS, cache_dir, threads)
+        summary_df = summarize_periods(df, windows, timezone)
+
+        if not isinstance(summary_df, pd.DataFrame):
+            return
+
+        if not split:
+            dataframe_to_csv(summary_df, output_path, output_format)
+            return
+
+        for start_date, end_date in windows:
+            period_df = summary_df[summary_df['period'] == f"{start_date}:{end_date}"]
+            dataframe_to_csv(period_df.drop(columns=['period']), f"{output_path}_{start_date.replace(':', '')}_{end_date.replace(':', '')}", output_format)
+    except Exception as e:
+        print(f"Couldn't list the issues per period for file: {file_path}, {e}")
+        sys.exit(1)
+
+#Parses date windows written as <start_date>:<end_date>,<start_date>:<end_date>
+def parse_windows(windows):
+    return [tuple(window.split(':', 1)) for window in windows.split(',') if window]
+
+#Report results of earlier queries, least recently used first, and the lookups answered from memory, from disk or calculated
+RESULT_CACHE = {'entries': collections.OrderedDict(), 'hits': 0, 'disk_hits': 0, 'misses': 0, 'lock': threading.Lock()}
+
+#Gets a fingerprint of the exports from their <states>, the path, size and modification time of every file
+def get_data_fingerprint(states):
+    files = sorted([os.path.abspath(path), size, mtime] for path, (size, mtime) in states.items())
+    return hashlib.sha256(json.dumps(files).encode('utf-8')).hexdigest()
+
+#Gets the key of a <report> result from the <fingerprint> of the exports and the normalized parameters of the report.
+#Only list_issues depends on the dates and the timezone, and the same window written differently gets the same key.
+#The key includes RESULT_CACHE_VERSION, so results cached before a fix are calculated again.
+def get_result_key(fingerprint, report, start_date=None, end_date=None, timezone=REPORT_TIMEZONE):
+    parameters = {'fingerprint': fingerprint, 'report': report, 'version': RESULT_CACHE_VERSION}
+    if report == 'list_issues':
+        start, end = get_window_bounds(start_date, end_date)
+        parameters.update(start=start.isoformat(), end=end.isoformat(), timezone=timezone)
+    return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode('utf-8')).hexdigest()
+
+#Gets the counters of the result cache
+def get_result_cache_stats():
+    with RESULT_CACHE['lock']:
+        return {'hits': RESULT_CACHE['hits'], 'disk_hits': RESULT_CACHE['disk_hits'], 'misses': RESULT_CACHE['misses'], 'entries': len(RESULT_CACHE['entries'])}
+
+#Empties the in-memory result cache and resets its counters
+def clear_result_cache():
+    with RESULT_CACHE['lock']:
+        RESULT_CACHE['entries'].clear()
+        RESULT_CACHE.update(hits=0, disk_hits=0, misses=0)
+
+#Adds <df> to the in-memory result cache, the least recently used results are dropped above <max_entries>
+def remember_result(key, df, max_entries=RESULT_CACHE_ENTRIES):
+    with RESULT_CACHE['lock']:
+        entries = RESULT_CACHE['entries']
+        entries[key] = df
+        entries.move_to_end(key)
+        while len(entries) > max_entries:
+            entries.popitem(last=False)
+
+#Removes the results in <folder> older than <ttl> seconds, and then the least recently used ones until the folder is below <max_bytes>.
+#The modification time of a result is when it was written and the access time when it was last read.
+#Results pickled by older versions are removed, they are never read.
+def evict_result_files(folder, max_bytes=RESULT_CACHE_MAX_BYTES, ttl=RESULT_CACHE_TTL):
+    files = []
+    now = time.time()
+    for entry in os.scandir(folder):
+        if not entry.name.endswith(('.feather', '.pkl')):
+            continue
+        stat = entry.stat()
+        if entry.name.endswith('.pkl') or now - stat.st_mtime > ttl:
+            os.remove(entry.path)
+        else:
+            files.append((stat.st_atime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        total -= size
+        os.remove(path)
+
+#Gets the result with <key> from memory, or from <cache_dir>/results if it is younger than <ttl> seconds. Returns None on a miss.
+def get_cached_result(key, cache_dir=None, ttl=RESULT_CACHE_TTL):
+    with RESULT_CACHE['lock']:
+        entries = RESULT_CACHE['entries']
+        if key in entries:
+            entries.move_to_end(key)
+            RESULT_CACHE['hits'] += 1
+            return entries[key].copy(deep=False)
+
+    if cache_dir:
+        path = os.path.join(cache_dir, RESULT_CACHE_FOLDER, key + '.feather')
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime <= ttl:
+                df = pd.read_feather(path)
+                os.utime(path, (time.time(), stat.st_mtime))
+                remember_result(key, df)
+                with RESULT_CACHE['lock']:
+                    RESULT_CACHE['disk_hits'] += 1
+                return df.copy(deep=False)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Couldn't read the cached result {path}, {e}", file=sys.stderr)
+
+    with RESULT_CACHE['lock']:
+        RESULT_CACHE['misses'] += 1
+    return None
+
+#Adds the result <df> with <key> to the result cache, and to <cache_dir>/results when a cache folder is used.
+#The result is written as Feather to a temporary file first, so processes sharing the folder never read half a result.
+def put_cached_result(key, df, cache_dir=None, max_bytes=RESULT_CACHE_MAX_BYTES, ttl=RESULT_CACHE_TTL):
+    remember_result(key, df)
+    if not cache_dir:
+        return
+
+    import tempfile
+    folder = os.path.join(cache_dir, RESULT_CACHE_FOLDER)
+    path = os.path.join(folder, key + '.feather')
+    try:
+        os.makedirs(folder, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=folder, prefix=key, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                df.to_feather(file, compression='uncompressed')
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        evict_result_files(folder, max_bytes, ttl)
+    except Exception as e:
+        print(f"Couldn't cache the result in {folder}, {e}", file=sys.stderr)
+
+#Gets <reports> for the exports with <fingerprint> from the result cache. Only the reports that aren't cached are
+#calculated with <calculate>, which takes a list of reports and returns the results by report, and they are added to the cache.
+def memoize_reports(fingerprint, reports, start_date, end_date, timezone, cache_dir, calculate):
+    keys = {report: get_result_key(fingerprint, report, start_date, end_date, timezone) for report in reports}
+    results = {}
+    for report, key in keys.items():
+        result = get_cached_result(key, cache_dir)
+        if result is not None:
+            results[report] = result
+
+    missing = [report for report in reports if report not in results]
+    if missing:
+        calculated = calculate(missing)
+        if not calculated:
+            return None
+        for report in missing:
+            if calculated.get(report) is not None:
+                put_cached_result(keys[report], calculated[report], cache_dir)
+                results[report] = calculated[report]
+
+    return {report: results[report] for report in reports if report in results}
+
+#Calculates <reports> for the exports in <file_path> with the engine, the processes and the cache that are chosen
+def calculate_file_reports(file_path, reports, start_date=None, end_date=None, chunksize=None, cache_dir=None, timezone=REPORT_TIMEZONE, workers=None, engine='pandas', threads=None):
+    if engine != 'pandas':
+        return calculate_reports_engine(file_path, reports, start_date, end_date, engine, cache_dir, timezone, threads)
+
+    file_paths = find_file_paths(file_path)
+    if len(file_paths) > 1:
+        return calculate_reports_files(file_paths, reports, start_date, end_date, workers, chunksize, cache_dir, timezone)
+    file_path = file_paths[0]
+    if chunksize:
+        return calculate_reports_chunks(file_path, reports, start_date, end_date, chunksize, timezone)
+
+    results = calculate_reports_rollup(file_path, reports, start_date, end_date, cache_dir, timezone, threads) if cache_dir else None
+    if results is None:
+        df = load_csv(file_path, get_report_columns(reports), cache_dir, threads)
+        if workers and workers > 1:
+            results = calculate_reports_sharded(df, reports, start_date, end_date, workers, timezone)
+        if results is None:
+            results = calculate_reports(df, reports, start_date, end_date, timezone)
+    return results
+
+#Calculates <reports> for the exports in <file_path> like calculate_file_reports, a repeated query is answered from the result cache
+def calculate_reports_memoized(file_path, reports, start_date=None, end_date=None, chunksize=None, cache_dir=None, timezone=REPORT_TIMEZONE, workers=None, engine='pandas', threads=None):
+    fingerprint = get_data_fingerprint(get_file_states(file_path))
+    return memoize_reports(fingerprint, reports, start_date, end_date, timezone, cache_dir,
+                           lambda missing: calculate_file_reports(file_path, missing, start_date, end_date, chunksize, cache_dir, timezone, workers, engine, threads))
+
+#Runs several reports on the CSV-File, which is only loaded once, and writes each report to <output_path>_<report>.csv
+def run_reports(file_path, reports, start_date, end_date, output_path, chunksize=None, cache_dir=None, timezone=REPORT_TIMEZONE, workers=None, state_path=None, output_format=None, engine='pandas', threads=None):
+    try:
+        if file_path is None:
+            print("Please provide a file_path")
+
+        unknown = [report for report in reports if report not in REPORT_COLUMNS]
+        if unknown:
+            print(f"Unknown reports: {', '.join(unknown)}, choose from: {', '.join(REPORT_COLUMNS)}")
+            return
+
+        if 'list_issues' in reports and (start_date is None or end_date is None):
+            print("Please provide a start_date and end_date for the report: list_issues")
+            return
+
+        if state_path:
+            results = calculate_reports_incremental(file_path, state_path, reports, start_date, end_date, timezone)
+        else:
+            results = calculate_reports_memoized(file_path, reports, start_date, end_date, chunksize, cache_dir, timezone, workers, engine, threads)
+
+        if results:
+            for report, result_df in results.items():
+                dataframe_to_csv(result_df, f"{output_path}_{report}", output_format)
+    except Exception as e:
+        print(f"Couldn't run the reports for file: {file_path}, {e}")
+        sys.exit(1)
+
+#Pipeline stages that are timed when profiling is turned on
+PROFILED_STAGES = [
+    'load_csv',
+    'load_csv_chunks',
+    'convert_date',
+    'get_list_issues',
+    'summarize_data',
+    'format_dataframe',
+    'calculate_reports',
+    'calculate_file_reports',
+    'print_df',
+    'print_preview',
+    'dataframe_to_csv',
+]
+
+#Collected stage statistics and the original stage functions, None when profiling is turned off
+PROFILE = None
+
+#Gets the peak resident memory of the process in bytes, or None where it can't be read
+def get_peak_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+#Gets the amount of rows in a DataFrame, or in a dict of DataFrames
+def count_rows(value):
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(df) for df in value.values() if isinstance(df, pd.DataFrame))
+    return None
+
+#Starts measuring one call of a stage, the measurement is added to the stage statistics by finish_stage
+def start_stage():
+    stack = PROFILE['stack']
+    if PROFILE['memory']:
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+        tracemalloc.reset_peak()
+        stack.append({'start': current, 'peak': current})
+    return {'rss': get_peak_rss(), 'start': time.perf_counter()}
+
+#Adds the time and memory of the call measured since start_stage to <stats>. The peak resident memory of the process
+#only grows, so a stage gets the amount it raised that peak, which is 0 for a stage that stays below an earlier peak.
+def finish_stage(stats, measurement):
+    stats['seconds'] += time.perf_counter() - measurement['start']
+    stack = PROFILE['stack']
+    if PROFILE['memory']:
+        frame = stack.pop()
+        peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+        stats['peak_traced'] = max(stats['peak_traced'] or 0, peak - frame['start'])
+        if stack:
+            stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+    rss = get_peak_rss()
+    if rss is not None and measurement['rss'] is not None:
+        stats['peak_rss_growth'] = max(stats['peak_rss_growth'] or 0, rss - measurement['rss'])
+
+#Wraps the stage <name> so that its time, rows in and out and peak memory are added to PROFILE.
+#Times of nested stages are also included in the stage that calls them. A generator stage, like load_csv_chunks,
+#is measured while each item is produced, so reading the chunks isn't counted in the stage that consumes them.
+def profile_stage(name, func):
+    def get_stats(args):
+        stats = PROFILE['stages'].setdefault(name, {'calls': 0, 'seconds': 0.0, 'rows_in': 0, 'rows_out': 0, 'peak_rss_growth': None, 'peak_traced': None})
+        stats['calls'] += 1
+        stats['rows_in'] += next((count_rows(arg) for arg in args if count_rows(arg) is not None), 0)
+        return stats
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            stats = get_stats(args)
+            iterator = func(*args, **kwargs)
+            try:
+                while True:
+                    measurement = start_stage()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        finish_stage(stats, measurement)
+                    stats['rows_out'] += count_rows(item) or 0
+                    yield item
+            finally:
+                iterator.close()
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stats = get_stats(args)
+        measurement = start_stage()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            finish_stage(stats, measurement)
+        stats['rows_out'] += count_rows(result) or 0
+        return result
+    return wrapper
+
+#Turns on profiling by replacing the stages with timed versions, the stages are untouched when it is off.
+#With <memory> the peak memory of every stage is traced as well, which makes the stages slower.
+def enable_profiling(memory=False):
+    global PROFILE
+    if PROFILE is not None:
+        return
+    PROFILE = {'stages': {}, 'stack': [], 'memory': memory, 'originals': {}}
+    for name in PROFILED_STAGES:
+        PROFILE['originals'][name] = globals()[name]
+        globals()[name] = profile_stage(name, globals()[name])
+    if memory:
+        tracemalloc.start()
+
+#Turns off profiling, restores the stages and returns the collected statistics
+def disable_profiling():
+    global PROFILE
+    if PROFILE is None:
+        return {}
+    globals().update(PROFILE['originals'])
+    if PROFILE['memory']:
+        tracemalloc.stop()
+    stages = PROFILE['stages']
+    PROFILE = None
+    return stages
+
+#Prints the collected statistics as a table and writes them as JSON to <json_path> if provided
+def report_profile(stages, json_path=None):
+    if not stages:
+        return
+    table = pd.DataFrame.from_dict(stages, orient='index')
+    for column in ('peak_rss_growth', 'peak_traced'):
+        table[column] = pd.to_numeric(table[column]) / 1024 ** 2
+    table = table.dropna(axis=1, how='all').rename(columns={'peak_rss_growth': 'peak_rss_growth (MB)', 'peak_traced': 'peak_traced (MB)'})
+    print(table.sort_values('seconds', ascending=False).to_string(float_format=lambda value: f"{value:.4f}"), file=sys.stderr)
+    cache = get_result_cache_stats()
+    if cache['hits'] or cache['disk_hits'] or cache['misses']:
+        print(f"Result cache: {cache['hits']} hits, {cache['disk_hits']} disk hits, {cache['misses']} misses", file=sys.stderr)
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump(stages, file, indent=2)
+
+#Imports the package of <engine>, the engines are optional
+def import_engine(engine):
+    try:
+        return importlib.import_module(engine)
+    except ImportError:
+        raise ImportError(f"The {engine} engine requires the {engine} package, install it with: pip install {engine}")
+
+#Gets the files the engines scan, the CSV-Files or with <cache_dir> Parquet copies of them written once by <write>
+def get_engine_sources(file_paths, cache_dir, write):
+    if not cache_dir:
+        return file_paths, 'csv'
+
+    sources = []
+    for file_path in file_paths:
+        key = os.path.abspath(file_path) + '#parquet'
+        with update_cache_manifest(cache_dir) as manifest:
+            entry = get_cache_entry(file_path, cache_dir, manifest, key)
+            if entry is None:
+                content_hash = hash_file(file_path)
+                cache_file = hashlib.sha256((key + content_hash).encode('utf-8')).hexdigest() + '.parquet'
+                write(file_path, os.path.join(cache_dir, cache_file))
+                add_cache_entry(file_path, key, content_hash, cache_file, cache_dir, manifest)
+                entry = manifest[key]
+            entry['last_used'] = time.time()
+            sources.append(os.path.join(cache_dir, entry['file']))
+    return sources, 'parquet'
+
+#Gets the distinct values of date_of_work that fall between <start_date> and <end_date> in <timezone>.
+#The dates are parsed with parse_dates, so the engines filter the same rows as convert_date.
+def get_dates_in_window(dates, start_date, end_date, timezone=REPORT_TIMEZONE):
+    dates = pd.Series(dates, dtype=object).dropna()
+    local = to_report_timezone(parse_dates(dates, timezone), timezone)
+    start_date, end_date = get_window_bounds(start_date, end_date)
+    return dates[(local >= start_date) & (local <= end_date)].tolist()
+
+#Converts the grouped hours and issue summaries from an engine to the DataFrames the pandas engine creates
+def finish_engine_reports(reports, grouped, issues):
+    for df in (grouped, issues):
+        if df is not None:
+            for column in df.columns:
+                if DTYPES.get(column) == 'category':
+                    df[column] = df[column].astype('category')
+    return finish_reports(reports, grouped, issues)
+
+#Scans <sources> lazily with polars, with the same missing values and types as load_csv
+def polars_scan(pl, sources, kind, columns):
+    if kind == 'parquet':
+        return pl.scan_parquet(sources).select(columns)
+    types = {column: pl.Float64 if DTYPES.get(column) == 'float64' else pl.String for column in columns}
+    return pl.scan_csv(sources, schema_overrides=types, null_values=sorted(CSV_NA_VALUES), infer_schema=False).select(columns)
+
+#Sums <column> with polars like sum_floats
+def polars_sum(pl, column):
+    values = pl.col(column).fill_null(0.0)
+    high = (values * SUM_STEPS[0]).floor()
+    low = ((values - high / SUM_STEPS[0]) * SUM_STEPS[1]).floor()
+    return (high.cast(pl.Int64).sum().cast(pl.Float64) / SUM_STEPS[0] + low.cast(pl.Int64).sum().cast(pl.Float64) / SUM_STEPS[1]).alias(column)
+
+#Calculates <reports> with lazy polars queries, run by the streaming engine on all cores
+def calculate_reports_polars(file_paths, reports, start_date=None, end_date=None, cache_dir=None, timezone=REPORT_TIMEZONE):
+    pl = import_engine('polars')
+    columns = get_report_columns(reports)
+
+    def write(file_path, path):
+        polars_scan(pl, [file_path], 'csv', get_report_columns(list(REPORT_COLUMNS))).sink_parquet(path)
+
+    sources, kind = get_engine_sources(file_paths, cache_dir, write)
+    rows = polars_scan(pl, sources, kind, columns)
+    grouped = None
+    issues = None
+
+    if 'list_empty_accounts' in reports or 'list_reported_time_per_account' in reports:
+        keys = [column for column in ('account_label', 'user') if column in columns]
+        query = rows.group_by(keys).agg(polars_sum(pl, 'time_spent (hours)'))
+        grouped = query.collect(engine='streaming').to_pandas()
+
+    if 'list_issues' in reports:
+        dates = rows.select(pl.col('date_of_work').unique()).collect(engine='streaming').to_series().to_list()
+        firsts = [column for column in LIST_ISSUES_COLUMNS if ISSUE_REDUCERS.get(column) == 'first']
+        query = (rows.with_row_index('row')
+                 .filter(pl.col('date_of_work').is_in(get_dates_in_window(dates, start_date, end_date, timezone)) & pl.col('issue_key').is_not_null())
+                 .group_by('issue_key')
+                 .agg([polars_sum(pl, 'time_spent (hours)')] + [pl.col(column).sort_by('row').drop_nulls().first() for column in firsts])
+                 .sort('issue_key')
+                 .select([column for column in LIST_ISSUES_COLUMNS if column != 'date_of_work']))
+        issues = query.collect(engine='streaming').to_pandas()
+
+    return finish_engine_reports(reports, grouped, issues)
+
+#Sums <column> in a duckdb query like sum_floats
+def duckdb_sum(column):
+    values = f'COALESCE("{column}", 0)'
+    high = f'floor({values} * {SUM_STEPS[0]})'
+    low = f'floor(({values} - {high} / {SUM_STEPS[0]}) * {SUM_STEPS[1]})'
+    sums = [f'CAST(CAST(sum(CAST({steps} AS BIGINT)) AS BIGINT) AS DOUBLE) / {size}' for steps, size in ((high, SUM_STEPS[0]), (low, SUM_STEPS[1]))]
+    return f'{sums[0]} + {sums[1]} AS "{column}"'
+
+#Calculates <reports> with duckdb queries, run on all cores and spilled to disk above DUCKDB_MEMORY_LIMIT
+def calculate_reports_duckdb(file_paths, reports, start_date=None, end_date=None, cache_dir=None, timezone=REPORT_TIMEZONE):
+    duckdb = import_engine('duckdb')
+    import tempfile
+
+    connection = duckdb.connect()
+    try:
+        connection.execute(f"SET memory_limit = '{DUCKDB_MEMORY_LIMIT}'")
+        connection.execute("SET temp_directory = ?", [cache_dir or tempfile.gettempdir()])
+        connection.execute("SET preserve_insertion_order = true")
+
+        def scan(sources, kind, columns):
+            if kind == 'parquet':
+                return connection.read_parquet(sources).select(', '.join(f'"{column}"' for column in columns))
+            casts = ', '.join(f'TRY_CAST("{column}" AS DOUBLE) AS "{column}"' if DTYPES.get(column) == 'float64' else f'"{column}"' for column in columns)
+            return connection.read_csv(sources, header=True, all_varchar=True, na_values=sorted(CSV_NA_VALUES)).select(casts)
+
+        def write(file_path, path):
+            scan([file_path], 'csv', get_report_columns(list(REPORT_COLUMNS))).write_parquet(path)
+
+        sources, kind = get_engine_sources(file_paths, cache_dir, write)
+        columns = get_report_columns(reports)
+        scan(sources, kind, columns).create_view('export_rows')
+        connection.execute("CREATE TEMP VIEW timelogs AS SELECT *, row_number() OVER () AS row FROM export_rows")
+        grouped = None
+        issues = None
+
+        if 'list_empty_accounts' in reports or 'list_reported_time_per_account' in reports:
+            keys = ', '.join(f'"{column}"' for column in ('account_label', 'user') if column in columns)
+            grouped = connection.execute(f'SELECT {keys}, {duckdb_sum("time_spent (hours)")} FROM timelogs GROUP BY {keys}').df()
+
+        if 'list_issues' in reports:
+            #Dates with an offset are converted to local time in <timezone>, dates without one are kept, like convert_date
+            start, end = get_window_bounds(start_date, end_date)
+            selected = []
+            for column in LIST_ISSUES_COLUMNS:
+                if column == 'time_spent (hours)':
+                    selected.append(duckdb_sum(column))
+                elif column not in ('date_of_work', 'issue_key'):
+                    selected.append(f'first("{column}" ORDER BY row) FILTER (WHERE "{column}" IS NOT NULL) AS "{column}"')
+            issues = connection.execute(f"""
+                SELECT issue_key, {', '.join(selected)} FROM (
+                    SELECT *, CASE WHEN regexp_matches(date_of_work, $offset)
+                        THEN timezone($timezone, TRY_CAST(date_of_work AS TIMESTAMPTZ))
+                        ELSE TRY_CAST(date_of_work AS TIMESTAMP) END AS local_date
+                    FROM timelogs WHERE issue_key IS NOT NULL
+                )
+                WHERE local_date BETWEEN $start AND $end
+                GROUP BY issue_key ORDER BY issue_key
+            """, {'offset': UTC_OFFSET_PATTERN, 'timezone': timezone, 'start': start.to_pydatetime(), 'end': end.to_pydatetime(warn=False)}).df()
+
+        return finish_engine_reports(reports, grouped, issues)
+    finally:
+        connection.close()
+
+#Calculates <reports> for the exports in <file_path> with <engine>, the results are the same for every engine
+def calculate_reports_engine(file_path, reports, start_date=None, end_date=None, engine='pandas', cache_dir=None, timezone=REPORT_TIMEZONE, threads=None):
+    file_paths = find_file_paths(file_path)
+    if engine != 'pandas' and any(ARCHIVE_SEPARATOR in path for path in file_paths):
+        raise ValueError(f"The {engine} engine can't read exports in archives, use --engine=pandas")
+    if engine == 'polars':
+        return calculate_reports_polars(file_paths, reports, start_date, end_date, cache_dir, timezone)
+    if engine == 'duckdb':
+        return calculate_reports_duckdb(file_paths, reports, start_date, end_date, cache_dir, timezone)
+    if engine != 'pandas':
+        raise ValueError(f"Unknown engine: {engine}, choose from: {', '.join(ENGINES)}")
+    if len(file_paths) > 1:
+        return calculate_reports_files(file_paths, reports, start_date, end_date, cache_dir=cache_dir, timezone=timezone)
+    return calculate_reports(load_csv(file_paths[0], get_report_columns(reports), cache_dir, threads), reports, start_date, end_date, timezone)
+
+#Gets the size and modification time of every export in <file_path>, used to notice changed files
+def get_file_states(file_path):
+    states = {}
+    for path in expand_file_paths(file_path):
+        stat = os.stat(get_source_path(path))
+        states[path] = (stat.st_size, stat.st_mtime_ns)
+    return states
+
+#Loads the exports in <file_path> into a compact timelog store that is kept in memory by the report server,
+#with the reports without parameters and the sorted dates precomputed.
+def load_dataset(file_path, cache_dir=None, timezone=REPORT_TIMEZONE, threads=None):
+    states = get_file_states(file_path)
+    if not states:
+        raise FileNotFoundError(f"No CSV-Files found for {file_path}")
+
+    df = load_exports(list(states), get_report_columns(list(REPORT_COLUMNS)), cache_dir, threads)
+    store = build_timelog_store(df, timezone)
+    del df
+    reports = ['list_empty_accounts', 'list_reported_time_per_account']
+    return {
+        'file_path': file_path,
+        'states': states,
+        'fingerprint': get_data_fingerprint(states),
+        'cache_dir': cache_dir,
+        'store': store,
+        'date_index': build_date_index(timelog_store_to_frame(store, ['date_of_work']), 'date_of_work', timezone),
+        'results': calculate_reports_store(store, reports, timezone=timezone),
+        'timezone': timezone,
+        'loaded_at': time.time(),
+    }
+
+#Answers a <report> query from the in-memory <dataset>, list_issues needs <start_date> and <end_date> and repeated windows are answered from the result cache
+def query_dataset(dataset, report, start_date=None, end_date=None):
+    if report == 'list_issues':
+        if not start_date or not end_date:
+            raise ValueError("list_issues needs the parameters start and end")
+        results = memoize_reports(dataset['fingerprint'], ['list_issues'], start_date, end_date, dataset['timezone'], dataset['cache_dir'],
+                                  lambda reports: calculate_reports_store(dataset['store'], reports, start_date, end_date, timezone=dataset['timezone'], date_index=dataset['date_index']))
+        return results['list_issues']
+    if report not in dataset['results']:
+        raise KeyError(f"Unknown report: {report}, choose from: {', '.join(REPORT_COLUMNS)}")
+    return dataset['results'][report]
+
+#Loads the dataset in <server_state> again if any of its exports have been changed, added or removed
+def reload_if_changed(server_state):
+    dataset = server_state['dataset']
+    if get_file_states(dataset['file_path']) == dataset['states']:
+        return False
+    server_state['dataset'] = load_dataset(dataset['file_path'], server_state['cache_dir'], server_state['timezone'], server_state.get('threads'))
+    return True
+
+#Checks the exports every <interval> seconds until <stop> is set, a failed reload keeps the previous dataset
+def watch_dataset(server_state, stop, interval=WATCH_INTERVAL):
+    while not stop.wait(interval):
+        try:
+            if reload_if_changed(server_state):
+                print(f"Reloaded {server_state['dataset']['file_path']}, {server_state['dataset']['store']['rows']} rows", file=sys.stderr)
+        except Exception as e:
+            print(f"Couldn't reload {server_state['dataset']['file_path']}, {e}", file=sys.stderr)
+
+#Creates the HTTP server answering report queries from <server_state>, on <host>:<port> or on the Unix socket <socket_path>:
+#GET /reports/<report>[?start=<start_date>&end=<end_date>][&format=csv] and GET /health
+def create_report_server(server_state, host=DEFAULT_SERVE_HOST, port=DEFAULT_SERVE_PORT, socket_path=None):
+    import socketserver
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlsplit
+
+    class ReportRequestHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def send_body(self, status, body, content_type='application/json'):
+            body = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', f"{content_type}; charset=utf-8")
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            dataset = server_state['dataset']
+
+            if url.path == '/health':
+                self.send_body(200, json.dumps({'rows': dataset['store']['rows'], 'files': list(dataset['states']), 'loaded_at': dataset['loaded_at'],
+                                                'result_cache': get_result_cache_stats()}))
+                return
+            if not url.path.startswith('/reports/'):
+                self.send_body(404, json.dumps({'error': f"Unknown path: {url.path}"}))
+                return
+
+            try:
+                df = query_dataset(dataset, url.path[len('/reports/'):], query.get('start'), query.get('end'))
+            except KeyError as e:
+                self.send_body(404, json.dumps({'error': e.args[0]}))
+                return
+            except Exception as e:
+                self.send_body(400, json.dumps({'error': str(e)}))
+                return
+
+            if query.get('format') == 'csv':
+                self.send_body(200, df.to_csv(index=False), 'text/csv')
             else:
-                print("Correct format: python3 gitlab_reporter.py --list_issues --start=<start_date> --end=<end_date> <csv_file> <output_path>")
+                self.send_body(200, df.to_json(orient='records', force_ascii=False))
+
+    if socket_path:
+        class UnixReportServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+            def get_request(self):
+                request, _ = super().get_request()
+                return request, ('unix', 0)
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return UnixReportServer(socket_path, ReportRequestHandler)
+
+    return ThreadingHTTPServer((host, port), ReportRequestHandler)
+
+#Loads the exports in <file_path> once and answers report queries until interrupted, reloading changed exports
+def serve(file_path, host=DEFAULT_SERVE_HOST, port=DEFAULT_SERVE_PORT, socket_path=None, cache_dir=None, timezone=REPORT_TIMEZONE, threads=None):
+    try:
+        server_state = {'dataset': load_dataset(file_path, cache_dir, timezone, threads), 'cache_dir': cache_dir, 'timezone': timezone, 'threads': threads}
+        server = create_report_server(server_state, host, port, socket_path)
+    except Exception as e:
+        print(f"Couldn't start the report server for file: {file_path}, {e}")
+        sys.exit(1)
+
+    stop = threading.Event()
+    threading.Thread(target=watch_dataset, args=(server_state, stop), daemon=True).start()
+    print(f"Serving reports for {file_path} on {socket_path or f'http://{host}:{server.server_address[1]}'}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+#Builds the parser for the command line arguments
+def build_parser():
+    parser = argparse.ArgumentParser(description="Summarize the time reports in a GitLab timelog export.")
+    methods = parser.add_mutually_exclusive_group(required=True)
+    methods.add_argument('--list_empty_accounts', action='store_true', help="list users with time reported on issues without an account")
+    methods.add_argument('--list_reported_time_per_account', action='store_true', help="list the reported time per account")
+    methods.add_argument('--list_issues', action='store_true', help="list the issues worked on between --start and --end")
+    methods.add_argument('--reports', help=f"comma separated reports to run on one load of the file: {','.join(REPORT_COLUMNS)}")
+    methods.add_argument('--all', action='store_true', help="run every report")
+    methods.add_argument('--serve', action='store_true', help="keep the exports in memory and answer report queries over HTTP")
+
+    parser.add_argument('csv_file', help="CSV-File, folder, glob pattern or zip/tar archive with exports, .gz and .zst files are decompressed while read")
+    parser.add_argument('output_path', nargs='?', help="path of the written report, without extension")
+    parser.add_argument('--start', help="first date of --list_issues")
+    parser.add_argument('--end', help="last date of --list_issues")
+    parser.add_argument('--windows', help="date windows as <start_date>:<end_date>,<start_date>:<end_date>")
+    parser.add_argument('--periods', choices=list(PERIOD_FREQUENCIES), help="list the issues per period between --start and --end")
+    parser.add_argument('--periods_file', help="CSV-File with the periods as start_date,end_date")
+    parser.add_argument('--split_periods', action='store_true', help="write every period to its own file")
+    parser.add_argument('--timezone', default=REPORT_TIMEZONE, help="timezone of the report dates")
+    parser.add_argument('--chunksize', type=int, help="read the file in chunks of this many rows")
+    parser.add_argument('--cache_dir', help="folder for the cached copies of the CSV-Files")
+    parser.add_argument('--read_threads', type=int, default=CSV_READ_THREADS, help="threads that parse one CSV-File from a memory map")
+    parser.add_argument('--workers', type=int, help="amount of processes for several files, or of shards one file is aggregated in")
+    parser.add_argument('--engine', choices=ENGINES, default='pandas', help="engine that calculates the reports, polars and duckdb are optional")
+    parser.add_argument('--state', help="state file for incremental updates of an append-only export")
+    parser.add_argument('--output_format', choices=list(OUTPUT_FORMATS), help="format of the written report")
+    parser.add_argument('--preview', type=int, default=DEFAULT_PREVIEW_ROWS, help="rows of --list_issues printed, 0 turns it off")
+    parser.add_argument('--fast_path_rows', type=int, default=0, help=f"sum files up to this many rows without pandas, like {FAST_PATH_MAX_ROWS}, 0 keeps it off")
+    parser.add_argument('--host', default=DEFAULT_SERVE_HOST, help="address of --serve")
+    parser.add_argument('--port', type=int, default=DEFAULT_SERVE_PORT, help="port of --serve")
+    parser.add_argument('--socket', help="Unix socket used by --serve instead of a port")
+    parser.add_argument('--profile', action='store_true', help="print the time and memory of every stage")
+    parser.add_argument('--profile_memory', action='store_true', help="also trace the peak memory of every stage")
+    parser.add_argument('--profile_json', help="write the profile as JSON to this file")
+    return parser
+
+#Runs the command in the parsed <args>
+def run_command(args):
+    try:
+        reports = ','.join(REPORT_COLUMNS) if args.all else args.reports
+
+        if reports:
+            if args.output_path is None:
+                print("Correct format: python3 gitlab_reporter.py --all|--reports=<report,report> [--start=<start_date> --end=<end_date>] <csv_file> <output_path>")
                 sys.exit(1)
-            
+            run_reports(args.csv_file, reports.split(','), args.start, args.end, args.output_path, args.chunksize, args.cache_dir, args.timezone, args.workers, args.state, args.output_format, args.engine, args.read_threads)
+
+        elif args.serve:
+            serve(args.csv_file, args.host, args.port, args.socket, args.cache_dir, args.timezone, args.read_threads)
+
+        elif args.list_empty_accounts:
+            list_empty_accounts(args.csv_file, args.chunksize, args.cache_dir, args.workers, args.state, args.fast_path_rows, args.engine, args.read_threads)
+
+        elif args.list_reported_time_per_account:
+            list_reported_time_per_account(args.csv_file, args.chunksize, args.cache_dir, args.workers, args.state, args.fast_path_rows, args.engine, args.read_threads)
+
+        elif args.output_path is None:
+            print("Correct format: python3 gitlab_reporter.py --list_issues --start=<start_date> --end=<end_date> <csv_file> <output_path>")
+            print("or: python3 gitlab_reporter.py --list_issues --windows=<start_date>:<end_date>,<start_date>:<end_date> <csv_file> <output_path>")
+            print("or: python3 gitlab_reporter.py --list_issues --periods=daily|weekly|monthly --start=<start_date> --end=<end_date> [--split_periods] <csv_file> <output_path>")
+            sys.exit(1)
+
+        elif args.periods or args.periods_file:
+            if args.periods_file:
+                try:
+                    period_windows = load_period_windows(args.periods_file)
+                except (OSError, ValueError) as e:
+                    print(f"Couldn't read the periods in file: {args.periods_file}, {e}")
+                    sys.exit(1)
+            else:
+                period_windows = create_period_windows(args.start, args.end, args.periods)
+            list_issues_periods(args.csv_file, period_windows, args.output_path, args.split_periods, args.cache_dir, args.timezone, args.output_format, args.read_threads)
+
+        elif args.windows:
+            list_issues_windows(args.csv_file, parse_windows(args.windows), args.output_path, args.cache_dir, args.timezone, args.output_format, args.read_threads)
+
+        elif args.start and args.end:
+            list_issues(args.csv_file, args.start, args.end, args.output_path, args.chunksize, args.cache_dir, args.timezone, args.workers, args.state, args.output_format, args.preview, args.engine, args.read_threads)
+            print(f"A CSV file called output.csv with the listed issues, has been created for file: {args.csv_file} in the folder: {args.output_path}")
+
         else:
-            print("Correct format: python3 gitlab_reporter.py --method_name <csv_file>")
+            print("Correct format: python3 gitlab_reporter.py --list_issues --start=<start_date> --end=<end_date> <csv_file> <output_path>")
+            sys.exit(1)
     except Exception as e:
         print(f"Please provide the correct amount of arguments, {e}")
 
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    profile = args.profile or args.profile_memory or args.profile_json
+
+    if profile:
+        enable_profiling(args.profile_memory)
+    try:
+        run_command(args)
+    finally:
+        if profile:
+            report_profile(disable_profiling(), args.profile_json)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
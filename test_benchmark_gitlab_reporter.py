@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+
+import unittest
+import pandas as pd
+
+from benchmark_gitlab_reporter import (
+    generate_export,
+    find_regressions,
+    NULL_ACCOUNT_RATIO,
+)
+
+class UnitTest(unittest.TestCase):
+    #generate_export
+    def test_generate_export_columns(self):
+        df = generate_export(100)
+        expected = ['date_of_work', 'user', 'issue_key', 'time_spent (hours)', 'issue_type', 'project_id',
+                    'project_group', 'total_time_spent', 'account_label', 'issue_title', 'timelog_note']
+        self.assertEqual(df.columns.tolist(), expected)
+        self.assertEqual(len(df), 100)
+
+    def test_generate_export_seeded(self):
+        pd.testing.assert_frame_equal(generate_export(500, seed=3), generate_export(500, seed=3))
+
+    def test_generate_export_null_accounts(self):
+        df = generate_export(20000)
+        self.assertAlmostEqual(df['account_label'].isnull().mean(), NULL_ACCOUNT_RATIO, delta=0.02)
+
+    def test_generate_export_timezone_suffix(self):
+        df = generate_export(1000)
+        self.assertTrue(df['date_of_work'].str.match(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\+0[12]:00$').all())
+
+    #find_regressions
+    def test_find_regressions(self):
+        baseline = {'load_csv[10]': {'seconds': 1.0, 'peak_bytes': 100}}
+        results = {'load_csv[10]': {'seconds': 1.5, 'peak_bytes': 100}}
+        self.assertEqual(len(find_regressions(results, baseline, 0.25)), 1)
+
+    def test_find_regressions_within_tolerance(self):
+        baseline = {'load_csv[10]': {'seconds': 1.0, 'peak_bytes': 100}}
+        results = {'load_csv[10]': {'seconds': 1.2, 'peak_bytes': 120}, 'new_stage[10]': {'seconds': 9.0, 'peak_bytes': 9}}
+        self.assertEqual(find_regressions(results, baseline, 0.25), [])
+
+
+if __name__ == '__main__':
+    unittest.main(argv=[''], exit=False)
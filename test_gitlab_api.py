@@ -0,0 +1,191 @@
+#!/usr/bin/python3
+
+import unittest
+import unittest.mock as mock
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+import gitlab_api
+from gitlab_api import (
+    create_session,
+    run_query,
+    create_time_slices,
+    fetch_timelogs,
+    write_api_export,
+    get_account_label,
+    EXPORT_COLUMNS,
+)
+from gitlab_reporter import calculate_user_time, calculate_account_time, load_csv
+
+#Issues served by the stub GitLab, the first one has more timelogs than fit on one page
+ISSUES = [
+    {
+        'id': 'gid://gitlab/Issue/1', 'reference': 'house/hemmet#1', 'title': 'Stuff', 'type': 'ISSUE',
+        'totalTimeSpent': 18000, 'updatedAt': '2023-08-02T10:00:00Z',
+        'labels': {'nodes': [{'title': 'Priority::High'}, {'title': 'Account::Hemmet'}]},
+        'timelogs': [
+            {'spentAt': '2023-08-01T08:00:00Z', 'timeSpent': 3600, 'summary': None, 'user': {'name': 'Anders Andersson'}, 'note': None},
+            {'spentAt': '2023-08-01T09:00:00Z', 'timeSpent': 5400, 'summary': 'Planning', 'user': {'name': 'Bengt Bengtsson'}, 'note': None},
+            {'spentAt': '2023-08-02T09:00:00Z', 'timeSpent': 9000, 'summary': None, 'user': {'name': 'Anders Andersson'}, 'note': {'body': 'Fixed it'}},
+        ],
+    },
+    {
+        'id': 'gid://gitlab/Issue/2', 'reference': 'house/hotellet#2', 'title': 'More stuff', 'type': 'TASK',
+        'totalTimeSpent': 7200, 'updatedAt': '2023-08-03T10:00:00Z',
+        'labels': {'nodes': []},
+        'timelogs': [
+            {'spentAt': '2023-08-03T08:00:00Z', 'timeSpent': 7200, 'summary': None, 'user': {'name': 'Nils Nilsson'}, 'note': None},
+        ],
+    },
+]
+
+#Returns a page of <nodes> starting after <cursor>, the cursor is the index of the last node
+def paginate(nodes, cursor, first):
+    start = int(cursor) + 1 if cursor else 0
+    page = nodes[start:start + first]
+    end = start + len(page) - 1
+    return {'pageInfo': {'hasNextPage': end + 1 < len(nodes), 'endCursor': str(end)}, 'nodes': page}
+
+#Minimal GitLab GraphQL endpoint answering the issue and timelog queries of gitlab_api
+class StubGitLab(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        variables = request['variables']
+        with server.lock:
+            server.requests.append(variables)
+            if server.rate_limited > 0:
+                server.rate_limited -= 1
+                self.send_json(429, {'message': 'Too many requests'}, {'Retry-After': '0'})
+                return
+
+        if self.path != '/api/graphql' or self.headers.get('Authorization') != 'Bearer secret':
+            self.send_json(401, {'message': 'Unauthorized'})
+            return
+
+        first = variables['first']
+        if 'group' in variables:
+            if variables['group'] != 'house':
+                self.send_json(200, {'data': {'group': None}})
+                return
+            updated = [issue for issue in server.issues
+                       if (variables['updatedAfter'] is None or pd.Timestamp(issue['updatedAt']) >= pd.Timestamp(variables['updatedAfter']))
+                       and (variables['updatedBefore'] is None or pd.Timestamp(issue['updatedAt']) <= pd.Timestamp(variables['updatedBefore']))]
+            connection = paginate(updated, variables['after'], first)
+            connection['nodes'] = [dict(issue, timelogs=paginate(issue['timelogs'], None, first)) for issue in connection['nodes']]
+            self.send_json(200, {'data': {'group': {'issues': connection}}})
+        else:
+            issue = next(issue for issue in server.issues if issue['id'] == variables['id'])
+            self.send_json(200, {'data': {'issue': {'timelogs': paginate(issue['timelogs'], variables['after'], first)}}})
+
+
+class UnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubGitLab)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.rate_limited = 0
+        self.server.issues = [dict(issue) for issue in ISSUES]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.page_size = mock.patch.object(gitlab_api, 'PAGE_SIZE', 2)
+        self.page_size.start()
+
+    def tearDown(self):
+        self.page_size.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetch(self, cache_path=None, workers=2):
+        session = create_session(self.url, 'secret', backoff=0)
+        return fetch_timelogs('house', self.url, 'secret', cache_path, workers, session=session), session
+
+    #run_query
+    def test_run_query_retries_rate_limit(self):
+        self.server.rate_limited = 2
+        session = create_session(self.url, 'secret', backoff=0)
+        data = run_query(session, gitlab_api.ISSUES_QUERY, {'group': 'house', 'after': None, 'updatedAfter': None, 'updatedBefore': None, 'first': 2})
+        self.assertEqual(len(data['group']['issues']['nodes']), 2)
+        self.assertEqual(session['requests'], 3)
+
+    def test_run_query_unauthorized(self):
+        session = create_session(self.url, 'wrong', backoff=0)
+        with self.assertRaises(ConnectionError):
+            run_query(session, gitlab_api.ISSUES_QUERY, {'group': 'house', 'after': None, 'updatedAfter': None, 'updatedBefore': None, 'first': 2})
+
+    #create_time_slices
+    def test_create_time_slices(self):
+        slices = create_time_slices('2023-01-01T00:00:00+00:00', '2023-01-05T00:00:00+00:00', 4)
+        self.assertEqual(len(slices), 4)
+        self.assertEqual(slices[0][0], '2023-01-01T00:00:00+00:00')
+        self.assertEqual(slices[1][0], slices[0][1])
+        self.assertEqual(slices[-1][1], '2023-01-05T00:00:00+00:00')
+
+    #get_account_label
+    def test_get_account_label(self):
+        self.assertEqual(get_account_label(ISSUES[0]), 'Hemmet')
+        self.assertIsNone(get_account_label(ISSUES[1]))
+
+    #fetch_timelogs
+    def test_fetch_timelogs(self):
+        df, _ = self.fetch()
+        self.assertEqual(list(df.columns), EXPORT_COLUMNS)
+        self.assertEqual(len(df), 4)
+        self.assertEqual(list(df['time_spent (hours)']), [1.0, 1.5, 2.5, 2.0])
+        self.assertEqual(list(df['timelog_note'].fillna('')), ['', 'Planning', 'Fixed it', ''])
+        self.assertEqual(df['project_group'].iloc[0], 'house')
+        self.assertEqual(df['total_time_spent'].iloc[0], 5.0)
+
+    def test_fetch_timelogs_unknown_group(self):
+        session = create_session(self.url, 'secret', backoff=0)
+        with self.assertRaises(ValueError):
+            fetch_timelogs('garden', self.url, 'secret', session=session)
+
+    def test_fetch_timelogs_only_fetches_updates(self):
+        with tempfile.TemporaryDirectory() as folder:
+            cache_path = os.path.join(folder, 'cache.json')
+            self.fetch(cache_path)
+            self.server.requests.clear()
+            self.server.issues[1] = dict(ISSUES[1], updatedAt=pd.Timestamp.now(tz='UTC').isoformat(), timelogs=ISSUES[1]['timelogs'] * 2)
+            df, _ = self.fetch(cache_path)
+            self.assertEqual(len(df), 5)
+            self.assertTrue(all(variables.get('updatedAfter') for variables in self.server.requests))
+
+    #write_api_export
+    def test_write_api_export_reports(self):
+        with tempfile.TemporaryDirectory() as folder:
+            output_path = os.path.join(folder, 'export.csv')
+            with mock.patch.object(gitlab_api, 'BACKOFF_SECONDS', 0):
+                write_api_export('house', output_path, self.url, 'secret', workers=2)
+            df = load_csv(output_path)
+            user_time = calculate_user_time(df)
+            self.assertEqual(list(user_time['User']), ['Nils Nilsson'])
+            account_time = calculate_account_time(df)
+            self.assertAlmostEqual(account_time['Time Spent'].sum(), 7.0)
+            self.assertEqual(list(account_time['Account Label'].dropna().unique()), ['Hemmet'])
+
+
+if __name__ == '__main__':
+    unittest.main(argv=[''], exit=False)
@@ -4,8 +4,19 @@ import unittest
 import unittest.mock as mock
 import pandas as pd
 import numpy as np
+import gzip
+import io
+import json
 import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
 
+import gitlab_reporter
 from gitlab_reporter import (
     load_csv,
     create_path_for_csv,
@@ -24,8 +35,124 @@ from gitlab_reporter import (
     summarize_data,
     get_list_issues,
     convert_date,
+    load_csv_chunks,
+    aggregate_chunks,
+    partial_empty_accounts,
+    merge_empty_accounts,
+    partial_reported_time_per_account,
+    merge_reported_time_per_account,
+    partial_list_issues,
+    merge_list_issues,
+    calculate_account_time,
+    EMPTY_ACCOUNTS_COLUMNS,
+    LIST_ISSUES_COLUMNS,
+    load_cached_csv,
+    update_incremental_state,
+    load_incremental_state,
+    STATE_CHECK_BYTES,
+    calculate_reports_incremental,
+    get_output_format,
+    print_preview,
+    enable_profiling,
+    disable_profiling,
+    report_profile,
+    sum_time_small_csv,
+    format_time_table,
+    fast_time_report,
+    build_parser,
+    load_dataset,
+    query_dataset,
+    reload_if_changed,
+    create_report_server,
+    build_rollup,
+    save_rollup,
+    load_rollup,
+    rollup_time_by_account_and_user,
+    rollup_list_issues,
+    calculate_reports_rollup,
+    get_dates_in_window,
+    sum_floats,
+    get_window_bounds,
+    calculate_reports_engine,
+    share_arrays,
+    release_shared_arrays,
+    attach_shared_arrays,
+    hash_partition,
+    calculate_reports_sharded,
+    get_code_dtype,
+    build_timelog_store,
+    timelog_store_to_frame,
+    get_store_nbytes,
+    select_store_window,
+    calculate_reports_store,
+    sort_categories,
+    find_line_ranges,
+    load_csv_mmap,
+    open_input,
+    iter_export_files,
+    list_archive_members,
+    get_data_fingerprint,
+    get_result_key,
+    get_result_cache_stats,
+    clear_result_cache,
+    get_cached_result,
+    put_cached_result,
+    evict_result_files,
+    memoize_reports,
+    calculate_reports_memoized,
+    calculate_file_reports,
+    find_file_paths,
+    list_empty_accounts,
+    list_reported_time_per_account,
+    get_file_states,
+    load_cache_manifest,
+    evict_cache,
+    calculate_reports,
+    finish_reports,
+    calculate_reports_chunks,
+    run_reports,
+    REPORT_COLUMNS,
+    parse_dates,
+    to_report_timezone,
+    build_date_index,
+    select_date_window,
+    list_issues_in_window,
+    list_issues_windows,
+    get_cached_date_index,
+    create_period_windows,
+    load_period_windows,
+    assign_periods,
+    summarize_periods,
+    list_issues_periods,
+    build_aggregation_plan,
+    run_aggregation_plan,
+    expand_file_paths,
+    aggregate_file,
+    calculate_reports_files,
 )
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    import polars
+except ImportError:
+    polars = None
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+TEST_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'csv', 'test_csv.csv')
+
 class UnitTest(unittest.TestCase):
     def setUp(self):
         self.file_path = os.environ.get('CSV_FILE_PATH')
@@ -251,6 +378,22 @@ class UnitTest(unittest.TestCase):
         result = calculate_user_time(df)
         self.assertIsNotNone(result)
 
+    def test_calculate_user_time_columns(self):
+        result = calculate_user_time(load_csv(TEST_CSV))
+        self.assertEqual(result.columns.tolist(), ['Time Spent', 'User'])
+        self.assertEqual(result['User'].dtype, 'category')
+        self.assertEqual(len(result), 4)
+
+    def test_calculate_account_time_columns(self):
+        result = calculate_account_time(load_csv(TEST_CSV))
+        self.assertEqual(result.columns.tolist(), ['Account Label', 'Time Spent'])
+        self.assertEqual(len(result), 11)
+
+    def test_calculate_account_time_missing_label(self):
+        result = calculate_account_time(pd.DataFrame({'Time Spent': [1]}))
+        self.assertTrue(result.empty)
+        self.assertEqual(result.columns.tolist(), ['Account Label', 'Time Spent'])
+
     #calculate_time
     def test_calculate_final_from_file(self):
         csv = load_csv(self.get_file_path())
@@ -464,5 +607,1288 @@ class UnitTest(unittest.TestCase):
         self.assertTrue(result_df.empty)
 
 
+    #load_csv with columns
+    def test_load_csv_columns(self):
+        df = load_csv(TEST_CSV, EMPTY_ACCOUNTS_COLUMNS)
+        self.assertEqual(df.columns.tolist(), ['user', 'time_spent (hours)', 'account_label'])
+
+    def test_load_csv_dtypes(self):
+        df = load_csv(TEST_CSV)
+        self.assertEqual(df['user'].dtype, 'category')
+        self.assertEqual(df['account_label'].dtype, 'category')
+        self.assertEqual(df['time_spent (hours)'].dtype, 'float64')
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['date_of_work']))
+
+    def test_load_csv_list_issues_columns(self):
+        df = load_csv(TEST_CSV, LIST_ISSUES_COLUMNS)
+        self.assertNotIn('user', df.columns)
+        self.assertNotIn('timelog_note', df.columns)
+
+    #load_csv_chunks
+    def test_load_csv_chunks(self):
+        chunks = list(load_csv_chunks(TEST_CSV, 4))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 3])
+
+    def test_load_csv_chunks_dtypes(self):
+        for chunk in load_csv_chunks(TEST_CSV, 1):
+            self.assertEqual(chunk['account_label'].dtype, 'category')
+            self.assertEqual(chunk['issue_title'].dtype, object)
+
+    #aggregate_chunks
+    def test_aggregate_chunks_empty_accounts(self):
+        expected = calculate_final_list_empty_accounts(calculate_user_time(load_csv(TEST_CSV)))
+        result_df = aggregate_chunks(TEST_CSV, 3, partial_empty_accounts, merge_empty_accounts)
+        result = calculate_final_list_empty_accounts(result_df)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_aggregate_chunks_reported_time_per_account(self):
+        expected = calculate_final_reported_time_for_user(calculate_account_time(load_csv(TEST_CSV)))
+        result_df = aggregate_chunks(TEST_CSV, 2, partial_reported_time_per_account, merge_reported_time_per_account)
+        result = calculate_final_reported_time_for_user(result_df)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_aggregate_chunks_list_issues(self):
+        expected = partial_list_issues(load_csv(TEST_CSV), '2023-07-01', '2023-08-01')
+        result = aggregate_chunks(TEST_CSV, 4, partial_list_issues, merge_list_issues, '2023-07-01', '2023-08-01')
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+
+    def test_aggregate_chunks_no_file(self):
+        result = aggregate_chunks(None, 4, partial_empty_accounts, merge_empty_accounts)
+        self.assertIsNone(result)
+
+
+    #load_cached_csv
+    def copy_test_csv(self, folder):
+        path = os.path.join(folder, 'export.csv')
+        shutil.copy(TEST_CSV, path)
+        return path
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_load_cached_csv(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = self.copy_test_csv(folder)
+            cache_dir = os.path.join(folder, 'cache')
+            first = load_cached_csv(path, EMPTY_ACCOUNTS_COLUMNS, cache_dir)
+            second = load_cached_csv(path, EMPTY_ACCOUNTS_COLUMNS, cache_dir)
+            self.assertEqual(len(load_cache_manifest(cache_dir)), 1)
+            pd.testing.assert_frame_equal(first.reset_index(drop=True), second)
+            pd.testing.assert_frame_equal(load_cached_csv(path, None, cache_dir), load_csv(path), check_dtype=False)
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_load_cached_csv_invalidated(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = self.copy_test_csv(folder)
+            cache_dir = os.path.join(folder, 'cache')
+            load_cached_csv(path, None, cache_dir)
+            old_hash = list(load_cache_manifest(cache_dir).values())[0]['hash']
+
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write("2023-08-03T00:00:00+02:00,Nils Nilsson,Key_7,1,Bug,Project_1,Huset,1,,Stuff,\n")
+
+            df = load_cached_csv(path, None, cache_dir)
+            manifest = load_cache_manifest(cache_dir)
+            self.assertEqual(len(df), 12)
+            self.assertNotEqual(list(manifest.values())[0]['hash'], old_hash)
+            self.assertEqual([name for name in os.listdir(cache_dir) if name.endswith('.feather')], [manifest[key]['file'] for key in manifest])
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_load_cached_csv_concurrent_workers(self):
+        reports = ['list_empty_accounts']
+        with tempfile.TemporaryDirectory() as folder:
+            exports = os.path.join(folder, 'exports')
+            os.makedirs(exports)
+            paths = [shutil.copy(TEST_CSV, os.path.join(exports, f'export_{i}.csv')) for i in range(8)]
+            cache_dir = os.path.join(folder, 'cache')
+            for run in range(2):
+                calculate_reports_files(paths, reports, workers=8, cache_dir=cache_dir)
+                manifest = load_cache_manifest(cache_dir)
+                self.assertEqual(sorted(manifest), sorted(os.path.abspath(path) for path in paths))
+                self.assertEqual(sorted(name for name in os.listdir(cache_dir) if name.endswith('.feather')), sorted(entry['file'] for entry in manifest.values()))
+                self.assertEqual([name for name in os.listdir(cache_dir) if name.endswith('.tmp')], [])
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_evict_cache(self):
+        with tempfile.TemporaryDirectory() as folder:
+            cache_dir = os.path.join(folder, 'cache')
+            paths = [shutil.copy(TEST_CSV, os.path.join(folder, f'export_{i}.csv')) for i in range(3)]
+            for path in paths:
+                load_cached_csv(path, None, cache_dir)
+
+            manifest = load_cache_manifest(cache_dir)
+            entry_size = max(entry['bytes'] for entry in manifest.values())
+            evict_cache(cache_dir, manifest, entry_size)
+            self.assertEqual(list(manifest.keys()), [os.path.abspath(paths[2])])
+            self.assertEqual([name for name in os.listdir(cache_dir) if name.endswith('.feather')], [manifest[key]['file'] for key in manifest])
+
+
+    #calculate_reports
+    def test_calculate_reports(self):
+        df = load_csv(TEST_CSV)
+        results = calculate_reports(df, list(REPORT_COLUMNS), '2023-07-01', '2023-08-01')
+        expected_empty = calculate_final_list_empty_accounts(calculate_user_time(load_csv(TEST_CSV)))
+        expected_accounts = calculate_final_reported_time_for_user(calculate_account_time(load_csv(TEST_CSV)))
+        expected_issues = partial_list_issues(load_csv(TEST_CSV), '2023-07-01', '2023-08-01')
+        pd.testing.assert_frame_equal(results['list_empty_accounts'], expected_empty)
+        pd.testing.assert_frame_equal(results['list_reported_time_per_account'], expected_accounts)
+        pd.testing.assert_frame_equal(results['list_issues'], expected_issues)
+
+    def test_calculate_reports_only_requested(self):
+        results = calculate_reports(load_csv(TEST_CSV), ['list_empty_accounts'])
+        self.assertEqual(list(results), ['list_empty_accounts'])
+
+    def test_calculate_reports_chunks(self):
+        reports = list(REPORT_COLUMNS)
+        expected = calculate_reports(load_csv(TEST_CSV), reports, '2023-07-01', '2023-08-01')
+        results = calculate_reports_chunks(TEST_CSV, reports, '2023-07-01', '2023-08-01', 3)
+        for report in reports:
+            pd.testing.assert_frame_equal(results[report], expected[report], check_dtype=False, check_categorical=False)
+
+    #run_reports
+    def test_run_reports(self):
+        with tempfile.TemporaryDirectory() as folder:
+            output_path = os.path.join(folder, 'monthly')
+            run_reports(TEST_CSV, list(REPORT_COLUMNS), '2023-07-01', '2023-08-01', output_path)
+            for report in REPORT_COLUMNS:
+                self.assertTrue(os.path.exists(f"{output_path}_{report}.csv"))
+
+    def test_run_reports_unknown(self):
+        with tempfile.TemporaryDirectory() as folder:
+            run_reports(TEST_CSV, ['unknown'], None, None, os.path.join(folder, 'monthly'))
+            self.assertEqual(os.listdir(folder), [])
+
+
+    #parse_dates
+    def test_parse_dates_mixed_offsets(self):
+        series = pd.Series(['2023-08-01T00:00:00+02:00', '2023-12-01T00:00:00+01:00', '2023-08-01T00:00:00+02:00'])
+        result = parse_dates(series)
+        self.assertEqual(str(result.dt.tz), 'UTC')
+        self.assertEqual(result.iloc[0], pd.Timestamp('2023-07-31 22:00:00', tz='UTC'))
+        self.assertEqual(result.iloc[1], pd.Timestamp('2023-11-30 23:00:00', tz='UTC'))
+
+    def test_parse_dates_without_offset(self):
+        result = parse_dates(pd.Series(['2023-09-01', '2023-09-02']))
+        self.assertEqual(result.dtype, 'datetime64[ns]')
+
+    def test_parse_dates_missing_values(self):
+        result = parse_dates(pd.Series(['2023-08-01T00:00:00+02:00', None]))
+        self.assertTrue(pd.isna(result.iloc[1]))
+
+    def test_parse_dates_with_and_without_offset(self):
+        series = pd.Series(['2023-08-01T12:00:00', '2023-08-02T00:30:00+02:00', None])
+        result = to_report_timezone(parse_dates(series, 'Europe/Stockholm'), 'Europe/Stockholm')
+        self.assertEqual(result.iloc[:2].tolist(), [pd.Timestamp('2023-08-01 12:00'), pd.Timestamp('2023-08-02 00:30')])
+
+    def test_window_with_and_without_offset(self):
+        reports = list(REPORT_COLUMNS)
+        with tempfile.TemporaryDirectory() as folder:
+            path = self.copy_test_csv(folder)
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write('2023-08-01T12:00:00,Olle Olsson,Key_20,1.5,Order,Project_1,Huset,1.5,Huset,Stuff,\n')
+            expected = calculate_reports(load_csv(path), reports, '2023-08-01', '2023-08-01')
+            issues = expected['list_issues']
+            self.assertEqual(issues['issue_key'].tolist(), ['Key_1', 'Key_2', 'Key_20', 'Key_3', 'Key_4', 'Key_5', 'Key_6'])
+            self.assertEqual(issues.loc[issues['issue_key'] == 'Key_3', 'time_spent (hours)'].tolist(), [2.0])
+            results = [calculate_reports_chunks(path, reports, '2023-08-01', '2023-08-01', 5)]
+            for engine, package in (('polars', polars), ('duckdb', duckdb)):
+                if package:
+                    results.append(calculate_reports_engine(path, reports, '2023-08-01', '2023-08-01', engine))
+            for result in results:
+                for report in reports:
+                    pd.testing.assert_frame_equal(result[report], expected[report], check_dtype=False, check_categorical=False)
+
+    #to_report_timezone
+    def test_to_report_timezone(self):
+        series = parse_dates(pd.Series(['2023-08-01T00:00:00+02:00', '2023-12-01T00:00:00+01:00']))
+        result = to_report_timezone(series, 'Europe/Stockholm')
+        self.assertEqual(result.tolist(), [pd.Timestamp('2023-08-01'), pd.Timestamp('2023-12-01')])
+
+    #convert_date with timezone
+    def test_convert_date_mixed_offsets(self):
+        df = pd.DataFrame({
+            'Date': ['2023-10-28T23:30:00+02:00', '2023-10-29T23:30:00+01:00', '2023-10-31T00:30:00+01:00'],
+            'User': ['Test', 'Anon', 'Ronald']
+        })
+        result_df = convert_date(df, '2023-10-29', '2023-10-30', 'Date')
+        self.assertEqual(result_df['User'].tolist(), ['Anon'])
+
+    def test_convert_date_timezone(self):
+        df = pd.DataFrame({'Date': ['2023-08-01T01:00:00+02:00'], 'User': ['Test']})
+        self.assertEqual(len(convert_date(df.copy(), '2023-08-01', '2023-08-02', 'Date', 'Europe/Stockholm')), 1)
+        self.assertEqual(len(convert_date(df.copy(), '2023-08-01', '2023-08-02', 'Date', 'UTC')), 0)
+
+
+    #build_date_index
+    def test_build_date_index_sorted(self):
+        df = pd.DataFrame({'Date': ['2023-09-03', '2023-09-01', '2023-09-02']})
+        date_index = build_date_index(df, 'Date')
+        self.assertEqual(date_index['order'].tolist(), [1, 2, 0])
+        self.assertTrue((date_index['dates'][:-1] <= date_index['dates'][1:]).all())
+
+    #select_date_window
+    def test_select_date_window(self):
+        df = load_csv(TEST_CSV)
+        date_index = build_date_index(df, 'date_of_work')
+        for start_date, end_date in [('2023-07-01', '2023-08-01'), ('2023-08-01', '2023-08-02'), ('2023-08-03', '2023-08-04')]:
+            expected = convert_date(load_csv(TEST_CSV), start_date, end_date, 'date_of_work')
+            result = select_date_window(df, date_index, start_date, end_date)
+            self.assertEqual(result.index.tolist(), expected.index.tolist())
+
+    def test_list_issues_in_window(self):
+        df = load_csv(TEST_CSV, LIST_ISSUES_COLUMNS)
+        date_index = build_date_index(df, 'date_of_work')
+        expected = partial_list_issues(load_csv(TEST_CSV, LIST_ISSUES_COLUMNS), '2023-07-01', '2023-08-01')
+        result = list_issues_in_window(df, date_index, '2023-07-01', '2023-08-01')
+        pd.testing.assert_frame_equal(result, expected)
+
+    #list_issues_windows
+    def test_list_issues_windows(self):
+        with tempfile.TemporaryDirectory() as folder:
+            output_path = os.path.join(folder, 'issues')
+            list_issues_windows(TEST_CSV, [('2023-07-01', '2023-08-01'), ('2023-08-02', '2023-08-03')], output_path)
+            first = pd.read_csv(f"{output_path}_2023-07-01_2023-08-01.csv")
+            second = pd.read_csv(f"{output_path}_2023-08-02_2023-08-03.csv")
+            self.assertEqual(len(first), 6)
+            self.assertEqual(second['issue_key'].tolist(), ['Key_3'])
+
+    #get_cached_date_index
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_get_cached_date_index(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = self.copy_test_csv(folder)
+            cache_dir = os.path.join(folder, 'cache')
+            df = load_cached_csv(path, LIST_ISSUES_COLUMNS, cache_dir)
+            built = get_cached_date_index(path, df, 'date_of_work', cache_dir)
+            self.assertIn('date_index', list(load_cache_manifest(cache_dir).values())[0])
+            loaded = get_cached_date_index(path, df, 'date_of_work', cache_dir)
+            np.testing.assert_array_equal(built['order'], loaded['order'])
+            np.testing.assert_array_equal(built['dates'], loaded['dates'])
+
+
+    #create_period_windows
+    def test_create_period_windows_weekly(self):
+        windows = create_period_windows('2023-07-20', '2023-08-10', 'weekly')
+        self.assertEqual(windows, [('2023-07-20', '2023-07-23'), ('2023-07-24', '2023-07-30'),
+                                   ('2023-07-31', '2023-08-06'), ('2023-08-07', '2023-08-10')])
+
+    def test_create_period_windows_monthly(self):
+        windows = create_period_windows('2023-01-01', '2023-03-31', 'monthly')
+        self.assertEqual(windows[1], ('2023-02-01', '2023-02-28'))
+
+    def test_create_period_windows_unknown(self):
+        self.assertEqual(create_period_windows('2023-01-01', '2023-03-31', 'yearly'), [])
+
+    #load_period_windows
+    def test_load_period_windows(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'periods.txt')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write("# sprints\n2023-07-01,2023-07-14\n\n2023-07-15:2023-07-28\n")
+            self.assertEqual(load_period_windows(path), [('2023-07-01', '2023-07-14'), ('2023-07-15', '2023-07-28')])
+
+    def test_load_period_windows_time_of_day(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'periods.txt')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write("2023-07-01T08:00:00,2023-07-14 17:30\n2023-07-15T00:00:00+02:00, 2023-07-28T12:00:00+02:00\n")
+            self.assertEqual(load_period_windows(path), [('2023-07-01T08:00:00', '2023-07-14 17:30'), ('2023-07-15T00:00:00+02:00', '2023-07-28T12:00:00+02:00')])
+
+    def test_load_period_windows_invalid(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'periods.txt')
+            for line in ['2023-07-01', '2023-07-01,sprint 1', '2023-07-14,2023-07-01', '2023-07-01,2023-07-14,2023-07-28']:
+                with open(path, 'w', encoding='utf-8') as file:
+                    file.write(f"2023-06-01,2023-06-30\n{line}\n")
+                with self.assertRaisesRegex(ValueError, 'Line 2'):
+                    load_period_windows(path)
+
+    #assign_periods
+    def test_assign_periods(self):
+        dates = pd.Series(pd.to_datetime(['2023-08-01 09:00', '2023-07-31 00:00', '2023-08-03 00:00', '2023-08-02 23:59']))
+        codes = assign_periods(dates, [('2023-08-01', '2023-08-02'), ('2023-07-31', '2023-07-31')])
+        self.assertEqual(codes.tolist(), [0, 1, -1, 0])
+
+    def test_assign_periods_overlapping(self):
+        dates = pd.Series(pd.to_datetime(['2023-08-01']))
+        with self.assertRaises(ValueError):
+            assign_periods(dates, [('2023-08-01', '2023-08-05'), ('2023-08-03', '2023-08-07')])
+
+    #summarize_periods
+    def test_summarize_periods(self):
+        windows = [('2023-08-01', '2023-08-01'), ('2023-08-02', '2023-08-02')]
+        result = summarize_periods(load_csv(TEST_CSV, LIST_ISSUES_COLUMNS), windows)
+        self.assertEqual(result.columns.tolist()[:2], ['period', 'issue_key'])
+        first = result[result['period'] == '2023-08-01:2023-08-01']
+        self.assertEqual(len(first), 6)
+        self.assertAlmostEqual(first['time_spent (hours)'].sum(), 18.99)
+        second = result[result['period'] == '2023-08-02:2023-08-02']
+        self.assertEqual(second['issue_key'].tolist(), ['Key_3'])
+
+    #list_issues_periods
+    def test_list_issues_periods_split(self):
+        with tempfile.TemporaryDirectory() as folder:
+            output_path = os.path.join(folder, 'issues')
+            list_issues_periods(TEST_CSV, create_period_windows('2023-08-01', '2023-08-02', 'daily'), output_path, split=True)
+            self.assertEqual(sorted(os.listdir(folder)), ['issues_2023-08-01_2023-08-01.csv', 'issues_2023-08-02_2023-08-02.csv'])
+
+
+    #Input DataFrames are left unchanged
+    def test_get_list_issues_keeps_input(self):
+        df = load_csv(TEST_CSV)
+        expected = df.copy()
+        get_list_issues(df, ['date_of_work', 'user', 'timelog_note'])
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_convert_date_keeps_input(self):
+        df = load_csv(TEST_CSV)
+        expected = df.copy()
+        result = convert_date(df, '2023-07-01', '2023-08-01', 'date_of_work')
+        pd.testing.assert_frame_equal(df, expected)
+        self.assertEqual(result['date_of_work'].dtype, 'datetime64[ns]')
+        self.assertEqual(len(result), 10)
+
+    def test_reports_reuse_loaded_frame(self):
+        df = load_csv(TEST_CSV)
+        first = partial_list_issues(df, '2023-07-01', '2023-08-01')
+        second = partial_list_issues(df, '2023-07-01', '2023-08-01')
+        pd.testing.assert_frame_equal(first, second)
+        self.assertIn('date_of_work', df.columns)
+
+
+    #build_aggregation_plan
+    def test_build_aggregation_plan_issues(self):
+        df = load_csv(TEST_CSV, LIST_ISSUES_COLUMNS).drop(columns=['date_of_work'])
+        plan = build_aggregation_plan(df)
+        self.assertEqual(plan['keys'], ['issue_key'])
+        self.assertEqual(plan['reducers']['time_spent (hours)'], 'sum')
+        self.assertEqual(plan['reducers']['total_time_spent'], 'first')
+        self.assertEqual(plan['reducers']['issue_title'], 'first')
+
+    def test_build_aggregation_plan_generic(self):
+        plan = build_aggregation_plan(pd.DataFrame(self.get_agg_data()))
+        self.assertEqual(plan['keys'], ['A'])
+        self.assertEqual(plan['reducers'], {'B': 'sum', 'C': 'first', 'D': 'sum'})
+
+    #run_aggregation_plan
+    def test_run_aggregation_plan(self):
+        df = pd.DataFrame({'issue_key': ['b', 'a', 'b'], 'time_spent (hours)': [1.0, 2.0, 3.0], 'total_time_spent': [10.0, 5.0, 10.0]})
+        result = run_aggregation_plan(df, build_aggregation_plan(df))
+        self.assertEqual(result['issue_key'].tolist(), ['a', 'b'])
+        self.assertEqual(result['time_spent (hours)'].tolist(), [2.0, 4.0])
+        self.assertEqual(result['total_time_spent'].tolist(), [5.0, 10.0])
+
+    def test_run_aggregation_plan_categorical_keys(self):
+        df = pd.DataFrame({'issue_key': pd.Categorical(['b', 'b'], categories=['a', 'b', 'c']), 'time_spent (hours)': [1.0, 2.0]})
+        result = run_aggregation_plan(df, build_aggregation_plan(df))
+        self.assertEqual(result['issue_key'].tolist(), ['b'])
+
+    def test_summarize_data_total_time_not_summed(self):
+        result = partial_list_issues(load_csv(TEST_CSV), '2023-07-01', '2023-08-01')
+        self.assertEqual(result.loc[result['issue_key'] == 'Key_1', 'total_time_spent'].iloc[0], 87.0)
+
+
+    #expand_file_paths
+    def split_test_csv(self, folder):
+        with open(TEST_CSV, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+        paths = []
+        for i, rows in enumerate([lines[1:6], lines[6:]]):
+            paths.append(os.path.join(folder, f'export_{i}.csv'))
+            with open(paths[-1], 'w', encoding='utf-8') as file:
+                file.writelines([lines[0]] + rows)
+        return paths
+
+    def test_expand_file_paths_folder(self):
+        with tempfile.TemporaryDirectory() as folder:
+            paths = self.split_test_csv(folder)
+            self.assertEqual(expand_file_paths(folder), paths)
+            self.assertEqual(expand_file_paths(os.path.join(folder, 'export_*.csv')), paths)
+
+    def test_expand_file_paths_file(self):
+        self.assertEqual(expand_file_paths(TEST_CSV), [TEST_CSV])
+        self.assertEqual(expand_file_paths(None), [])
+
+    #find_file_paths
+    def test_reports_single_match(self):
+        reports = list(REPORT_COLUMNS)
+        expected = calculate_reports(load_csv(TEST_CSV), reports, '2023-07-01', '2023-08-01')
+        with tempfile.TemporaryDirectory() as folder:
+            shutil.copy(TEST_CSV, os.path.join(folder, 'export.csv'))
+            for path in (folder, os.path.join(folder, '*.csv')):
+                results = calculate_file_reports(path, reports, '2023-07-01', '2023-08-01')
+                for report in reports:
+                    pd.testing.assert_frame_equal(results[report], expected[report])
+                with mock.patch('sys.stdout') as stdout:
+                    list_empty_accounts(path)
+                self.assertIn('Total Result', ''.join(call.args[0] for call in stdout.write.call_args_list))
+            with self.assertRaises(FileNotFoundError):
+                find_file_paths(os.path.join(folder, '*.txt'))
+            with self.assertRaises(SystemExit), mock.patch('sys.stdout'):
+                list_reported_time_per_account(os.path.join(folder, 'missing', '*.csv'))
+
+    #aggregate_file
+    def test_aggregate_file(self):
+        partials = aggregate_file(TEST_CSV, ['list_empty_accounts', 'list_issues'], '2023-07-01', '2023-08-01')
+        self.assertEqual(sorted(partials), ['grouped', 'issues'])
+
+    #calculate_reports_files
+    def test_calculate_reports_files(self):
+        reports = list(REPORT_COLUMNS)
+        expected = calculate_reports(load_csv(TEST_CSV), reports, '2023-07-01', '2023-08-01')
+        with tempfile.TemporaryDirectory() as folder:
+            paths = self.split_test_csv(folder)
+            for workers in (1, 2):
+                results = calculate_reports_files(paths, reports, '2023-07-01', '2023-08-01', workers)
+                for report in reports:
+                    pd.testing.assert_frame_equal(results[report], expected[report], check_dtype=False, check_categorical=False)
+
+    def test_calculate_reports_files_reported_time_only(self):
+        with tempfile.TemporaryDirectory() as folder:
+            paths = self.split_test_csv(folder)
+            results = calculate_reports_files(paths, ['list_reported_time_per_account'], workers=1)
+            self.assertAlmostEqual(results['list_reported_time_per_account']['Time Spent'].iloc[-1], 22.54)
+
+    #update_incremental_state
+    def write_lines(self, path, lines, mode='w'):
+        with open(path, mode, encoding='utf-8') as file:
+            file.writelines(lines)
+
+    def test_update_incremental_state_appended_rows(self):
+        with open(TEST_CSV, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'export.csv')
+            state_path = os.path.join(folder, 'state.npz')
+            self.write_lines(path, lines[:6])
+            self.assertEqual(update_incremental_state(path, state_path)['rows'], 5)
+            self.write_lines(path, lines[6:], 'a')
+            state = update_incremental_state(path, state_path)
+            self.assertEqual(state['rows'], len(lines) - 1)
+            self.assertEqual(state['offset'], os.path.getsize(path))
+
+    def test_update_incremental_state_changed_rows(self):
+        with open(TEST_CSV, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'export.csv')
+            state_path = os.path.join(folder, 'state.npz')
+            self.write_lines(path, lines)
+            update_incremental_state(path, state_path)
+            self.write_lines(path, lines[:1] + lines[2:])
+            self.assertEqual(update_incremental_state(path, state_path)['rows'], len(lines) - 2)
+
+    def test_update_incremental_state_changed_last_row(self):
+        with open(TEST_CSV, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'export.csv')
+            state_path = os.path.join(folder, 'state.npz')
+            self.write_lines(path, lines[:1] + lines[1:] * 200)
+            self.assertGreater(os.path.getsize(path), 2 * STATE_CHECK_BYTES)
+            update_incremental_state(path, state_path)
+            self.write_lines(path, lines[:1] + lines[1:] * 199 + lines[1:-1] + [lines[-1].replace(',3.55,', ',4.55,')])
+            state = update_incremental_state(path, state_path)
+            self.assertAlmostEqual(state['grouped']['time_spent (hours)'].sum(), load_csv(path)['time_spent (hours)'].sum())
+
+    def test_update_incremental_state_changed_early_row(self):
+        with open(TEST_CSV, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'export.csv')
+            state_path = os.path.join(folder, 'state.npz')
+            self.write_lines(path, lines[:1] + lines[1:] * 200)
+            hours = update_incremental_state(path, state_path)['grouped']['time_spent (hours)'].sum()
+            #Only the last STATE_CHECK_BYTES processed bytes are checked, so an earlier edit of the same length isn't noticed
+            self.write_lines(path, lines[:1] + [lines[1].replace(',1,', ',2,', 1)] + lines[2:] + lines[1:] * 199)
+            state = update_incremental_state(path, state_path)
+            self.assertAlmostEqual(state['grouped']['time_spent (hours)'].sum(), hours)
+
+    def test_update_incremental_state_binary(self):
+        with tempfile.TemporaryDirectory() as folder:
+            state_path = os.path.join(folder, 'state.npz')
+            state = update_incremental_state(TEST_CSV, state_path)
+            with np.load(state_path) as data:
+                self.assertEqual(data['issues/issue_key'].dtype, np.int8)
+                self.assertEqual(data['issues/day'].dtype, np.int32)
+                self.assertEqual(data['issues/issue_type row'].dtype, np.int8)
+            self.assertLessEqual(len(state['issues']), len(load_csv(TEST_CSV)))
+            pd.testing.assert_frame_equal(load_incremental_state(state_path)['issues'], state['issues'], check_dtype=False, check_categorical=False)
+
+    def test_update_incremental_state_quoted_line_break(self):
+        with open(TEST_CSV, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'export.csv')
+            state_path = os.path.join(folder, 'state.npz')
+            row = lines[1].rstrip('\n').rstrip(',') + ',"First line\n'
+            self.write_lines(path, lines + [row])
+            self.assertEqual(update_incremental_state(path, state_path)['rows'], len(lines) - 1)
+            self.write_lines(path, ['second line"\n'], 'a')
+            state = update_incremental_state(path, state_path)
+            self.assertEqual(state['rows'], len(lines))
+            self.assertAlmostEqual(state['grouped']['time_spent (hours)'].sum(), load_csv(path)['time_spent (hours)'].sum())
+
+    #calculate_reports_incremental
+    def test_calculate_reports_incremental_file_order(self):
+        with open(TEST_CSV, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'export.csv')
+            state_path = os.path.join(folder, 'state.npz')
+            self.write_lines(path, lines[:1] + lines[-1:] + lines[1:-1])
+            expected = calculate_reports(load_csv(path), ['list_issues'], '2023-07-01', '2023-08-02')['list_issues']
+            results = calculate_reports_incremental(path, state_path, ['list_issues'], '2023-07-01', '2023-08-02')
+            pd.testing.assert_frame_equal(results['list_issues'], expected, check_dtype=False, check_categorical=False)
+            self.assertEqual(results['list_issues'].set_index('issue_key').loc['Key_3', 'issue_type'], 'Order')
+
+    def test_calculate_reports_incremental(self):
+        reports = list(REPORT_COLUMNS)
+        expected = calculate_reports(load_csv(TEST_CSV), reports, '2023-07-01', '2023-08-01')
+        with open(TEST_CSV, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'export.csv')
+            state_path = os.path.join(folder, 'state.npz')
+            self.write_lines(path, lines[:6])
+            calculate_reports_incremental(path, state_path, reports, '2023-07-01', '2023-08-01')
+            self.write_lines(path, lines[6:], 'a')
+            results = calculate_reports_incremental(path, state_path, reports, '2023-07-01', '2023-08-01')
+            for report in reports:
+                pd.testing.assert_frame_equal(results[report].reset_index(drop=True), expected[report].reset_index(drop=True), check_dtype=False, check_categorical=False)
+
+    def test_calculate_reports_incremental_time_of_day(self):
+        expected = calculate_reports(load_csv(TEST_CSV), ['list_issues'], '2023-08-01T09:00:00', '2023-08-02')['list_issues']
+        with tempfile.TemporaryDirectory() as folder:
+            state_path = os.path.join(folder, 'state.npz')
+            calculate_reports_incremental(TEST_CSV, state_path, ['list_issues'], '2023-07-01', '2023-08-02')
+            results = calculate_reports_incremental(TEST_CSV, state_path, ['list_issues'], '2023-08-01T09:00:00', '2023-08-02')
+            pd.testing.assert_frame_equal(results['list_issues'], expected, check_dtype=False, check_categorical=False)
+
+    #get_output_format
+    def test_get_output_format(self):
+        self.assertEqual(get_output_format('out'), ('csv', 'out.csv'))
+        self.assertEqual(get_output_format('out.csv.gz'), ('csv.gz', 'out.csv.gz'))
+        self.assertEqual(get_output_format('out.jsonl'), ('jsonl', 'out.jsonl'))
+        self.assertEqual(get_output_format('out', 'parquet'), ('parquet', 'out.parquet'))
+        with self.assertRaises(ValueError):
+            get_output_format('out', 'xlsx')
+
+    #dataframe_to_csv
+    def test_dataframe_to_csv_chunked(self):
+        df = partial_list_issues(load_csv(TEST_CSV), '2023-07-01', '2023-08-01')
+        with tempfile.TemporaryDirectory() as folder:
+            with mock.patch.object(gitlab_reporter, 'OUTPUT_CHUNKSIZE', 2):
+                dataframe_to_csv(df, os.path.join(folder, 'issues'))
+                dataframe_to_csv(df, os.path.join(folder, 'issues.csv.gz'))
+                dataframe_to_csv(df, os.path.join(folder, 'issues'), 'jsonl')
+            expected = pd.read_csv(os.path.join(folder, 'issues.csv'))
+            self.assertEqual(len(expected), len(df))
+            with gzip.open(os.path.join(folder, 'issues.csv.gz'), 'rt', encoding='utf-8') as file:
+                pd.testing.assert_frame_equal(pd.read_csv(file), expected)
+            pd.testing.assert_frame_equal(pd.read_json(os.path.join(folder, 'issues.jsonl'), lines=True), expected)
+
+    def test_dataframe_to_csv_jsonl_lines(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with mock.patch.object(gitlab_reporter, 'OUTPUT_CHUNKSIZE', 1):
+                dataframe_to_csv(pd.DataFrame({'a': [1, 2], 'b': ['x', 'ö']}), os.path.join(folder, 'rows'), 'jsonl')
+            with open(os.path.join(folder, 'rows.jsonl'), 'rb') as file:
+                self.assertEqual(file.read(), '{"a":1,"b":"x"}\n{"a":2,"b":"ö"}\n'.encode('utf-8'))
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_dataframe_to_csv_parquet(self):
+        df = partial_list_issues(load_csv(TEST_CSV), '2023-07-01', '2023-08-01')
+        with tempfile.TemporaryDirectory() as folder:
+            with mock.patch.object(gitlab_reporter, 'OUTPUT_CHUNKSIZE', 2):
+                dataframe_to_csv(df, os.path.join(folder, 'issues.parquet'))
+            result = pd.read_parquet(os.path.join(folder, 'issues.parquet'))
+            pd.testing.assert_frame_equal(result, df.reset_index(drop=True), check_dtype=False, check_categorical=False)
+
+    #print_preview
+    def test_print_preview(self):
+        df = pd.DataFrame({'value': range(5)})
+        with mock.patch('builtins.print') as print_mock:
+            print_preview(df, 2)
+            self.assertEqual(print_mock.call_args_list[-1], mock.call("... 3 more rows"))
+        with mock.patch('builtins.print') as print_mock:
+            print_preview(df, 0)
+            print_mock.assert_not_called()
+
+    #enable_profiling
+    def test_enable_profiling(self):
+        enable_profiling(memory=True)
+        try:
+            df = gitlab_reporter.load_csv(TEST_CSV)
+            gitlab_reporter.calculate_reports(df, ['list_empty_accounts', 'list_issues'], '2023-07-01', '2023-08-01')
+        finally:
+            stages = disable_profiling()
+        self.assertIs(gitlab_reporter.load_csv, load_csv)
+        self.assertEqual(stages['load_csv']['rows_out'], 11)
+        self.assertEqual(stages['convert_date']['calls'], 1)
+        self.assertGreater(stages['calculate_reports']['seconds'], 0)
+        self.assertGreater(stages['summarize_data']['peak_traced'], 0)
+
+    def test_enable_profiling_generator(self):
+        enable_profiling()
+        try:
+            with mock.patch.object(gitlab_reporter, 'parse_date_columns', side_effect=lambda df: time.sleep(0.05) or df):
+                chunks = gitlab_reporter.load_csv_chunks(TEST_CSV, 4)
+                frames = [gitlab_reporter.summarize_data(chunk) for chunk in chunks]
+        finally:
+            stages = disable_profiling()
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(stages['load_csv_chunks']['calls'], 1)
+        self.assertEqual(stages['load_csv_chunks']['rows_out'], 11)
+        self.assertGreaterEqual(stages['load_csv_chunks']['seconds'], 0.15)
+        self.assertLess(stages['summarize_data']['seconds'], 0.15)
+
+    def test_disable_profiling_when_off(self):
+        self.assertEqual(disable_profiling(), {})
+
+    #report_profile
+    def test_report_profile_json(self):
+        stages = {'load_csv': {'calls': 1, 'seconds': 0.5, 'rows_in': 0, 'rows_out': 11, 'peak_rss_growth': 1024 ** 2, 'peak_traced': None}}
+        with tempfile.TemporaryDirectory() as folder:
+            json_path = os.path.join(folder, 'profile.json')
+            with mock.patch('sys.stderr'):
+                report_profile(stages, json_path)
+            with open(json_path, 'r', encoding='utf-8') as file:
+                self.assertEqual(json.load(file), stages)
+
+    #sum_time_small_csv
+    def test_sum_time_small_csv(self):
+        totals = sum_time_small_csv(TEST_CSV, 'account_label', False)
+        self.assertAlmostEqual(totals['Hotellet'], 7.33)
+        self.assertAlmostEqual(totals[None], 4.83)
+        self.assertIsNone(sum_time_small_csv(TEST_CSV, 'account_label', False, max_rows=5))
+
+    #format_time_table
+    def test_format_time_table(self):
+        df = pd.DataFrame({'User': ['Anna', 'Bo Bengtsson', np.nan, 'Total Result'], 'Time Spent': [0.5, 12.25, 3.0, 15.75]})
+        self.assertEqual(format_time_table({'Bo Bengtsson': 12.25, 'Anna': 0.5, None: 3.0}, 'User'), df.to_string(index=False))
+        self.assertIsNone(format_time_table({'Anna': 1e-9}, 'User'))
+        self.assertIsNone(format_time_table({}, 'User'))
+
+    #fast_time_report
+    def test_fast_time_report_matches_pandas(self):
+        expected = calculate_final_list_empty_accounts(calculate_user_time(load_csv(TEST_CSV)))
+        self.assertEqual(fast_time_report(TEST_CSV, 'user', 'User', True), expected.to_string(index=False))
+        expected = calculate_final_reported_time_for_user(calculate_account_time(load_csv(TEST_CSV)))
+        self.assertEqual(fast_time_report(TEST_CSV, 'account_label', 'Account Label', False), expected.to_string(index=False))
+        self.assertIsNone(fast_time_report(TEST_CSV, 'user', 'User', True, max_rows=0))
+
+    def test_fast_time_report_prints_like_print_df(self):
+        rng = np.random.default_rng(0)
+        df = load_csv(TEST_CSV)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'export.csv')
+            for rows in (11, 500, 5000):
+                sample = df.sample(rows, replace=True, random_state=rows).reset_index(drop=True)
+                sample['time_spent (hours)'] = np.round(rng.gamma(2.0, 1.0, rows), int(rows % 3) + 1)
+                sample.to_csv(path, index=False)
+                for function in (list_empty_accounts, list_reported_time_per_account):
+                    outputs = []
+                    for fast_path_rows in (0, 10000):
+                        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+                            function(path, fast_path_rows=fast_path_rows)
+                        outputs.append(stdout.getvalue())
+                    self.assertEqual(outputs[0], outputs[1])
+
+    def test_fast_time_report_off_when_profiling(self):
+        enable_profiling()
+        try:
+            self.assertIsNone(fast_time_report(TEST_CSV, 'user', 'User', True))
+        finally:
+            disable_profiling()
+
+    #build_parser
+    def test_build_parser(self):
+        args = build_parser().parse_args(['--list_issues', '--start=2023-07-01', '--end', '2023-08-01', 'export.csv', 'output'])
+        self.assertTrue(args.list_issues)
+        self.assertEqual((args.start, args.end, args.csv_file, args.output_path), ('2023-07-01', '2023-08-01', 'export.csv', 'output'))
+        with mock.patch('sys.stderr'):
+            with self.assertRaises(SystemExit):
+                build_parser().parse_args(['--list_issues', '--list_empty_accounts', 'export.csv'])
+
+    #DeferredModule
+    def test_import_does_not_load_pandas(self):
+        code = ("import sys, gitlab_reporter; print('pandas' in sys.modules); gitlab_reporter.pd.DataFrame; "
+                "print(type(sys.modules['pandas']).__name__, gitlab_reporter.pd is sys.modules['pandas'])")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.stdout.split('\n')[:2], ['False', 'module True'])
+
+    #query_dataset
+    def test_query_dataset(self):
+        dataset = load_dataset(TEST_CSV)
+        expected = calculate_reports(load_csv(TEST_CSV), list(REPORT_COLUMNS), '2023-07-01', '2023-08-01')
+        for report in REPORT_COLUMNS:
+            result = query_dataset(dataset, report, '2023-07-01', '2023-08-01')
+            pd.testing.assert_frame_equal(result.reset_index(drop=True), expected[report].reset_index(drop=True), check_dtype=False, check_categorical=False)
+        with self.assertRaises(ValueError):
+            query_dataset(dataset, 'list_issues')
+        with self.assertRaises(KeyError):
+            query_dataset(dataset, 'unknown')
+
+    #reload_if_changed
+    def test_reload_if_changed(self):
+        with tempfile.TemporaryDirectory() as folder:
+            paths = self.split_test_csv(folder)
+            os.remove(paths[1])
+            server_state = {'dataset': load_dataset(folder), 'cache_dir': None, 'timezone': 'Europe/Stockholm'}
+            self.assertFalse(reload_if_changed(server_state))
+            self.split_test_csv(folder)
+            self.assertTrue(reload_if_changed(server_state))
+            self.assertEqual(server_state['dataset']['store']['rows'], 11)
+
+    #create_report_server
+    def test_create_report_server(self):
+        server_state = {'dataset': load_dataset(TEST_CSV), 'cache_dir': None, 'timezone': 'Europe/Stockholm'}
+        server = create_report_server(server_state, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(f"{url}/reports/list_reported_time_per_account") as response:
+                rows = json.loads(response.read())
+            self.assertEqual(rows[-1], {'Account Label': 'Total Result', 'Time Spent': 22.54})
+            with urllib.request.urlopen(f"{url}/reports/list_issues?start=2023-07-01&end=2023-08-01&format=csv") as response:
+                self.assertEqual(len(response.read().decode('utf-8').splitlines()), 7)
+            with self.assertRaises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(f"{url}/reports/list_issues")
+            self.assertEqual(error.exception.code, 400)
+            urllib.request.urlopen(f"{url}/reports/list_issues?start=2023-07-01&end=2023-08-01").read()
+            with urllib.request.urlopen(f"{url}/health") as response:
+                self.assertGreaterEqual(json.loads(response.read())['result_cache']['hits'], 1)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    #build_rollup
+    def test_rollup_list_issues(self):
+        df = load_csv(TEST_CSV)
+        rollup = build_rollup(df)
+        for start_date, end_date in [('2023-07-01', '2023-08-01'), ('2023-08-01', '2023-08-02'), ('2020-01-01', '2030-01-01')]:
+            pd.testing.assert_frame_equal(rollup_list_issues(rollup, start_date, end_date), partial_list_issues(df, start_date, end_date))
+        self.assertIsNone(rollup_list_issues(rollup, '2023-07-01', '2023-08-01 12:00'))
+
+    def test_rollup_list_issues_time_of_day(self):
+        df = pd.DataFrame({
+            'date_of_work': ['2023-08-01T00:00:00+02:00', '2023-08-01T10:00:00+02:00', '2023-07-31T23:30:00+02:00'],
+            'user': ['A', 'A', 'B'],
+            'issue_key': ['Key_1', 'Key_1', 'Key_2'],
+            'time_spent (hours)': [1.0, 2.0, 4.0],
+            'issue_type': ['Task'] * 3,
+            'project_id': ['P'] * 3,
+            'project_group': ['G'] * 3,
+            'total_time_spent': [3.0, 3.0, 4.0],
+            'account_label': ['Hemmet', 'Hemmet', None],
+            'issue_title': ['Stuff'] * 3,
+        }).astype({column: 'category' for column in ['user', 'issue_key', 'issue_type', 'project_id', 'project_group', 'account_label']})
+        result = rollup_list_issues(build_rollup(df), '2023-07-31', '2023-08-01')
+        self.assertEqual(list(result['time_spent (hours)']), [3.0, 4.0])
+        result = rollup_list_issues(build_rollup(df), '2023-07-31', '2023-08-01 00:00')
+        self.assertEqual(list(result['time_spent (hours)']), [1.0, 4.0])
+        pd.testing.assert_frame_equal(result, partial_list_issues(df, '2023-07-31', '2023-08-01 00:00'))
+        self.assertIsNone(rollup_list_issues(build_rollup(df), '2023-07-31', '2023-08-01 12:00'))
+
+    def test_rollup_list_issues_first_row_in_window(self):
+        df = load_csv(TEST_CSV)
+        rollup = build_rollup(df)
+        for start_date, end_date in [('2023-08-02', '2023-08-02'), ('2023-08-01', '2023-08-02'), ('2023-07-01', '2023-08-01')]:
+            pd.testing.assert_frame_equal(rollup_list_issues(rollup, start_date, end_date), partial_list_issues(df, start_date, end_date))
+
+        rng = np.random.default_rng(1)
+        sample = df.sample(300, replace=True, random_state=1).reset_index(drop=True)
+        days = pd.Timestamp('2023-07-25') + pd.to_timedelta(rng.integers(0, 10, 300), unit='D')
+        sample['date_of_work'] = days.strftime('%Y-%m-%dT00:00:00+02:00')
+        for column in ('issue_type', 'project_id', 'account_label'):
+            sample.loc[rng.random(300) < 0.3, column] = np.nan
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'export.csv')
+            sample.to_csv(path, index=False)
+            sample = load_csv(path)
+        rollup = build_rollup(sample)
+        for start_date, end_date in [('2023-07-28', '2023-07-30'), ('2023-08-01', '2023-08-03'), ('2023-07-25', '2023-08-03')]:
+            pd.testing.assert_frame_equal(rollup_list_issues(rollup, start_date, end_date), partial_list_issues(sample, start_date, end_date))
+
+    def test_build_rollup_integer_rows(self):
+        df = load_csv(TEST_CSV)
+        df.loc[df['issue_key'] == 'Key_1', 'issue_type'] = np.nan
+        rollup = build_rollup(df)
+        for column in ['issue_type', 'total_time_spent']:
+            self.assertTrue(np.issubdtype(rollup['issues'][f"{column} row"].dtype, np.integer))
+        self.assertIn(-1, rollup['issues']['issue_type row'])
+        pd.testing.assert_frame_equal(rollup_list_issues(rollup, '2023-07-01', '2023-08-01'), partial_list_issues(df, '2023-07-01', '2023-08-01'))
+
+    def test_rollup_time_by_account_and_user(self):
+        df = load_csv(TEST_CSV)
+        reports = ['list_empty_accounts', 'list_reported_time_per_account']
+        expected = calculate_reports(df, reports)
+        results = finish_reports(reports, rollup_time_by_account_and_user(build_rollup(df)), None)
+        for report in reports:
+            pd.testing.assert_frame_equal(results[report], expected[report])
+
+    #save_rollup
+    def test_save_rollup(self):
+        rollup = build_rollup(load_csv(TEST_CSV))
+        with tempfile.TemporaryDirectory() as folder:
+            save_rollup(os.path.join(folder, 'rollup.npz'), rollup)
+            loaded = load_rollup(os.path.join(folder, 'rollup.npz'))
+        self.assertEqual(loaded['timezone'], rollup['timezone'])
+        pd.testing.assert_frame_equal(rollup_list_issues(loaded, '2023-07-01', '2023-08-01'), rollup_list_issues(rollup, '2023-07-01', '2023-08-01'))
+
+    #calculate_reports_rollup
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_calculate_reports_rollup(self):
+        reports = list(REPORT_COLUMNS)
+        expected = calculate_reports(load_csv(TEST_CSV), reports, '2023-07-01', '2023-08-01')
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for _ in range(2):
+                results = calculate_reports_rollup(TEST_CSV, reports, '2023-07-01', '2023-08-01', cache_dir, max_ratio=1)
+                for report in reports:
+                    pd.testing.assert_frame_equal(results[report], expected[report], check_dtype=False, check_categorical=False)
+            self.assertEqual(len([name for name in os.listdir(cache_dir) if '_rollup_' in name]), 1)
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_calculate_reports_rollup_not_smaller(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with mock.patch('gitlab_reporter.build_rollup', wraps=build_rollup) as build:
+                for _ in range(2):
+                    self.assertIsNone(calculate_reports_rollup(TEST_CSV, list(REPORT_COLUMNS), '2023-07-01', '2023-08-01', cache_dir))
+            self.assertEqual(build.call_count, 1)
+            self.assertEqual([name for name in os.listdir(cache_dir) if '_rollup_' in name], [])
+
+    #get_window_bounds
+    def test_get_window_bounds(self):
+        self.assertEqual(get_window_bounds('2023-07-01', '2023-08-01'), (pd.Timestamp('2023-07-01'), pd.Timestamp('2023-08-01 23:59:59.999999999')))
+        self.assertEqual(get_window_bounds('2023-07-01', '2023-08-01 12:00')[1], pd.Timestamp('2023-08-01 12:00'))
+
+    def test_window_end_includes_whole_day(self):
+        df = load_csv(TEST_CSV)
+        df['date_of_work'] = ['2023-07-31T23:00:00+02:00', '2023-08-01T00:00:00+02:00', '2023-08-01T10:00:00+02:00', '2023-08-01T23:59:00+02:00',
+                              '2023-08-02T00:00:00+02:00'] * 2 + ['2023-08-01T18:00:00+02:00']
+        expected = partial_list_issues(df, '2023-08-01', '2023-08-01')
+        self.assertAlmostEqual(expected['time_spent (hours)'].sum(), df.loc[[1, 2, 3, 6, 7, 8, 10], 'time_spent (hours)'].sum())
+
+        window_df = list_issues_in_window(df, build_date_index(df, 'date_of_work'), '2023-08-01', '2023-08-01')
+        pd.testing.assert_frame_equal(window_df, expected)
+        periods = summarize_periods(df, create_period_windows('2023-07-31', '2023-08-02', 'daily'))
+        self.assertAlmostEqual(periods.loc[periods['period'] == '2023-08-01:2023-08-01', 'time_spent (hours)'].sum(), expected['time_spent (hours)'].sum())
+        store = calculate_reports_store(build_timelog_store(df), ['list_issues'], '2023-08-01', '2023-08-01')['list_issues']
+        pd.testing.assert_frame_equal(store.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False, check_categorical=False)
+        rollup = rollup_list_issues(build_rollup(df), '2023-08-01', '2023-08-01')
+        self.assertAlmostEqual(rollup['time_spent (hours)'].sum(), expected['time_spent (hours)'].sum())
+
+    #sum_floats
+    def test_sum_floats(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({'key': rng.integers(0, 5, 10000), 'hours': np.round(rng.gamma(2.0, 1.0, 10000), 2)})
+        df.loc[::7, 'hours'] = np.nan
+        expected = sum_floats(df, ['key'], 'hours')
+        shuffled = df.sample(frac=1, random_state=1)
+        pd.testing.assert_series_equal(sum_floats(shuffled, ['key'], 'hours'), expected, check_exact=True)
+        pd.testing.assert_series_equal(expected, df.groupby('key')['hours'].sum(), rtol=1e-14)
+
+    #get_dates_in_window
+    def test_get_dates_in_window(self):
+        dates = ['2023-07-31T23:30:00+00:00', '2023-08-01T00:00:00+02:00', '2023-08-01T10:00:00+02:00', None]
+        self.assertEqual(get_dates_in_window(dates, '2023-07-01', '2023-08-01'), dates[:3])
+        self.assertEqual(get_dates_in_window(dates, '2023-07-01', '2023-08-01 00:00'), dates[1:2])
+
+    #calculate_reports_engine
+    def assert_engine_parity(self, engine, file_path, start_date, end_date):
+        reports = list(REPORT_COLUMNS)
+        expected = calculate_reports_engine(file_path, reports, start_date, end_date)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for cache in (None, cache_dir, cache_dir):
+                results = calculate_reports_engine(file_path, reports, start_date, end_date, engine, cache)
+                for report in reports:
+                    pd.testing.assert_frame_equal(results[report], expected[report], check_dtype=False, check_categorical=False, check_exact=True)
+
+    @unittest.skipUnless(polars, "polars is not installed")
+    def test_calculate_reports_engine_polars(self):
+        self.assert_engine_parity('polars', TEST_CSV, '2023-07-01', '2023-08-01')
+
+    @unittest.skipUnless(duckdb, "duckdb is not installed")
+    def test_calculate_reports_engine_duckdb(self):
+        self.assert_engine_parity('duckdb', TEST_CSV, '2023-07-01', '2023-08-01')
+
+    @unittest.skipUnless(polars and duckdb, "polars and duckdb are not installed")
+    def test_calculate_reports_engine_generated_export(self):
+        import benchmark_gitlab_reporter
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = benchmark_gitlab_reporter.write_export(20000, folder)
+            for engine in ('polars', 'duckdb'):
+                self.assert_engine_parity(engine, file_path, '2023-03-01', '2023-05-31')
+
+    def test_calculate_reports_engine_unknown(self):
+        with self.assertRaises(ValueError):
+            calculate_reports_engine(TEST_CSV, ['list_empty_accounts'], engine='spark')
+
+    #share_arrays
+    def test_share_arrays(self):
+        arrays = {'codes': np.arange(5, dtype=np.int32), 'hours': np.array([1.5, 2.0]), 'empty': np.array([], dtype=np.float64)}
+        blocks, specs = share_arrays(arrays)
+        try:
+            attached, shared = attach_shared_arrays(specs)
+            for name, array in arrays.items():
+                np.testing.assert_array_equal(shared[name], array)
+            shared.clear()
+            for block in attached:
+                block.close()
+        finally:
+            release_shared_arrays(blocks)
+
+    #hash_partition
+    def test_hash_partition(self):
+        codes = np.array([0, 1, 2, 1, 0, 7, 2], dtype=np.int32)
+        shards = hash_partition(codes, 3)
+        self.assertTrue(((shards >= 0) & (shards < 3)).all())
+        for code in np.unique(codes):
+            self.assertEqual(len(set(shards[codes == code])), 1)
+
+    #calculate_reports_sharded
+    def test_calculate_reports_sharded(self):
+        reports = list(REPORT_COLUMNS)
+        df = load_csv(TEST_CSV, gitlab_reporter.get_report_columns(reports))
+        expected = calculate_reports(df, reports, '2023-07-01', '2023-08-01')
+        for shards in (1, 3):
+            results = calculate_reports_sharded(df, reports, '2023-07-01', '2023-08-01', shards)
+            for report in reports:
+                pd.testing.assert_frame_equal(results[report], expected[report], check_exact=True)
+
+    def test_calculate_reports_sharded_generated_export(self):
+        import benchmark_gitlab_reporter
+        reports = list(REPORT_COLUMNS)
+        df = benchmark_gitlab_reporter.generate_export(20000)
+        df = df.astype({column: dtype for column, dtype in gitlab_reporter.DTYPES.items() if dtype == 'category'})
+        expected = calculate_reports(df, reports, '2023-03-01', '2023-05-31')
+        results = calculate_reports_sharded(df, reports, '2023-03-01', '2023-05-31', 4)
+        for report in reports:
+            pd.testing.assert_frame_equal(results[report], expected[report], check_exact=True)
+
+    def test_calculate_reports_sharded_account_report(self):
+        reports = ['list_reported_time_per_account']
+        df = load_csv(TEST_CSV, gitlab_reporter.get_report_columns(reports))
+        pd.testing.assert_frame_equal(calculate_reports_sharded(df, reports, shards=2)[reports[0]], calculate_reports(df, reports)[reports[0]])
+
+    def test_calculate_reports_sharded_falls_back(self):
+        expected = calculate_file_reports(TEST_CSV, list(REPORT_COLUMNS), '2023-07-01', '2023-08-01')
+        with mock.patch('gitlab_reporter.calculate_reports_store', side_effect=OSError("no shared memory")):
+            with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+                self.assertIsNone(calculate_reports_sharded(load_csv(TEST_CSV), ['list_issues'], shards=2))
+                results = calculate_file_reports(TEST_CSV, list(REPORT_COLUMNS), '2023-07-01', '2023-08-01', workers=2)
+                list_empty_accounts(TEST_CSV, workers=2)
+        for report in REPORT_COLUMNS:
+            pd.testing.assert_frame_equal(results[report], expected[report])
+        self.assertIn("Couldn't calculate the reports in shards", stdout.getvalue())
+        self.assertIn("Total", stdout.getvalue())
+
+    #get_code_dtype
+    def test_get_code_dtype(self):
+        self.assertEqual(get_code_dtype(10), np.int8)
+        self.assertEqual(get_code_dtype(300), np.int16)
+        self.assertEqual(get_code_dtype(100000), np.int32)
+
+    #build_timelog_store
+    def test_build_timelog_store(self):
+        df = load_csv(TEST_CSV)
+        store = build_timelog_store(df)
+        self.assertEqual(store['rows'], len(df))
+        self.assertEqual(store['arrays']['date_of_work'].dtype, np.int64)
+        self.assertEqual(store['arrays']['time_spent (hours)'].dtype, np.float64)
+        self.assertEqual(store['arrays']['issue_title'].dtype, np.int8)
+        self.assertLess(get_store_nbytes(store), df.memory_usage(deep=True).sum())
+
+    #timelog_store_to_frame
+    def test_timelog_store_to_frame(self):
+        df = load_csv(TEST_CSV)
+        store = build_timelog_store(df)
+        pd.testing.assert_frame_equal(timelog_store_to_frame(store), df, check_exact=True)
+        pd.testing.assert_frame_equal(timelog_store_to_frame(store, ['user', 'date_of_work'], np.array([1, 3])), df[['user', 'date_of_work']].iloc[[1, 3]].reset_index(drop=True))
+
+    #select_store_window
+    def test_select_store_window(self):
+        df = load_csv(TEST_CSV)
+        store = build_timelog_store(df)
+        expected = convert_date(df, '2023-07-01', '2023-08-01', 'date_of_work').index
+        mask = select_store_window(store, '2023-07-01', '2023-08-01')
+        self.assertEqual(list(np.flatnonzero(mask)), list(expected))
+        date_index = build_date_index(df, 'date_of_work')
+        np.testing.assert_array_equal(select_store_window(store, '2023-07-01', '2023-08-01', date_index=date_index), mask)
+
+    #calculate_reports_store
+    def test_calculate_reports_store(self):
+        reports = list(REPORT_COLUMNS)
+        df = load_csv(TEST_CSV)
+        expected = calculate_reports(df, reports, '2023-07-01', '2023-08-01')
+        results = calculate_reports_store(build_timelog_store(df), reports, '2023-07-01', '2023-08-01')
+        for report in reports:
+            pd.testing.assert_frame_equal(results[report], expected[report], check_exact=True)
+
+    #sort_categories
+    def test_sort_categories(self):
+        df = pd.DataFrame({'user': pd.Categorical(['b', 'a', None], categories=['b', 'a']), 'hours': [1.0, 2.0, 3.0]})
+        df = sort_categories(df)
+        self.assertEqual(list(df['user'].cat.categories), ['a', 'b'])
+        self.assertEqual(list(df['user'].astype(object).fillna('')), ['b', 'a', ''])
+
+    #find_line_ranges
+    def test_find_line_ranges(self):
+        buffer = b'a,b\n1,"x\ny"\n2,"p,\n""q""\n"\n3,z\n'
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        ranges = find_line_ranges(buffer, data, 4, 20)
+        self.assertEqual(ranges[0][0], 4)
+        self.assertEqual(ranges[-1][1], len(buffer))
+        self.assertEqual([buffer[start:end] for start, end in ranges], [b'1,"x\ny"\n', b'2,"p,\n""q""\n"\n', b'3,z\n'])
+
+    #load_csv_mmap
+    def test_load_csv_mmap(self):
+        for columns in (None, LIST_ISSUES_COLUMNS, EMPTY_ACCOUNTS_COLUMNS):
+            pd.testing.assert_frame_equal(load_csv_mmap(TEST_CSV, columns, 3), load_csv(TEST_CSV, columns), check_exact=True)
+
+    def test_read_threads_passed_to_load_csv(self):
+        with mock.patch('gitlab_reporter.load_csv_mmap', wraps=load_csv_mmap) as load:
+            with mock.patch('sys.stdout', new_callable=io.StringIO):
+                gitlab_reporter.main(['--list_empty_accounts', '--read_threads=3', TEST_CSV])
+                gitlab_reporter.main(['--list_empty_accounts', TEST_CSV])
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(load.call_args.args[2], 3)
+        self.assertEqual(gitlab_reporter.CSV_READ_THREADS, 1)
+
+    def test_load_csv_mmap_quoted_fields(self):
+        import benchmark_gitlab_reporter
+        df = benchmark_gitlab_reporter.generate_export(2000)
+        df['issue_title'] = [f'Title, "{i}"\nsecond line' if i % 3 else f'Title {i}' for i in range(len(df))]
+        df['timelog_note'] = np.where(np.arange(len(df)) % 2, 'Note,\r\n""', None)
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, 'export.csv')
+            df.to_csv(file_path, index=False)
+            expected = load_csv(file_path)
+            for threads in (2, 7, 32):
+                result = load_csv(file_path, threads=threads)
+                pd.testing.assert_frame_equal(result, expected, check_exact=True)
+                for column in ('user', 'issue_key', 'account_label'):
+                    self.assertEqual(list(result[column].cat.categories), list(expected[column].cat.categories))
+
+    #open_input
+    def write_compressed_exports(self, folder):
+        import tarfile
+        import zipfile
+        paths = self.split_test_csv(folder)
+        for path in paths:
+            with open(path, 'rb') as source, gzip.open(path + '.gz', 'wb') as target:
+                shutil.copyfileobj(source, target)
+        with zipfile.ZipFile(os.path.join(folder, 'exports.zip'), 'w', zipfile.ZIP_DEFLATED) as archive:
+            for path in paths:
+                archive.write(path, os.path.basename(path))
+        with tarfile.open(os.path.join(folder, 'exports.tar.gz'), 'w:gz') as archive:
+            for path in paths:
+                archive.add(path + '.gz', os.path.basename(path) + '.gz')
+        return paths
+
+    def test_open_input(self):
+        with tempfile.TemporaryDirectory() as folder:
+            paths = self.write_compressed_exports(folder)
+            with open(paths[0], 'rb') as file:
+                expected = file.read()
+            for path in (paths[0] + '.gz', os.path.join(folder, 'exports.zip::export_0.csv'), os.path.join(folder, 'exports.tar.gz::export_0.csv.gz')):
+                with open_input(path) as file:
+                    self.assertEqual(file.read(), expected)
+            with self.assertRaises(FileNotFoundError):
+                with open_input(os.path.join(folder, 'exports.tar.gz::missing.csv')):
+                    pass
+            for path in ('exports.zip', 'exports.tar.gz'):
+                with self.assertRaises(ValueError):
+                    load_csv(os.path.join(folder, path))
+
+    #iter_export_files
+    def test_iter_export_files_reads_tar_once(self):
+        reports = list(REPORT_COLUMNS)
+        expected = calculate_reports(load_csv(TEST_CSV), reports, '2023-07-01', '2023-08-01')
+        with tempfile.TemporaryDirectory() as folder:
+            paths = self.write_compressed_exports(folder)
+            archive_paths = expand_file_paths(os.path.join(folder, 'exports.tar.gz'))
+            file_paths = [paths[0]] + archive_paths[1:]
+            with mock.patch('gitlab_reporter.open_tar_archive', wraps=gitlab_reporter.open_tar_archive) as open_tar:
+                members = [path for path, file in iter_export_files(list(reversed(archive_paths)))]
+                self.assertEqual(open_tar.call_count, 1)
+                for chunksize in (None, 2):
+                    results = calculate_reports_files(file_paths, reports, '2023-07-01', '2023-08-01', workers=1, chunksize=chunksize)
+                    for report in reports:
+                        pd.testing.assert_frame_equal(results[report], expected[report], check_dtype=False, check_categorical=False)
+            self.assertEqual(members, archive_paths)
+            self.assertEqual(open_tar.call_count, 3)
+
+    @unittest.skipUnless(zstandard, "zstandard is not installed")
+    def test_open_input_zstd(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'export.csv.zst')
+            with open(TEST_CSV, 'rb') as source, open(path, 'wb') as target:
+                target.write(zstandard.ZstdCompressor().compress(source.read()))
+            pd.testing.assert_frame_equal(load_csv(path), load_csv(TEST_CSV))
+
+    #list_archive_members
+    def test_list_archive_members(self):
+        with tempfile.TemporaryDirectory() as folder:
+            self.write_compressed_exports(folder)
+            archive = os.path.join(folder, 'exports.tar.gz')
+            self.assertEqual(list_archive_members(archive), [archive + '::export_0.csv.gz', archive + '::export_1.csv.gz'])
+            self.assertEqual(expand_file_paths(archive), list_archive_members(archive))
+
+    def test_expand_file_paths_compressed(self):
+        with tempfile.TemporaryDirectory() as folder:
+            paths = self.write_compressed_exports(folder)
+            for path in paths:
+                os.remove(path)
+            expected = [paths[0] + '.gz', paths[1] + '.gz',
+                        os.path.join(folder, 'exports.tar.gz::export_0.csv.gz'), os.path.join(folder, 'exports.tar.gz::export_1.csv.gz'),
+                        os.path.join(folder, 'exports.zip::export_0.csv'), os.path.join(folder, 'exports.zip::export_1.csv')]
+            self.assertEqual(expand_file_paths(folder), expected)
+
+    #load_csv
+    def test_load_csv_compressed(self):
+        expected = load_csv(TEST_CSV)
+        with tempfile.TemporaryDirectory() as folder:
+            self.write_compressed_exports(folder)
+            for path in ('exports.zip', 'exports.tar.gz', 'export_0.csv.gz'):
+                frames = [load_csv(member) for member in expand_file_paths(os.path.join(folder, path))]
+                if path != 'export_0.csv.gz':
+                    pd.testing.assert_frame_equal(pd.concat(frames, ignore_index=True), expected, check_dtype=False, check_categorical=False)
+                chunks = list(load_csv_chunks(expand_file_paths(os.path.join(folder, path))[0], 2))
+                pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), frames[0], check_dtype=False, check_categorical=False)
+            self.assertEqual(load_csv(os.path.join(folder, 'export_0.csv.gz'), threads=4).shape, (5, 11))
+
+    def test_reports_from_archive(self):
+        reports = list(REPORT_COLUMNS)
+        expected = calculate_reports(load_csv(TEST_CSV), reports, '2023-07-01', '2023-08-01')
+        with tempfile.TemporaryDirectory() as folder:
+            self.write_compressed_exports(folder)
+            results = calculate_reports_files(expand_file_paths(os.path.join(folder, 'exports.zip')), reports, '2023-07-01', '2023-08-01', workers=1)
+            for report in reports:
+                pd.testing.assert_frame_equal(results[report], expected[report], check_dtype=False, check_categorical=False)
+            path = os.path.join(folder, 'export_1.csv.gz')
+            self.assertEqual(sum_time_small_csv(path, 'user', True), sum_time_small_csv(path[:-3], 'user', True))
+
+    def test_reports_from_single_export_archive(self):
+        import tarfile
+        import zipfile
+        with tempfile.TemporaryDirectory() as folder:
+            with zipfile.ZipFile(os.path.join(folder, 'one.zip'), 'w') as archive:
+                archive.write(TEST_CSV, 'export.csv')
+            with tarfile.open(os.path.join(folder, 'one.tar.gz'), 'w:gz') as archive:
+                archive.add(TEST_CSV, 'export.csv')
+
+            outputs = {}
+            for index, path in enumerate((TEST_CSV, os.path.join(folder, 'one.zip'), os.path.join(folder, 'one.tar.gz'))):
+                output_path = os.path.join(folder, f"issues_{index}")
+                with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+                    list_reported_time_per_account(path)
+                    list_empty_accounts(path)
+                    list_issues_windows(path, [('2023-07-01', '2023-08-01')], output_path)
+                    list_issues_periods(path, [('2023-07-31', '2023-07-31'), ('2023-08-01', '2023-08-02')], output_path)
+                with open(f"{output_path}_2023-07-01_2023-08-01.csv") as windows, open(f"{output_path}.csv") as periods:
+                    outputs[path] = (stdout.getvalue().replace(output_path, ''), windows.read(), periods.read())
+            self.assertEqual(outputs[os.path.join(folder, 'one.zip')], outputs[TEST_CSV])
+            self.assertEqual(outputs[os.path.join(folder, 'one.tar.gz')], outputs[TEST_CSV])
+
+
+    #get_result_key
+    def test_get_result_key_normalizes_parameters(self):
+        fingerprint = get_data_fingerprint(get_file_states(TEST_CSV))
+        key = get_result_key(fingerprint, 'list_issues', '2023-07-01', '2023-08-01')
+        self.assertEqual(key, get_result_key(fingerprint, 'list_issues', '2023-07-01T00:00:00', '2023-08-01 23:59:59.999999999'))
+        self.assertNotEqual(key, get_result_key(fingerprint, 'list_issues', '2023-07-01', '2023-08-01 00:00'))
+        self.assertNotEqual(key, get_result_key(fingerprint, 'list_issues', '2023-07-01', '2023-08-02'))
+        self.assertNotEqual(key, get_result_key(fingerprint, 'list_issues', '2023-07-01', '2023-08-01', 'UTC'))
+        self.assertEqual(get_result_key(fingerprint, 'list_empty_accounts'), get_result_key(fingerprint, 'list_empty_accounts', '2023-07-01', '2023-08-01', 'UTC'))
+        self.assertNotEqual(get_result_key(fingerprint, 'list_empty_accounts'), get_result_key('other', 'list_empty_accounts'))
+
+    def test_get_result_key_changes_with_version(self):
+        fingerprint = get_data_fingerprint(get_file_states(TEST_CSV))
+        key = get_result_key(fingerprint, 'list_issues', '2023-07-01', '2023-08-01')
+        with mock.patch('gitlab_reporter.RESULT_CACHE_VERSION', gitlab_reporter.RESULT_CACHE_VERSION + 1):
+            self.assertNotEqual(get_result_key(fingerprint, 'list_issues', '2023-07-01', '2023-08-01'), key)
+
+    #memoize_reports
+    def test_memoize_reports(self):
+        clear_result_cache()
+        df = load_csv(TEST_CSV)
+        calls = []
+        def calculate(reports):
+            calls.append(reports)
+            return calculate_reports(df, reports, '2023-07-01', '2023-08-01')
+
+        first = memoize_reports('fingerprint', ['list_empty_accounts'], '2023-07-01', '2023-08-01', 'Europe/Stockholm', None, calculate)
+        second = memoize_reports('fingerprint', list(REPORT_COLUMNS), '2023-07-01', '2023-08-01', 'Europe/Stockholm', None, calculate)
+        third = memoize_reports('fingerprint', list(REPORT_COLUMNS), '2023-07-01', '2023-08-01', 'Europe/Stockholm', None, calculate)
+        self.assertEqual(calls, [['list_empty_accounts'], ['list_reported_time_per_account', 'list_issues']])
+        pd.testing.assert_frame_equal(second['list_empty_accounts'], first['list_empty_accounts'])
+        for report in REPORT_COLUMNS:
+            pd.testing.assert_frame_equal(third[report], second[report])
+        self.assertEqual(get_result_cache_stats(), {'hits': 4, 'disk_hits': 0, 'misses': 3, 'entries': 3})
+
+    def test_memoize_reports_from_disk(self):
+        clear_result_cache()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            expected = calculate_reports(load_csv(TEST_CSV), ['list_issues'], '2023-07-01', '2023-08-01')
+            memoize_reports('fingerprint', ['list_issues'], '2023-07-01', '2023-08-01', 'Europe/Stockholm', cache_dir, lambda reports: expected)
+            clear_result_cache()
+            result = memoize_reports('fingerprint', ['list_issues'], '2023-07-01', '2023-08-01', 'Europe/Stockholm', cache_dir, None)
+            pd.testing.assert_frame_equal(result['list_issues'], expected['list_issues'])
+            self.assertEqual(get_result_cache_stats()['disk_hits'], 1)
+
+    #get_cached_result
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_get_cached_result_ttl(self):
+        clear_result_cache()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            put_cached_result('key', pd.DataFrame({'User': ['Anders']}), cache_dir)
+            clear_result_cache()
+            path = os.path.join(cache_dir, 'results', 'key.feather')
+            os.utime(path, (0, 0))
+            self.assertIsNone(get_cached_result('key', cache_dir, ttl=3600))
+            self.assertEqual(get_result_cache_stats()['misses'], 1)
+
+    #put_cached_result
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_put_cached_result_feather(self):
+        clear_result_cache()
+        result = pd.DataFrame({'User': pd.Categorical(['Anders', None]), 'Time Spent': [1.5, 2.0]})
+        with tempfile.TemporaryDirectory() as cache_dir:
+            put_cached_result('key', result, cache_dir)
+            clear_result_cache()
+            self.assertEqual(os.listdir(os.path.join(cache_dir, 'results')), ['key.feather'])
+            pd.testing.assert_frame_equal(pd.read_feather(os.path.join(cache_dir, 'results', 'key.feather')), result)
+            pd.testing.assert_frame_equal(get_cached_result('key', cache_dir), result)
+            self.assertEqual(get_result_cache_stats()['disk_hits'], 1)
+
+    #evict_result_files
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_evict_result_files(self):
+        with tempfile.TemporaryDirectory() as folder:
+            for index, name in enumerate(['old', 'used', 'new']):
+                path = os.path.join(folder, f"{name}.feather")
+                pd.DataFrame({'value': range(100)}).to_feather(path)
+                os.utime(path, (1000 + index, 1000 + index))
+            os.utime(os.path.join(folder, 'old.feather'), (0, 0))
+            pd.DataFrame({'value': range(100)}).to_pickle(os.path.join(folder, 'pickled.pkl'))
+            size = os.path.getsize(os.path.join(folder, 'new.feather'))
+            evict_result_files(folder, max_bytes=size, ttl=10 ** 10)
+            self.assertEqual(sorted(os.listdir(folder)), ['new.feather'])
+            evict_result_files(folder, ttl=0)
+            self.assertEqual(os.listdir(folder), [])
+
+    #calculate_reports_memoized
+    def test_calculate_reports_memoized_changed_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'export.csv')
+            shutil.copy(TEST_CSV, path)
+            first = calculate_reports_memoized(path, ['list_empty_accounts'])
+            self.assertEqual(calculate_reports_memoized(path, ['list_empty_accounts'])['list_empty_accounts'].to_dict(), first['list_empty_accounts'].to_dict())
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write('2023-07-03T08:00:00+02:00,Nils Nilsson,Key_99,1.0,Task,Project,Group,1.0,,Title,\n')
+            second = calculate_reports_memoized(path, ['list_empty_accounts'])['list_empty_accounts']
+            expected = calculate_final_list_empty_accounts(calculate_user_time(load_csv(path)))
+            pd.testing.assert_frame_equal(second, expected)
+            self.assertAlmostEqual(second['Time Spent'].iloc[-1], first['list_empty_accounts']['Time Spent'].iloc[-1] + 1.0)
+
 if __name__ == '__main__':
     unittest.main(argv=[''], exit=False)